@@ -11,6 +11,40 @@ class Settings(BaseSettings):
     # ── Mistral AI ───────────────────────────────────
     mistral_api_key: str = os.getenv("MISTRAL_API_KEY")
 
+    # ── World generation pipeline ────────────────────
+    # "local" merges Step 1 + Step 2 in Python; "llm" uses the Step 3 model call
+    world_assembly_mode: str = os.getenv("WORLD_ASSEMBLY_MODE", "local")
+    # "single" = one Step 2 call; "fanout" = skeleton + parallel detail calls
+    world_step2_mode: str = os.getenv("WORLD_STEP2_MODE", "single")
+    world_fanout_concurrency: int = int(os.getenv("WORLD_FANOUT_CONCURRENCY", "4"))
+    # Start portrait + sprite generation as soon as Step 1 returns
+    world_prefetch_images: bool = os.getenv("WORLD_PREFETCH_IMAGES", "false").lower() == "true"
+    # Voice every NPC's dialogue_tree lines into the audio store after generation
+    world_prefetch_voice: bool = os.getenv("WORLD_PREFETCH_VOICE", "false").lower() == "true"
+    voice_prefetch_concurrency: int = int(os.getenv("VOICE_PREFETCH_CONCURRENCY", "4"))
+    # "engine" = short layout call + local rasteriser; "llm" = full map from the model
+    tile_map_mode: str = os.getenv("TILE_MAP_MODE", "engine")
+    # Background worker pool for /api/generate-world/jobs (per process)
+    world_job_workers: int = int(os.getenv("WORLD_JOB_WORKERS", "2"))
+
+    # ── LLM response cache ──────────────────────────
+    # Replies to byte-identical chat requests (dialogue opts in); 0 disables
+    llm_cache_ttl: int = int(os.getenv("LLM_CACHE_TTL", "86400"))
+
+    # ── Dialogue latency budget ─────────────────────
+    # Hard deadline per dialogue call; one duplicate is hedged at the model's observed p95
+    dialogue_deadline: float = float(os.getenv("DIALOGUE_DEADLINE", "8"))
+    dialogue_fallback_model: str = os.getenv("DIALOGUE_FALLBACK_MODEL", "ministral-8b-latest")
+    # Tail of the deadline reserved for the fallback model (capped at half of it)
+    llm_fallback_timeout: float = float(os.getenv("LLM_FALLBACK_TIMEOUT", "2"))
+    # Latency samples needed before hedging at p95 (until then: half the deadline)
+    llm_hedge_min_samples: int = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+    # ── Story branching ─────────────────────────────
+    # Resolve ordinary choices (task / NPC / travel) locally before calling the model
+    story_intent_classifier: bool = os.getenv("STORY_INTENT_CLASSIFIER", "false").lower() == "true"
+    story_intent_threshold: float = float(os.getenv("STORY_INTENT_THRESHOLD", "0.6"))
+
     # ── Redis ────────────────────────────────────────
     redis_url: str = os.getenv("REDIS_URL")
 
@@ -19,6 +53,36 @@ class Settings(BaseSettings):
     mongodb_db_name: str = os.getenv("MONGODB_DB_NAME")
     # ── ElevenLabs TTS ──────────────────────────────
     elevenlabs_api_key: str = os.getenv("ELEVENLABS_API_KEY", "")
+    elevenlabs_base_url: str = os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io")
+    # Sentences synthesised in parallel by the streaming dialogue endpoint
+    tts_sentence_concurrency: int = int(os.getenv("TTS_SENTENCE_CONCURRENCY", "3"))
+    # Content-addressed TTS cache (in-process LRU → disk, size-bounded); also
+    # the only store behind GET /api/audio/{id}
+    tts_cache_dir: str = os.getenv("TTS_CACHE_DIR", "data/tts")
+    tts_cache_max_mb: int = int(os.getenv("TTS_CACHE_MAX_MB", "256"))
+
+    # ── Dialogue sessions ───────────────────────────
+    dialogue_session_ttl: int = int(os.getenv("DIALOGUE_SESSION_TTL", "21600"))
+    dialogue_session_max_history: int = int(os.getenv("DIALOGUE_SESSION_MAX_HISTORY", "50"))
+    # Rolling prompt memory: recent window + summary of older turns (estimated tokens)
+    dialogue_memory_window_tokens: int = int(os.getenv("DIALOGUE_MEMORY_WINDOW_TOKENS", "600"))
+    dialogue_memory_message_tokens: int = int(os.getenv("DIALOGUE_MEMORY_MESSAGE_TOKENS", "150"))
+    dialogue_memory_summary_tokens: int = int(os.getenv("DIALOGUE_MEMORY_SUMMARY_TOKENS", "250"))
+    dialogue_memory_fold_tokens: int = int(os.getenv("DIALOGUE_MEMORY_FOLD_TOKENS", "200"))
+    # Speculatively answer each offered choice while the player reads (sessions only)
+    dialogue_speculation: bool = os.getenv("DIALOGUE_SPECULATION", "false").lower() == "true"
+    dialogue_speculation_voice: bool = os.getenv("DIALOGUE_SPECULATION_VOICE", "false").lower() == "true"
+    dialogue_speculation_ttl: int = int(os.getenv("DIALOGUE_SPECULATION_TTL", "120"))
+    dialogue_speculation_budget_tokens: int = int(os.getenv("DIALOGUE_SPECULATION_BUDGET_TOKENS", "20000"))
+
+    # ── Outbound HTTP pool (shared, opened in main.lifespan) ──
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    http_max_keepalive: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+    http_keepalive_expiry: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+    http_connect_timeout: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    http_read_timeout: float = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+    http_write_timeout: float = float(os.getenv("HTTP_WRITE_TIMEOUT", "10"))
+    http_pool_timeout: float = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
 
     # ── Server ───────────────────────────────────────
     port: int = os.getenv("PORT")
@@ -13,9 +13,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.routes import world, dialogue, story, portrait, voice
+from app.routes import world, jobs, dialogue, ambient, story, portrait, voice, audio
 from app.services.redis_cache import redis_manager
 from app.services.mongo_client import mongo_manager
+from app.services.job_queue import world_jobs
+from app.services.http_client import http_manager
 
 
 # ── Lifespan: connect / disconnect Redis ────────────
@@ -24,7 +26,11 @@ async def lifespan(application: FastAPI):
     """Startup / shutdown hook."""
     await redis_manager.connect()
     await mongo_manager.connect()
+    await http_manager.connect()
+    await world_jobs.start()
     yield
+    await world_jobs.stop()
+    await http_manager.disconnect()
     await mongo_manager.disconnect()
     await redis_manager.disconnect()
 
@@ -54,10 +60,13 @@ app.add_middleware(
 
 # ── Routers ─────────────────────────────────────────
 app.include_router(world.router)
+app.include_router(jobs.router)
 app.include_router(dialogue.router)
+app.include_router(ambient.router)
 app.include_router(story.router)
 app.include_router(portrait.router)
 app.include_router(voice.router)
+app.include_router(audio.router)
 
 
 # ── Health check ────────────────────────────────────
@@ -54,6 +54,10 @@ class Character(BaseModel):
     portrait_prompt: str  # FLUX prompt for dialogue portrait
     dialogue_tree: DialogueTree
     required_items: list[str] = Field(default_factory=list)  # Items player must have before NPC engages
+    portrait_url: Optional[str] = None  # Filled when images are prefetched during world generation
+    sprite_url: Optional[str] = None
+    # dialogue_tree line → audio id for GET /api/audio/{id} (WORLD_PREFETCH_VOICE)
+    voice_lines: Optional[dict[str, str]] = None
 
 
 class Task(BaseModel):
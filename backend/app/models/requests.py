@@ -4,9 +4,9 @@ Request body models for all API endpoints.
 
 from __future__ import annotations
 
-from typing import Optional, List
+from typing import Literal, Optional, List
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.game_bible import DialogueTree
 
@@ -39,18 +39,43 @@ class GenerateWorldRequest(BaseModel):
     end_goal: str = Field(..., min_length=5, description="The desired ending / goal")
 
 
+# Character fields resolved from a stored bible when bible_id is sent (client values are ignored)
+CHARACTER_SHEET_FIELDS = (
+    "character_name",
+    "description",
+    "personality_traits",
+    "motivation",
+    "relationship_to_player",
+    "convincing_triggers",
+    "trust_threshold",
+    "dialogue_tree",
+)
+
+
+def _require_sheet_or_bible(model):
+    if model.bible_id is None:
+        missing = [f for f in CHARACTER_SHEET_FIELDS if getattr(model, f) is None]
+        if missing:
+            raise ValueError(f"Send bible_id, or the full character sheet (missing: {', '.join(missing)})")
+    return model
+
+
 class NPCDialogueRequest(BaseModel):
-    """POST /api/npc-dialogue — frontend sends character fields from Zustand"""
+    """
+    POST /api/npc-dialogue — frontend sends character fields from Zustand,
+    or just bible_id + character_id to have them resolved server-side.
+    """
     character_id: str
-    character_name: str
-    description: str
-    personality_traits: list[str]
-    motivation: str
-    relationship_to_player: str
-    convincing_triggers: list[str]
+    bible_id: Optional[str] = Field(default=None, description="Stored bible to resolve the character from")
+    character_name: Optional[str] = None
+    description: Optional[str] = None
+    personality_traits: Optional[list[str]] = None
+    motivation: Optional[str] = None
+    relationship_to_player: Optional[str] = None
+    convincing_triggers: Optional[list[str]] = None
     trust_level: int = Field(ge=0, le=100)
-    trust_threshold: int = Field(ge=0, le=100)
-    dialogue_tree: DialogueTree
+    trust_threshold: Optional[int] = Field(default=None, ge=0, le=100)
+    dialogue_tree: Optional[DialogueTree] = None
     active_tasks: list[dict] = Field(
         default=[],
         description="List of currently active tasks assigned to this NPC"
@@ -65,15 +90,68 @@ class NPCDialogueRequest(BaseModel):
     required_items: List[str] = []
     player_inventory: List[str] = []
     enable_voice: bool = Field(default=True, description="Whether to generate TTS audio for this response")
+    audio_delivery: Literal["inline", "url"] = Field(
+        default="inline",
+        description="inline = audio_base64 in the response; url = audio_id/audio_url returned at once, synthesised in the background",
+    )
+
+    _check_sheet = model_validator(mode="after")(_require_sheet_or_bible)
+
+class CreateDialogueSessionRequest(BaseModel):
+    """
+    POST /api/dialogue/sessions — context sent once per conversation.
+    The character sheet and trust are never taken from the client: the sheet
+    comes from bible_id, trust is tracked per player/bible/character.
+    """
+    player_id: str
+    bible_id: str
+    character_id: str
+    active_tasks: list[dict] = []
+    blocked_tasks: list[dict] = []
+    player_inventory: List[str] = []
+
+
+class DialogueTurnRequest(BaseModel):
+    """POST /api/dialogue/sessions/{session_id}/turn"""
+    player_choice_index: int = Field(ge=0, le=2)
+    player_choice_text: Optional[str] = Field(
+        default=None,
+        description="Free text; defaults to the text of the chosen option from the previous turn",
+    )
+    enable_voice: bool = True
+    audio_delivery: Literal["inline", "url"] = "inline"
+    # Task context can change between turns as the player progresses elsewhere
+    player_inventory: Optional[List[str]] = None
+    active_tasks: Optional[list[dict]] = None
+    blocked_tasks: Optional[list[dict]] = None
+
 
 class GeneratePortraitRequest(BaseModel):
     """POST /api/generate-portrait"""
     portrait_prompt: str = Field(..., description="FLUX prompt for character portrait")
 
 
+# Mirrors tilemap_encoding.ENCODINGS; zstd also needs the zstandard package installed
+TileMapEncoding = Literal["json", "base64", "zlib", "gzip", "zstd", "rle"]
+
+
 class GenerateTileMapRequest(BaseModel):
     """POST /api/generate-tilemap"""
     tile_map_prompt: str = Field(..., description="Tile map description from location")
+    seed: Optional[int] = Field(default=None, description="Engine seed; defaults to a hash of the prompt")
+    encoding: TileMapEncoding = Field(
+        default="json",
+        description="Tile layer encoding: json | base64 | zlib | gzip | zstd | rle",
+    )
+
+class AmbientBarksRequest(BaseModel):
+    """POST /api/bibles/{bible_id}/locations/{location_id}/barks"""
+    completed_tasks: List[str] = Field(default_factory=list, description="Completed task ids")
+    trust_levels: dict[str, int] = Field(
+        default_factory=dict, description="character_id → current trust (missing = 0)"
+    )
+    lines_per_npc: int = Field(default=3, ge=1, le=5)
+
 
 class StoryBranchRequest(BaseModel):
     """POST /api/story-branch"""
@@ -86,3 +164,5 @@ class StoryBranchRequest(BaseModel):
     pending_tasks: List[PendingTask] = []
     npc_states: List[NPCState] = []
     player_inventory: List[str] = []
+    # Locations reachable from here — lets "go to X" be resolved without the model
+    known_locations: List[LocationContext] = []
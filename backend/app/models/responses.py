@@ -16,6 +16,14 @@ class GenerateWorldResponse(BaseModel):
     game_bible: GameBible
 
 
+class WorldJobResponse(BaseModel):
+    """Returned by POST /api/generate-world/jobs and GET /api/jobs/{job_id}"""
+    job_id: str
+    status: str  # queued | running | done | failed
+    game_bible: Optional[GameBible] = None
+    error: Optional[str] = None
+
+
 class PlayerChoice(BaseModel):
     """A single dialogue choice presented to the player."""
     index: int
@@ -49,6 +57,32 @@ class NPCDialogueResponse(BaseModel):
     blocked_reason: str = ""
     completed_task_id: str | None = Field(default=None, description="ID of the task completed in this turn, if any")
     audio_base64: str | None = Field(default=None, description="Base64-encoded mp3 audio of the NPC's spoken line")
+    audio_id: str | None = Field(default=None, description="Handle of the spoken line when audio_delivery is 'url'")
+    audio_url: str | None = Field(default=None, description="GET this for the mp3 (may wait briefly while it is synthesised)")
+
+class DialogueSessionResponse(BaseModel):
+    """Returned by POST /api/dialogue/sessions and GET /api/dialogue/sessions/{id}"""
+    session_id: str
+    character_id: str
+    trust_level: int
+    is_convinced: bool
+    history: list[dict] = []  # [{"role": "player" | "npc", "content": "..."}]
+
+
+class SpeculationStatsResponse(BaseModel):
+    """Returned by GET /api/dialogue/speculation/stats (counters since process start)"""
+    launched: int
+    hits: int
+    hits_ready: int
+    misses: int
+    cancelled: int
+    expired: int
+    skipped_budget: int
+    tokens_used: int
+    tokens_wasted: int
+    in_flight_sessions: int
+    hit_rate: float
+
 
 class GeneratePortraitResponse(BaseModel):
     """Returned by POST /api/generate-portrait"""
@@ -58,6 +92,25 @@ class GeneratePortraitResponse(BaseModel):
 class GenerateTileMapResponse(BaseModel):
     """Returned by POST /api/generate-tilemap"""
     tile_map: dict
+    seed: Optional[int] = Field(default=None, description="Engine seed — layout + seed reproduce the map")
+    layout: Optional[dict] = Field(default=None, description="Layout spec the engine rasterised")
+    repairs: List[str] = Field(default_factory=list, description="Fixes applied by map validation")
+    encoding: str = "json"
+
+
+class BibleTileMapsResponse(BaseModel):
+    """Returned by GET /api/bibles/{bible_id}/tilemaps"""
+    bible_id: str
+    encoding: str
+    tilemaps: Dict[str, GenerateTileMapResponse] = {}  # location_id → map
+    missing: List[str] = []  # location ids with no cached map
+
+
+class AmbientBarksResponse(BaseModel):
+    """Returned by POST /api/bibles/{bible_id}/locations/{location_id}/barks"""
+    location_id: str
+    barks: Dict[str, List[str]] = {}  # character_id → idle lines
+    cached: bool = False
 
 class StoryBranchResponse(BaseModel):
     """Returned by POST /api/story-branch"""
@@ -70,6 +123,10 @@ class StoryBranchResponse(BaseModel):
     inventory_changes: InventoryChanges
     steers_toward_goal: bool
     player_choices: List[BranchPlayerChoice] = []
+    # Set when the local intent classifier answered without a model call
+    intent: Optional[str] = Field(default=None, description="pursue_task | talk_to_npc | travel")
+    target_id: Optional[str] = None
+    resolved_locally: bool = False
 
 
 # ── Bible listing models ─────────────────────────
@@ -0,0 +1,83 @@
+# =============================================================================
+# AMBIENT BARK PROMPT
+# Model: mistral-small-latest (JSON mode)
+# Called by: /api/bibles/{bible_id}/locations/{location_id}/barks
+#
+# Short idle lines NPCs say to no one in particular as the player walks by.
+# One call covers every NPC present at a location — not one call per NPC.
+#
+# Barks are overheard, not addressed: they reveal mood, the place, and how
+# far the story has moved, without starting a conversation or giving away
+# convincing triggers.
+# =============================================================================
+
+# Bump when the prompt changes so cached barks are regenerated
+AMBIENT_BARKS_PROMPT_VERSION = 1
+
+_MOOD_BY_BAND = (
+    "won over — warmer, lets something personal slip",
+    "nearly won over — guard slipping, a hint of warmth",
+    "wary — watching the player, testing the air",
+    "guarded — curt, keeping to themselves",
+    "closed off — irritable, wants to be left alone",
+)
+
+
+def build_ambient_barks_prompt(
+    world: dict, location: dict, npcs: list[dict], completed_tasks: list[str], lines_per_npc: int
+) -> tuple:
+    """
+    Builds (system_prompt, user_message) for one batched bark call.
+
+    world    — world dict (title, setting, tone, time_of_day, weather)
+    location — location dict (id, name, description)
+    npcs     — list of {id, name, description, personality_traits, motivation,
+                        greeting, trust_band (0 won over … 4 closed off)}
+    completed_tasks — titles of tasks the player has finished
+    """
+    npc_blocks = "\n\n".join([
+        f"[{npc['id']}] {npc['name']}\n"
+        f"  Who: {npc['description']}\n"
+        f"  Personality: {', '.join(npc['personality_traits'])}\n"
+        f"  Wants: {npc['motivation']}\n"
+        f"  Mood toward the player: {_MOOD_BY_BAND[npc['trust_band']]}\n"
+        f"  Voice sample (tone only, never reuse): \"{npc['greeting']}\""
+        for npc in npcs
+    ])
+    progress_text = ", ".join(completed_tasks) if completed_tasks else "Nothing yet — the story has just begun."
+
+    system_prompt = f"""You write ambient barks for NPCs in an RPG: short lines they say out loud
+while the player walks past. Muttered, overheard, half to themselves.
+
+THE WORLD
+  {world.get('title', '')} — {world.get('setting', '')}
+  Tone: {world.get('tone', '')}. Time: {world.get('time_of_day', 'unknown')}. Weather: {world.get('weather', 'clear')}.
+
+THE PLACE
+  {location['name']}: {location['description']}
+
+WHAT THE PLAYER HAS DONE SO FAR
+  {progress_text}
+
+WHO IS HERE
+{npc_blocks}
+
+RULES
+1. Raw JSON only. No markdown. No backticks. No preamble.
+2. Exactly {lines_per_npc} lines per NPC, every NPC listed above, ids copied exactly.
+3. Each line: 3-14 words. Spoken, in that character's voice. No stage directions.
+4. Lines are overheard, not addressed to the player. No questions to the player.
+5. Let the place, the weather and the player's progress leak in.
+6. Never reveal what would convince them. Never mention trust, tasks or the game.
+7. Lines for one NPC must differ from each other in content, not just wording.
+
+OUTPUT:
+{{
+  "barks": [
+    {{ "character_id": "<id>", "lines": ["...", "..."] }}
+  ]
+}}"""
+
+    user_message = f"Write the ambient barks for everyone at {location['name']}."
+
+    return system_prompt, user_message
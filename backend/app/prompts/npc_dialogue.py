@@ -9,6 +9,12 @@
 #
 # Both return (system_prompt, user_message) tuple
 #
+# The system prompt is a static prefix (character sheet, voice, rules,
+# few-shot examples — memoized per character fingerprint + trust band)
+# followed by a per-turn tail (trust numbers, evidence, tasks, choice
+# roles). The prefix is byte-stable across turns so provider-side prefix
+# caching can reuse it.
+#
 # DESIGN PHILOSOPHY
 # -----------------
 # This prompt system is built to produce dialogue that reads like a scene
@@ -23,7 +29,12 @@
 #   6. Silence, deflection, and pivoting mid-thought are valid responses.
 # =============================================================================
 
+import hashlib
+import json
 import random
+from typing import Optional
+
+from app.services.lru_cache import LRUCache
 
 
 # =============================================================================
@@ -112,7 +123,7 @@ def _get_banter_rules(trust_gap: int, npc_name: str) -> str:
         )
 
 
-def _get_smalltalk_injection(trust_gap: int) -> str:
+def _get_smalltalk_injection(trust_gap: int, rng: random.Random) -> str:
     """
     At high trust, injects a small talk wildcard choice.
     Framed as the scene 'breathing' — the moment two characters stop performing.
@@ -128,7 +139,7 @@ def _get_smalltalk_injection(trust_gap: int) -> str:
             "  Output 3 choices total: GOOD, NEUTRAL, SMALLTALK."
         )
     elif trust_gap <= 15:
-        if random.random() < 0.40:
+        if rng.random() < 0.40:
             return (
                 "BREATHING ROOM (bonus small talk — include this turn)\n"
                 "  Add a 4th player choice: something human and off-topic.\n"
@@ -139,7 +150,7 @@ def _get_smalltalk_injection(trust_gap: int) -> str:
     return ""
 
 
-def _build_choice_roles(trust_gap: int) -> list:
+def _build_choice_roles(trust_gap: int, rng: random.Random) -> list:
     """
     Builds and shuffles player choice roles by trust level.
     Described cinematically — each choice is a character beat, not a stat move.
@@ -202,15 +213,81 @@ def _build_choice_roles(trust_gap: int) -> list:
     else:
         roles = [good_role, neutral_role, bad_role]
 
-    random.shuffle(roles)
+    rng.shuffle(roles)
     return roles
 
 
+# =============================================================================
+# PROMPT PREFIX CACHE
+# =============================================================================
+
+# Character fields the static prefix is built from. Per-turn fields
+# (trust_level, inventory, tasks, last_player_message) are deliberately absent.
+_STATIC_CHARACTER_KEYS = (
+    "name", "description", "personality_traits", "motivation",
+    "relationship_to_player", "convincing_triggers", "dialogue_tree",
+    "speech_patterns", "verbal_tics", "emotional_tells", "sarcasm_style",
+    "cinematic_style", "scene_context",
+)
+
+_ATTITUDES = (
+    "The walls are down. You are open, cooperative, emotionally present. The performance is over.",
+    "Almost there. One more real thing and you'll let them in. Warm but still holding the last door shut.",
+    "Cautiously present. You're listening more than you're talking. You're running tests you haven't announced.",
+    "Guarded. You've heard the speech before. You need something real — not words, not promises.",
+    "Closed. You want this conversation to be over. Every answer is also a dismissal.",
+)
+
+_prefix_cache = LRUCache(512)
+
+
+def prompt_rng(*seed_parts) -> random.Random:
+    """
+    Deterministic RNG for one prompt: the same parts always give the same
+    small-talk roll and choice-role order, so identical game states build
+    identical prompts (and can share cached responses).
+    """
+    raw = "::".join(str(part) for part in seed_parts)
+    return random.Random(int.from_bytes(hashlib.sha256(raw.encode()).digest()[:8], "big"))
+
+
+def trust_band(trust_gap: int) -> int:
+    """
+    Buckets the trust gap into the bands the prompt actually changes on:
+    0 convinced, 1 almost (≤15), 2 cautious (≤35), 3 guarded (≤60), 4 closed.
+    Banter rules, sarcasm unlock and attitude are all constant within a band.
+    """
+    for band, limit in enumerate((0, 15, 35, 60)):
+        if trust_gap <= limit:
+            return band
+    return 4
+
+
+def character_fingerprint(character: dict) -> str:
+    static = {key: character.get(key) for key in _STATIC_CHARACTER_KEYS}
+    raw = json.dumps(static, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:24]
+
+
+def _memoized_prefix(kind: str, character: dict, band, build) -> str:
+    key = (kind, character_fingerprint(character), band)
+    prefix = _prefix_cache.get(key)
+    if prefix is None:
+        prefix = build()
+        _prefix_cache.set(key, prefix)
+    return prefix
+
+
 # =============================================================================
 # MAIN DIALOGUE BUILDER
 # =============================================================================
 
-def build_npc_dialogue_prompt(character: dict, conversation_history: list) -> tuple:
+def build_npc_dialogue_prompt(
+    character: dict,
+    conversation_history: list,
+    memory_summary: str = "",
+    rng: Optional[random.Random] = None,
+) -> tuple:
     """
     Builds (system_prompt, user_message) for ongoing NPC dialogue.
 
@@ -220,6 +297,11 @@ def build_npc_dialogue_prompt(character: dict, conversation_history: list) -> tu
       trust_level, trust_threshold, dialogue_tree,
       last_player_message
 
+    conversation_history should already be windowed to the prompt budget;
+    memory_summary is the running summary of the turns before that window.
+    rng drives the small-talk roll and choice-role order — pass
+    prompt_rng(session, turn); defaults to one seeded from the game state.
+
     Optional keys for richer cinematic voice:
       speech_patterns   — list: HOW this character talks
                           e.g. ["incomplete sentences when emotional",
@@ -248,27 +330,136 @@ def build_npc_dialogue_prompt(character: dict, conversation_history: list) -> tu
     trust_threshold = character["trust_threshold"]
     trust_gap       = trust_threshold - trust_level
     npc_name        = character["name"]
+    band            = trust_band(trust_gap)
+    if rng is None:
+        rng = prompt_rng(
+            character_fingerprint(character), trust_level, character["last_player_message"]
+        )
 
-    # --- ATTITUDE ---
-    if trust_gap <= 0:
-        attitude = "The walls are down. You are open, cooperative, emotionally present. The performance is over."
-    elif trust_gap <= 15:
-        attitude = "Almost there. One more real thing and you'll let them in. Warm but still holding the last door shut."
-    elif trust_gap <= 35:
-        attitude = "Cautiously present. You're listening more than you're talking. You're running tests you haven't announced."
-    elif trust_gap <= 60:
-        attitude = "Guarded. You've heard the speech before. You need something real — not words, not promises."
-    else:
-        attitude = "Closed. You want this conversation to be over. Every answer is also a dismissal."
+    # --- STATIC PREFIX (memoized per character + trust band) ---
+    prefix = _memoized_prefix(
+        "dialogue", character, band,
+        lambda: _build_dialogue_prefix(character, trust_gap),
+    )
 
     # --- CONVERSATION HISTORY ---
+    # conversation_history is the already-budgeted recent window (see
+    # services/dialogue_memory.py); memory_summary covers everything before it.
     history_text = ""
+    if memory_summary:
+        history_text = f"EARLIER IN THIS CONVERSATION:\n{memory_summary}\n\n"
     if conversation_history:
         history_lines = []
-        for msg in conversation_history[-6:]:
+        for msg in conversation_history:
             role_label = "Player" if msg["role"] == "player" else npc_name
             history_lines.append(f"{role_label}: {msg['content']}")
-        history_text = "CONVERSATION SO FAR:\n" + "\n".join(history_lines) + "\n\n"
+        history_text += "CONVERSATION SO FAR:\n" + "\n".join(history_lines) + "\n\n"
+
+    # --- EVIDENCE BLOCK ---
+    required_items   = character.get("required_items", [])
+    player_inventory = character.get("player_inventory", [])
+    if required_items:
+        missing = [i for i in required_items if i not in player_inventory]
+        if len(missing) == 0:
+            evidence_block = "The player HAS everything you need. Proceed."
+        else:
+            missing_str = ", ".join(missing)
+            evidence_block = (
+                f"The player is MISSING: {missing_str}\n"
+                "  You know they're not ready yet. Don't list what's missing — let it\n"
+                "  surface naturally in your dismissal. A character who needs proof\n"
+                "  doesn't announce what the proof is. They just send the person away.\n"
+                "  Keep trust_delta at 0. Do not generate player_choices."
+            )
+    else:
+        evidence_block = "No specific evidence required — proceed normally."
+
+    # --- TASK TRACKING BLOCK ---
+    active_tasks  = character.get("active_tasks", [])
+    blocked_tasks = character.get("blocked_tasks", [])
+    task_block    = ""
+
+    if active_tasks or blocked_tasks:
+        task_block = "TASKS ASSIGNED TO YOU:\n"
+        if active_tasks:
+            task_block += "Eligible tasks — complete if the condition is met:\n"
+            for t in active_tasks:
+                task_block += (
+                    f"  - [{t['id']}] {t['title']}\n"
+                    f"    Condition: {t['completion_condition']}\n"
+                    f"    Reward: {t['reward']}\n"
+                )
+            task_block += (
+                "TASK COMPLETION RULES:\n"
+                "1. Calculate NEW trust: (current trust + trust_delta you choose).\n"
+                "2. If condition IS MET, output task ID in 'completed_task_id'.\n"
+                "3. If completed: pivot npc_response to giving the reward.\n"
+                "   Output exactly ONE choice: '[Accept and Leave]' with trust_hint 0.\n\n"
+            )
+        if blocked_tasks:
+            task_block += "Blocked tasks — player cannot complete these yet:\n"
+            for t in blocked_tasks:
+                missing_str = ", ".join(t.get("missing_titles", []))
+                task_block += f"  - [{t['id']}] {t['title']}\n    Missing: {missing_str}\n"
+            task_block += (
+                "If they push on these, shut it down. They know what they need to do first.\n"
+                "Do NOT output completed_task_id for blocked tasks.\n\n"
+            )
+
+    # --- SMALL TALK ---
+    smalltalk_block = _get_smalltalk_injection(trust_gap, rng)
+    has_bonus_smalltalk = bool(smalltalk_block) and trust_gap > 0
+    if has_bonus_smalltalk:
+        smalltalk_block += '\n  Add it to player_choices as { "index": 3, "text": "...", "trust_hint": 0 }.'
+
+    # --- CHOICE ROLES ---
+    choice_roles = _build_choice_roles(trust_gap, rng)
+    choice_instructions = "\n".join([
+        f"  choice_{i} [{role['role']}] → {role['description']}\n"
+        f"              First person as the player. {role['trust_hint_range']}"
+        for i, role in enumerate(choice_roles)
+    ])
+
+    # --- DYNAMIC TAIL (rebuilt every turn) ---
+    tail = f"""=== THIS TURN ===
+
+EVIDENCE YOU ARE WAITING FOR
+{evidence_block}
+
+{task_block}YOUR CURRENT STATE
+  Trust: {trust_level} / {trust_threshold}
+  State: {_ATTITUDES[band]}
+
+{smalltalk_block}
+
+PLAYER CHOICES
+Write the player's next 3 possible lines. These are also character beats — not menu options.
+Each should feel like a real person deciding how far to push.
+The role order below is randomised — follow it exactly:
+
+{choice_instructions}
+
+  — Choices in first person, present tense, as the player speaking.
+  — Make them feel like things a real person would actually say in this scene.
+  — ROAST choices: specific to this NPC, not generic insults. They name something true.
+  — SMALLTALK choices: trust_hint exactly 0, always. No exceptions.
+  — Do not cluster trust_hint values — the spread is the whole point."""
+
+    system_prompt = prefix + "\n\n" + tail
+
+    user_message = f"""{history_text}Player just said: "{character['last_player_message']}"
+
+Play {npc_name}. One response. Make it a scene."""
+
+    return system_prompt, user_message
+
+
+def _build_dialogue_prefix(character: dict, trust_gap: int) -> str:
+    """
+    Everything in the ongoing-dialogue system prompt that depends only on the
+    character sheet and the trust band. Must not read per-turn state.
+    """
+    npc_name = character["name"]
 
     # --- TRIGGERS ---
     triggers_text = "\n".join([
@@ -344,86 +535,10 @@ def build_npc_dialogue_prompt(character: dict, conversation_history: list) -> tu
         )
     )
 
-    # --- EVIDENCE BLOCK ---
-    required_items   = character.get("required_items", [])
-    player_inventory = character.get("player_inventory", [])
-    if required_items:
-        missing = [i for i in required_items if i not in player_inventory]
-        if len(missing) == 0:
-            evidence_block = "The player HAS everything you need. Proceed."
-        else:
-            missing_str = ", ".join(missing)
-            evidence_block = (
-                f"The player is MISSING: {missing_str}\n"
-                "  You know they're not ready yet. Don't list what's missing — let it\n"
-                "  surface naturally in your dismissal. A character who needs proof\n"
-                "  doesn't announce what the proof is. They just send the person away.\n"
-                "  Keep trust_delta at 0. Do not generate player_choices."
-            )
-    else:
-        evidence_block = "No specific evidence required — proceed normally."
-
-    # --- TASK TRACKING BLOCK ---
-    active_tasks  = character.get("active_tasks", [])
-    blocked_tasks = character.get("blocked_tasks", [])
-    task_block    = ""
-
-    if active_tasks or blocked_tasks:
-        task_block = "TASKS ASSIGNED TO YOU:\n"
-        if active_tasks:
-            task_block += "Eligible tasks — complete if the condition is met:\n"
-            for t in active_tasks:
-                task_block += (
-                    f"  - [{t['id']}] {t['title']}\n"
-                    f"    Condition: {t['completion_condition']}\n"
-                    f"    Reward: {t['reward']}\n"
-                )
-            task_block += (
-                "TASK COMPLETION RULES:\n"
-                "1. Calculate NEW trust: (current trust + trust_delta you choose).\n"
-                "2. If condition IS MET, output task ID in 'completed_task_id'.\n"
-                "3. If completed: pivot npc_response to giving the reward.\n"
-                "   Output exactly ONE choice: '[Accept and Leave]' with trust_hint 0.\n\n"
-            )
-        if blocked_tasks:
-            task_block += "Blocked tasks — player cannot complete these yet:\n"
-            for t in blocked_tasks:
-                missing_str = ", ".join(t.get("missing_titles", []))
-                task_block += f"  - [{t['id']}] {t['title']}\n    Missing: {missing_str}\n"
-            task_block += (
-                "If they push on these, shut it down. They know what they need to do first.\n"
-                "Do NOT output completed_task_id for blocked tasks.\n\n"
-            )
-
-    # --- BANTER, SARCASM, SMALL TALK ---
-    banter_rules    = _get_banter_rules(trust_gap, npc_name)
-    smalltalk_block = _get_smalltalk_injection(trust_gap)
+    # --- BANTER, SARCASM ---
+    banter_rules = _get_banter_rules(trust_gap, npc_name)
 
-    # --- CHOICE ROLES ---
-    choice_roles = _build_choice_roles(trust_gap)
-    choice_instructions = "\n".join([
-        f"  choice_{i} [{role['role']}] → {role['description']}\n"
-        f"              First person as the player. {role['trust_hint_range']}"
-        for i, role in enumerate(choice_roles)
-    ])
-
-    # Output schema — 4 choices if bonus smalltalk injected
-    has_bonus_smalltalk = bool(smalltalk_block) and trust_gap > 0
-    if has_bonus_smalltalk:
-        choices_schema = (
-            '    {{ "index": 0, "text": "...", "trust_hint": <integer> }},\n'
-            '    {{ "index": 1, "text": "...", "trust_hint": <integer> }},\n'
-            '    {{ "index": 2, "text": "...", "trust_hint": <integer> }},\n'
-            '    {{ "index": 3, "text": "...", "trust_hint": 0 }}'
-        )
-    else:
-        choices_schema = (
-            '    {{ "index": 0, "text": "...", "trust_hint": <integer> }},\n'
-            '    {{ "index": 1, "text": "...", "trust_hint": <integer> }},\n'
-            '    {{ "index": 2, "text": "...", "trust_hint": <integer> }}'
-        )
-
-    system_prompt = f"""You are playing {npc_name} in a scene.
+    return f"""You are playing {npc_name} in a scene.
 Not a game NPC. A character. You do not know there is a player or a game.
 You have history, want something, and are protecting something else.
 
@@ -455,13 +570,6 @@ WHAT WOULD BREAK THROUGH YOUR RESISTANCE
 
 {triggers_text}
 
-EVIDENCE YOU ARE WAITING FOR
-{evidence_block}
-
-{task_block}YOUR CURRENT STATE
-  Trust: {trust_level} / {trust_threshold}
-  State: {attitude}
-
 TONE REFERENCE — emotional temperature only, never copy these:
   Resistant  : "{character['dialogue_tree']['resistant']}"
   Cooperative: "{character['dialogue_tree']['cooperative']}"
@@ -469,21 +577,6 @@ TONE REFERENCE — emotional temperature only, never copy these:
 
 {banter_rules}
 
-{smalltalk_block}
-
-PLAYER CHOICES
-Write the player's next 3 possible lines. These are also character beats — not menu options.
-Each should feel like a real person deciding how far to push.
-The role order below is randomised — follow it exactly:
-
-{choice_instructions}
-
-  — Choices in first person, present tense, as the player speaking.
-  — Make them feel like things a real person would actually say in this scene.
-  — ROAST choices: specific to this NPC, not generic insults. They name something true.
-  — SMALLTALK choices: trust_hint exactly 0, always. No exceptions.
-  — Do not cluster trust_hint values — the spread is the whole point.
-
 STRICT OUTPUT RULES
 1. Raw JSON only. No markdown. No backticks. No preamble.
 2. npc_response: 1-4 sentences. In character. In the scene.
@@ -506,7 +599,9 @@ OUTPUT:
   "emotion": "happy | neutral | angry | suspicious | grateful | amused | conflicted",
   "completed_task_id": "<task_id or null>",
   "player_choices": [
-{choices_schema}
+    {{ "index": 0, "text": "...", "trust_hint": <integer> }},
+    {{ "index": 1, "text": "...", "trust_hint": <integer> }},
+    {{ "index": 2, "text": "...", "trust_hint": <integer> }}
   ]
 }}
 
@@ -571,18 +666,12 @@ Player said: "You could have just said no. In the beginning. You could have just
   ]
 }}"""
 
-    user_message = f"""{history_text}Player just said: "{character['last_player_message']}"
-
-Play {npc_name}. One response. Make it a scene."""
-
-    return system_prompt, user_message
-
 
 # =============================================================================
 # FIRST CONTACT BUILDER
 # =============================================================================
 
-def build_first_contact_prompt(character: dict) -> tuple:
+def build_first_contact_prompt(character: dict, rng: Optional[random.Random] = None) -> tuple:
     """
     Builds (system_prompt, user_message) for the very first NPC interaction.
     No player message yet — NPC opens the scene with a line + 3 player choices.
@@ -594,76 +683,19 @@ def build_first_contact_prompt(character: dict) -> tuple:
     Optional keys (same as build_npc_dialogue_prompt):
       speech_patterns, verbal_tics, emotional_tells,
       sarcasm_style, cinematic_style, scene_context
+
+    rng defaults to one seeded from the character and trust level, so every
+    player meeting the same NPC in the same state gets the same prompt.
     """
 
     npc_name = character["name"]
+    if rng is None:
+        rng = prompt_rng("first_contact", character_fingerprint(character), character.get("trust_level"))
 
-    triggers_text = "\n".join([
-        f"  {i+1}. {trigger}"
-        for i, trigger in enumerate(character["convincing_triggers"])
-    ])
-
-    # --- SCENE CONTEXT ---
-    scene_context = character.get("scene_context", "")
-    scene_block = (
-        f"THE SCENE\n  {scene_context}\n"
-        "  This is where the scene opens. Let it shape your first line.\n"
-        "  A character waiting in an alley opens differently than one behind a desk.\n"
-        if scene_context
-        else (
-            "THE SCENE\n"
-            "  No scene defined — but you are always somewhere doing something.\n"
-            "  Your first line should place us in a world, not just introduce a character.\n"
-        )
-    )
-
-    # --- CINEMATIC STYLE ---
-    cinematic_style = character.get("cinematic_style", "")
-    if cinematic_style in CINEMATIC_STYLE_REFERENCE:
-        style_description = CINEMATIC_STYLE_REFERENCE[cinematic_style]
-    else:
-        style_description = cinematic_style
-
-    style_block = (
-        f"YOUR DIALOGUE RHYTHM\n  {style_description}\n"
-        "  Your opening line should announce this rhythm immediately.\n"
-        if style_description
-        else (
-            "YOUR DIALOGUE RHYTHM\n"
-            "  Make the first line feel like the first line of a scene — not an introduction.\n"
-            "  The best opening lines tell you everything and nothing at once.\n"
-        )
-    )
-
-    # --- PERSONALITY VOICE BLOCK ---
-    speech_patterns = character.get("speech_patterns", [])
-    verbal_tics     = character.get("verbal_tics", [])
-    emotional_tells = character.get("emotional_tells", [])
-    sarcasm_style   = character.get("sarcasm_style", "")
-
-    voice_lines = []
-    if speech_patterns:
-        voice_lines.append("How you speak:\n" + "\n".join(f"  - {p}" for p in speech_patterns))
-    if verbal_tics:
-        voice_lines.append("Your verbal habits:\n" + "\n".join(f"  - {t}" for t in verbal_tics))
-    if emotional_tells:
-        voice_lines.append("How emotion leaks into your language:\n" + "\n".join(f"  - {t}" for t in emotional_tells))
-    if sarcasm_style:
-        voice_lines.append(
-            f"Your wit / roasting style (locked — trust is at zero):\n"
-            f"  - {sarcasm_style}\n"
-            f"  This is who you are once the walls come down. Right now: all walls."
-        )
-
-    voice_block = (
-        "YOUR VOICE\n" + "\n\n".join(voice_lines)
-        if voice_lines
-        else (
-            "YOUR VOICE\n"
-            "  The first line is the character. Make it specific.\n"
-            "  Not 'who are you' — the version of that only THIS person would say.\n"
-            "  Not 'I'm busy' — the way THIS person is busy, in THIS moment, in THIS scene."
-        )
+    # --- STATIC PREFIX (memoized per character) ---
+    prefix = _memoized_prefix(
+        "first_contact", character, None,
+        lambda: _build_first_contact_prefix(character),
     )
 
     # --- EVIDENCE BLOCK ---
@@ -738,7 +770,7 @@ def build_first_contact_prompt(character: dict) -> tuple:
             "trust_hint_range": "trust_hint: -10 to -5",
         },
     ]
-    random.shuffle(choice_roles)
+    rng.shuffle(choice_roles)
 
     choice_instructions = "\n".join([
         f"  choice_{i} [{role['role']}] → {role['description']}\n"
@@ -746,7 +778,102 @@ def build_first_contact_prompt(character: dict) -> tuple:
         for i, role in enumerate(choice_roles)
     ])
 
-    system_prompt = f"""You are playing {npc_name} in the opening of a scene.
+    # --- DYNAMIC TAIL ---
+    tail = f"""=== THIS TURN ===
+
+{evidence_block}
+
+{task_block}
+PLAYER CHOICES
+Write 3 possible first lines for the player. Character beats — not menu items.
+The role order below is randomised — follow it exactly:
+
+{choice_instructions}
+
+  — First person, present tense, as the player.
+  — Each should feel like something a real person might actually open with.
+  — trust_hint values must be spread wide. Don't cluster them."""
+
+    system_prompt = prefix + "\n\n" + tail
+
+    user_message = f"The scene opens. Someone approaches {npc_name} for the first time. Write the opening line."
+
+    return system_prompt, user_message
+
+
+def _build_first_contact_prefix(character: dict) -> str:
+    """Character-only part of the first-contact system prompt."""
+    npc_name = character["name"]
+
+    triggers_text = "\n".join([
+        f"  {i+1}. {trigger}"
+        for i, trigger in enumerate(character["convincing_triggers"])
+    ])
+
+    # --- SCENE CONTEXT ---
+    scene_context = character.get("scene_context", "")
+    scene_block = (
+        f"THE SCENE\n  {scene_context}\n"
+        "  This is where the scene opens. Let it shape your first line.\n"
+        "  A character waiting in an alley opens differently than one behind a desk.\n"
+        if scene_context
+        else (
+            "THE SCENE\n"
+            "  No scene defined — but you are always somewhere doing something.\n"
+            "  Your first line should place us in a world, not just introduce a character.\n"
+        )
+    )
+
+    # --- CINEMATIC STYLE ---
+    cinematic_style = character.get("cinematic_style", "")
+    if cinematic_style in CINEMATIC_STYLE_REFERENCE:
+        style_description = CINEMATIC_STYLE_REFERENCE[cinematic_style]
+    else:
+        style_description = cinematic_style
+
+    style_block = (
+        f"YOUR DIALOGUE RHYTHM\n  {style_description}\n"
+        "  Your opening line should announce this rhythm immediately.\n"
+        if style_description
+        else (
+            "YOUR DIALOGUE RHYTHM\n"
+            "  Make the first line feel like the first line of a scene — not an introduction.\n"
+            "  The best opening lines tell you everything and nothing at once.\n"
+        )
+    )
+
+    # --- PERSONALITY VOICE BLOCK ---
+    speech_patterns = character.get("speech_patterns", [])
+    verbal_tics     = character.get("verbal_tics", [])
+    emotional_tells = character.get("emotional_tells", [])
+    sarcasm_style   = character.get("sarcasm_style", "")
+
+    voice_lines = []
+    if speech_patterns:
+        voice_lines.append("How you speak:\n" + "\n".join(f"  - {p}" for p in speech_patterns))
+    if verbal_tics:
+        voice_lines.append("Your verbal habits:\n" + "\n".join(f"  - {t}" for t in verbal_tics))
+    if emotional_tells:
+        voice_lines.append("How emotion leaks into your language:\n" + "\n".join(f"  - {t}" for t in emotional_tells))
+    if sarcasm_style:
+        voice_lines.append(
+            f"Your wit / roasting style (locked — trust is at zero):\n"
+            f"  - {sarcasm_style}\n"
+            f"  This is who you are once the walls come down. Right now: all walls."
+        )
+
+    voice_block = (
+        "YOUR VOICE\n" + "\n\n".join(voice_lines)
+        if voice_lines
+        else (
+            "YOUR VOICE\n"
+            "  The first line is the character. Make it specific.\n"
+            "  Not 'who are you' — the version of that only THIS person would say.\n"
+            "  Not 'I'm busy' — the way THIS person is busy, in THIS moment, in THIS scene."
+        )
+    )
+
+    return f"""You are playing {npc_name} in the opening of a scene.
 Not a game NPC. A character. Fully in your world, fully in your moment.
 Someone has just walked in. You don't know them yet.
 
@@ -779,19 +906,6 @@ WHAT WOULD EVENTUALLY BREAK THROUGH
   Design player choices to hint at these — naturally, not obviously:
 {triggers_text}
 
-{evidence_block}
-
-{task_block}
-PLAYER CHOICES
-Write 3 possible first lines for the player. Character beats — not menu items.
-The role order below is randomised — follow it exactly:
-
-{choice_instructions}
-
-  — First person, present tense, as the player.
-  — Each should feel like something a real person might actually open with.
-  — trust_hint values must be spread wide. Don't cluster them.
-
 STRICT OUTPUT RULES
 1. Raw JSON only. No markdown. No backticks. No preamble.
 2. npc_response: 1-2 sentences. This is your establishing shot.
@@ -841,6 +955,30 @@ CORRECT OUTPUT (choice order randomised — NEUTRAL first in this example):
   ]
 }}"""
 
-    user_message = f"The scene opens. Someone approaches {npc_name} for the first time. Write the opening line."
 
-    return system_prompt, user_message
\ No newline at end of file
+# =============================================================================
+# CONVERSATION MEMORY SUMMARY
+# =============================================================================
+
+def build_memory_summary_prompt(
+    npc_name: str, previous_summary: str, transcript: str, max_words: int = 180
+) -> tuple:
+    """
+    Builds (system_prompt, user_message) that folds older dialogue lines into
+    the running summary used by build_npc_dialogue_prompt. Plain text output.
+    """
+    system_prompt = f"""You maintain the memory of a conversation between the player and {npc_name}.
+Update the running summary with the new lines. Keep what {npc_name} would remember:
+promises, claims, names, evidence shown, insults, what moved them and what didn't.
+Drop pleasantries and repetition. Past tense, third person, no quotes longer than a few words.
+At most {max_words} words. Plain text only — no headings, no lists, no preamble."""
+
+    user_message = f"""SUMMARY SO FAR:
+{previous_summary or "(nothing yet)"}
+
+NEW LINES TO FOLD IN:
+{transcript}
+
+Write the updated summary."""
+
+    return system_prompt, user_message
@@ -508,6 +508,144 @@ CORRECT OUTPUT:
 """
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# STEP 2 (FAN-OUT MODE) — SKELETON + PER-LOCATION / PER-TASK DETAIL
+# Model: mistral-large-latest
+# Goal: One short call fixes every id and cross-reference, then the long
+#       per-location and per-task fields are generated in parallel.
+# ─────────────────────────────────────────────────────────────────────────────
+
+WORLD_STEP2_SKELETON_SYSTEM = """
+You are a creative RPG game designer. Given a story, end goal, and character list,
+design the SKELETON of the world: ids, names, and how everything connects.
+Detailed descriptions are written later by other designers — keep this compact.
+
+═══════════════════════════════════════════════════════
+STRICT OUTPUT RULES
+═══════════════════════════════════════════════════════
+1. Return ONLY a raw JSON object. No markdown. No backticks. No explanation.
+2. Every field in the schema MUST be present. Never omit a field.
+3. All character id references MUST match ids from the provided character list.
+4. All task id references MUST match task ids in your output.
+5. All location id references MUST match location ids in your output.
+6. Generate 3 to 6 tasks and 2 to 5 locations.
+7. Tasks must chain logically: first task requires [], final task unlocks [].
+
+═══════════════════════════════════════════════════════
+OUTPUT SCHEMA
+═══════════════════════════════════════════════════════
+{
+  "world": {
+    "title": "Evocative game title derived from the story (3-6 words)",
+    "setting": "2-3 sentences describing the world — era, geography, atmosphere",
+    "end_goal": "Restate the end goal in one specific sentence",
+    "tone": "Free text tone derived from story mood",
+    "time_of_day": "Free text — morning | afternoon | night | dusk | dawn | unknown",
+    "weather": "Free text — clear | rain | fog | storm | snow | heatwave | etc"
+  },
+  "tasks": [
+    {
+      "id": "task_snake_case",
+      "title": "Short task title",
+      "assigned_npc": "character_id or null",
+      "requires": ["task_id"],
+      "unlocks": ["task_id"],
+      "blocking": true
+    }
+  ],
+  "story_graph": {
+    "opening_scene": "2-3 sentences — where is the player, what do they see",
+    "acts": [
+      {
+        "act_number": 1,
+        "title": "Act title",
+        "description": "1-2 sentences on what this act is about",
+        "tasks_in_act": ["task_id"],
+        "location_id": "location_id"
+      }
+    ],
+    "ending_scene": "2-3 sentences — specific, emotional, satisfying conclusion"
+  },
+  "locations": [
+    {
+      "id": "location_snake_case",
+      "name": "Location display name",
+      "npcs_present": ["character_id"],
+      "connected_to": ["other_location_id"]
+    }
+  ]
+}
+"""
+
+WORLD_STEP2_LOCATION_SYSTEM = """
+You are a creative RPG level designer. You will receive the story, the world
+summary, and ONE location from an already-designed world skeleton.
+Write the full detail for that single location.
+
+═══════════════════════════════════════════════════════
+STRICT OUTPUT RULES
+═══════════════════════════════════════════════════════
+1. Return ONLY a raw JSON object. No markdown. No backticks. No explanation.
+2. Every field in the schema MUST be present. Never omit a field.
+3. Do NOT rename the location or change which NPCs are present.
+4. npc_spawn_slots keys MUST be exactly the NPC ids listed as present,
+   mapped to npc_spawn_1, npc_spawn_2, ... in order.
+
+═══════════════════════════════════════════════════════
+MOVEMENT PROFILE RULES
+═══════════════════════════════════════════════════════
+- speed (pixels/second): open road 140-160, indoor/town 100-120,
+  rocky/mud 60-80, dangerous 40-60, extreme 20-40
+- friction: ice/wet 0.1-0.3, grass/dirt 0.5-0.7, stone/pavement 0.8-1.0
+- camera_shake: true only for unstable terrain
+
+═══════════════════════════════════════════════════════
+OUTPUT SCHEMA
+═══════════════════════════════════════════════════════
+{
+  "description": "What this place is and feels like — 1-2 sentences",
+  "terrain_type": "Free text terrain description",
+  "background_prompt": "pixel art RPG background, [detailed scene description], no characters, no text, 16-bit style, 1280x720",
+  "tile_map_prompt": "64x64 tile map, terrain features, walkable areas, obstacle placement, spawn points: player_start at ..., npc_spawn_1 at ... for <character_id>",
+  "movement_profile": {
+    "speed": <integer 20-160>,
+    "friction": <float 0.1-1.0>,
+    "camera_shake": <boolean>,
+    "ambient_sound": "specific ambient sound for this location",
+    "step_sound": "specific footstep sound for this terrain"
+  },
+  "npc_spawn_slots": { "character_id": "npc_spawn_1" },
+  "player_spawn": "player_start"
+}
+"""
+
+WORLD_STEP2_TASK_SYSTEM = """
+You are a creative RPG quest designer. You will receive the story, end goal,
+and ONE task from an already-designed task chain, with its neighbours.
+Write the full detail for that single task.
+
+═══════════════════════════════════════════════════════
+STRICT OUTPUT RULES
+═══════════════════════════════════════════════════════
+1. Return ONLY a raw JSON object. No markdown. No backticks. No explanation.
+2. Every field in the schema MUST be present. Never omit a field.
+3. completion_condition must be specific:
+   Bad:  "finish the task"
+   Good: "dr_marsh trust_level >= 78 AND player has item cold_storage_drive"
+4. reward must matter for the tasks this one unlocks.
+
+═══════════════════════════════════════════════════════
+OUTPUT SCHEMA
+═══════════════════════════════════════════════════════
+{
+  "description": "2-3 sentences — what to do, why it matters, what the obstacle is",
+  "type": "Free text task type derived from story",
+  "completion_condition": "Specific plain English condition with values",
+  "reward": "Specific thing gained — must matter for a later task"
+}
+"""
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # STEP 3 — FINAL ASSEMBLY
 # Model: mistral-large-latest
@@ -648,6 +786,9 @@ OUTPUT SCHEMA
 # Generates valid Tiled JSON per location from tile_map_prompt
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Bump when TILE_MAP_SYSTEM changes — part of the tile map cache key
+TILE_MAP_PROMPT_VERSION = 1
+
 TILE_MAP_SYSTEM = """
 You are a procedural tile map generator for a 2D RPG game.
 Generate a valid Tiled-compatible JSON map based on the location description provided.
@@ -704,4 +845,48 @@ OUTPUT SCHEMA:
     }
   ]
 }
-"""
\ No newline at end of file
+"""
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TILE MAP LAYOUT PROMPT (engine mode)
+# Model: mistral-small-latest
+# Returns a compact layout spec; app/services/tilemap_engine.py rasterises it
+# into the full Tiled layers locally.
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Bump when TILE_LAYOUT_SYSTEM or the engine's rasterisation changes
+TILE_LAYOUT_PROMPT_VERSION = 1
+
+TILE_LAYOUT_SYSTEM = """
+You are a level layout designer for a 2D top-down RPG.
+Describe the layout of a 64x64 tile map for the location provided.
+You do NOT draw tiles — a map engine will rasterise your layout.
+
+═══════════════════════════════════════════════════════
+STRICT OUTPUT RULES
+═══════════════════════════════════════════════════════
+1. Return ONLY a raw JSON object. No markdown. No backticks. No explanation.
+2. All coordinates are tile coordinates: integers 0-63. (0,0) is top-left.
+3. base: "floor" for open outdoor areas, "void" for interiors built from rooms.
+4. Rooms and corridors are walkable; everything outside them is solid when base is "void".
+5. Obstacles sit inside walkable space: furniture, rocks, machinery, pillars.
+6. anchors must include player_start. Add npc_spawn_1, npc_spawn_2, npc_spawn_3
+   only for NPCs the description mentions, and objective_point if there is one.
+7. Keep it compact: at most 8 rooms, 10 corridors, 16 obstacles.
+
+OUTPUT SCHEMA:
+{
+  "base": "floor | void",
+  "rooms": [ { "x": 10, "y": 40, "w": 12, "h": 10 } ],
+  "corridors": [ { "from": [16, 40], "to": [16, 20], "width": 3 } ],
+  "obstacles": [
+    { "x": 30, "y": 30, "w": 4, "h": 2 },
+    { "scatter": 12, "size": 1 }
+  ],
+  "anchors": {
+    "player_start": [16, 48],
+    "npc_spawn_1": [40, 20],
+    "objective_point": [50, 10]
+  }
+}
+"""
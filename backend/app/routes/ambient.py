@@ -0,0 +1,46 @@
+"""
+POST /api/bibles/{bible_id}/locations/{location_id}/barks
+
+Ambient idle lines for every NPC present at a location, from one batched
+Mistral Small call, cached per location and world state.
+"""
+
+import json
+import logging
+
+from fastapi import APIRouter, HTTPException
+
+from app.models.requests import AmbientBarksRequest
+from app.models.responses import AmbientBarksResponse
+from app.services import ambient_barks
+from app.services.bible_store import bible_store
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["NPC Dialogue"])
+
+
+@router.post(
+    "/bibles/{bible_id}/locations/{location_id}/barks",
+    response_model=AmbientBarksResponse,
+)
+async def location_barks(bible_id: str, location_id: str, request: AmbientBarksRequest):
+    stored = await bible_store.get(bible_id)
+    if not stored:
+        raise HTTPException(status_code=404, detail="Bible not found")
+    location = next((loc for loc in stored.bible.locations if loc.id == location_id), None)
+    if location is None:
+        raise HTTPException(status_code=404, detail="Location not found in bible")
+
+    try:
+        barks, cached = await ambient_barks.get_or_generate(
+            stored, location, request.completed_tasks, request.trust_levels, request.lines_per_npc
+        )
+    except json.JSONDecodeError as e:
+        logger.error("Ambient barks parse error: %s", e)
+        raise HTTPException(status_code=500, detail=f"Ambient barks parse error: {e}")
+    except Exception as e:
+        logger.error("Ambient barks failed: %s", e)
+        raise HTTPException(status_code=500, detail=f"Ambient barks failed: {e}")
+
+    return AmbientBarksResponse(location_id=location_id, barks=barks, cached=cached)
@@ -0,0 +1,84 @@
+"""
+GET /api/audio/{audio_id} — stored NPC audio by handle
+
+Supports single HTTP range requests so <audio> elements can seek and
+stream natively. Clips are immutable (content-addressed ids), so they are
+served with long-lived cache headers.
+"""
+
+import logging
+import re
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+from app.services import audio_store
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["NPC Voice"])
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+CACHE_HEADERS = {
+    "Cache-Control": "public, max-age=31536000, immutable",
+    "Accept-Ranges": "bytes",
+}
+
+
+def _parse_range(header: str, size: int) -> Optional[tuple[int, int]]:
+    """(start, end) inclusive for a single byte range; None to serve the whole file."""
+    match = _RANGE.match(header.strip())
+    if not match:
+        return None  # multi-range or malformed — full response is allowed
+    first, last = match.groups()
+    if first == "" and last == "":
+        return None
+    if first == "":
+        length = int(last)
+        if length == 0:
+            raise HTTPException(
+                status_code=416, headers={"Content-Range": f"bytes */{size}"}
+            )
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416, headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+
+@router.get("/audio/{audio_id}")
+async def get_audio(audio_id: str, request: Request):
+    """Return an mp3 clip, waiting briefly if its synthesis is still in flight."""
+    if not audio_store.is_valid_id(audio_id) or not await audio_store.exists(audio_id):
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    # Revalidation needs no bytes — answer before any load or re-synthesis
+    etag = f'"{audio_id}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={**CACHE_HEADERS, "ETag": etag})
+
+    data = await audio_store.load(audio_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    size = len(data)
+    byte_range = None
+    if request.headers.get("range") and size:
+        byte_range = _parse_range(request.headers["range"], size)
+
+    start, end = byte_range or (0, size - 1)
+    body = data[start:end + 1]
+    headers = {**CACHE_HEADERS, "ETag": etag}
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return Response(
+        content=body,
+        status_code=206 if byte_range else 200,
+        media_type="audio/mpeg",
+        headers=headers,
+    )
@@ -1,22 +1,50 @@
 """
 POST /api/npc-dialogue
+POST /api/npc-dialogue/stream — same turn as Server-Sent Events, token by token
+POST /api/dialogue/sessions[/{id}/turn] — server-side sessions; turns send only the choice
+GET  /api/dialogue/speculation/stats — hit rate of speculative session replies
 
 Handles live NPC dialogue via Mistral Small.
 Frontend sends individual character fields from Zustand.
 Uses build_npc_dialogue_prompt / build_first_contact_prompt from npc_dialogue.py.
 """
 
+import asyncio
 import base64
 import json
 import logging
+from typing import Callable, Optional
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
-from app.models.requests import NPCDialogueRequest
-from app.models.responses import NPCDialogueResponse, PlayerChoice
-from app.services.mistral_client import chat_complete
-from app.services.voice_service import generate_npc_audio
-from app.prompts.npc_dialogue import build_npc_dialogue_prompt, build_first_contact_prompt
+from app.config import get_settings
+from app.models.game_bible import DialogueTree
+from app.models.requests import (
+    NPCDialogueRequest,
+    CreateDialogueSessionRequest,
+    DialogueTurnRequest,
+)
+from app.models.responses import (
+    NPCDialogueResponse,
+    PlayerChoice,
+    DialogueSessionResponse,
+    SpeculationStatsResponse,
+)
+from app.services.mistral_client import chat_complete, chat_complete_stream, LLMDeadlineExceeded
+from app.services.json_stream import JsonFieldStream
+from app.services.bible_store import bible_store
+from app.services.dialogue_sessions import dialogue_sessions, session_id_for, SessionBusy
+from app.services.dialogue_memory import dialogue_memory, estimate_tokens
+from app.services.dialogue_speculation import Producer, dialogue_speculation
+from app.services import audio_store
+from app.services.voice_service import generate_npc_audio, detect_voice_type
+from app.services.speech_pipeline import SpeechPipeline
+from app.prompts.npc_dialogue import (
+    build_npc_dialogue_prompt,
+    build_first_contact_prompt,
+    prompt_rng,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,28 +52,40 @@ router = APIRouter(prefix="/api", tags=["NPC Dialogue"])
 
 TRUST_DELTA_MAP = {0: 20, 1: 5, 2: -10}
 
+DIALOGUE_MODEL = "mistral-small-latest"
+DIALOGUE_TEMPERATURE = 0.75
 
-@router.post("/npc-dialogue", response_model=NPCDialogueResponse)
-async def npc_dialogue(request: NPCDialogueRequest):
 
-    # If player is missing required items, return immediate refusal.
-    if request.required_items:
-        missing = [
-            item for item in request.required_items
-            if item not in request.player_inventory
-        ]
-        if missing:
-            missing_str = ", ".join(missing)
-            return NPCDialogueResponse(
-                npc_response    = f"{request.character_name} glances at you, then looks away. They don't seem ready to talk.",
-                trust_delta     = 0,
-                new_trust_level = request.trust_level,
-                is_convinced    = False,
-                emotion         = "neutral",
-                player_choices  = [],
-                blocked         = True,
-                blocked_reason  = f"You need the following before {request.character_name} will engage: {missing_str}",
-            )
+def _blocked_response(request: NPCDialogueRequest) -> Optional[NPCDialogueResponse]:
+    """Immediate refusal when the player is missing required items, else None."""
+    if not request.required_items:
+        return None
+    missing = [
+        item for item in request.required_items
+        if item not in request.player_inventory
+    ]
+    if not missing:
+        return None
+    missing_str = ", ".join(missing)
+    return NPCDialogueResponse(
+        npc_response    = f"{request.character_name} glances at you, then looks away. They don't seem ready to talk.",
+        trust_delta     = 0,
+        new_trust_level = request.trust_level,
+        is_convinced    = False,
+        emotion         = "neutral",
+        player_choices  = [],
+        blocked         = True,
+        blocked_reason  = f"You need the following before {request.character_name} will engage: {missing_str}",
+    )
+
+
+async def _build_prompt(
+    request: NPCDialogueRequest, memory_scope: Optional[tuple[str, int]] = None
+) -> tuple[str, str, bool]:
+    """
+    Returns (system_prompt, user_message, is_first_contact).
+    memory_scope = (session_id, history offset) for server-side sessions.
+    """
     # Build character context dict for prompt builder
     character = {
         "name":                  request.character_name,
@@ -70,26 +110,19 @@ async def npc_dialogue(request: NPCDialogueRequest):
     if is_first_contact:
         system_prompt, user_message = build_first_contact_prompt(character)
     else:
-        system_prompt, user_message = build_npc_dialogue_prompt(
-            character, request.conversation_history
+        summary, recent = await dialogue_memory.prepare(
+            request.conversation_history, *(memory_scope or ())
         )
+        # Seeded per session (or character) and turn: the same game state
+        # always builds the same prompt, so responses are cacheable
+        seed_key, offset = memory_scope or (f"{request.bible_id}:{request.character_id}", 0)
+        rng = prompt_rng(seed_key, offset + len(request.conversation_history))
+        system_prompt, user_message = build_npc_dialogue_prompt(character, recent, summary, rng)
+    return system_prompt, user_message, is_first_contact
 
-    try:
-        raw = await chat_complete(
-            model="mistral-small-latest",
-            system_prompt=system_prompt,
-            user_message=user_message,
-            json_mode=True,
-            temperature=0.75,
-        )
-        data = json.loads(raw)
-    except json.JSONDecodeError as e:
-        logger.error("NPC response parse error: %s", e)
-        raise HTTPException(status_code=500, detail=f"NPC response parse error: {e}")
-    except Exception as e:
-        logger.error("NPC dialogue failed: %s", e)
-        raise HTTPException(status_code=500, detail=f"NPC dialogue failed: {e}")
 
+def _finalize(request: NPCDialogueRequest, data: dict, is_first_contact: bool) -> NPCDialogueResponse:
+    """Trust clamping + task validation on the model's JSON. Audio is added separately."""
     # Trust calculation
     # First contact always 0 delta
     # Otherwise: use model suggestion, clamped to safe range
@@ -160,33 +193,473 @@ async def npc_dialogue(request: NPCDialogueRequest):
             for i, opt in enumerate(raw_choices[:3])
         ]
 
-    # ── Generate TTS audio ──────────────────────────
-    npc_text = data.get("npc_response", "...")
-    npc_emotion = data.get("emotion", "neutral")
-    audio_b64 = None
+    return NPCDialogueResponse(
+        npc_response=data.get("npc_response", "..."),
+        trust_delta=final_delta,
+        new_trust_level=new_trust,
+        is_convinced=is_convinced,
+        emotion=data.get("emotion", "neutral"),
+        completed_task_id=completed_task_id,
+        player_choices=player_choices,
+        blocked=False,
+        blocked_reason="",
+    )
+
+
+def _templated_reply(request: NPCDialogueRequest, is_first_contact: bool) -> dict:
+    """
+    Local stand-in when the model misses the hard deadline: the character's
+    own dialogue_tree line for where trust stands. Goes through _finalize
+    like a model reply (trust_delta 0, default choices).
+    """
+    tree = request.dialogue_tree
+    trust_gap = request.trust_threshold - request.trust_level
+    if is_first_contact:
+        line, emotion = tree.greeting, "neutral"
+    elif trust_gap <= 0:
+        line, emotion = tree.convinced, "grateful"
+    elif trust_gap <= 35:
+        line, emotion = tree.cooperative, "neutral"
+    else:
+        line, emotion = tree.resistant, "suspicious"
+    return {"npc_response": line, "trust_delta": 0, "emotion": emotion}
+
+
+async def _character_sheet(bible_id: str, character_id: str) -> dict:
+    """CHARACTER_SHEET_FIELDS + required_items from the stored bible; 404 if unknown."""
+    character = await bible_store.get_character(bible_id, character_id)
+    if character is None:
+        raise HTTPException(status_code=404, detail="Character not found in bible")
+    return {
+        "character_name":         character.name,
+        "description":            character.description,
+        "personality_traits":     character.personality_traits,
+        "motivation":             character.motivation,
+        "relationship_to_player": character.relationship_to_player,
+        "convincing_triggers":    character.convincing_triggers,
+        "trust_threshold":        character.trust_threshold,
+        "dialogue_tree":          character.dialogue_tree,
+        "required_items":         character.required_items,
+    }
+
+
+async def _resolve_character(request: NPCDialogueRequest) -> NPCDialogueRequest:
+    """
+    With bible_id, the character sheet comes from the stored bible and any
+    sheet fields the client sent are ignored — thresholds, triggers and
+    required items can't be supplied by the client.
+    """
+    if request.bible_id is None:
+        return request
+    return request.model_copy(update=await _character_sheet(request.bible_id, request.character_id))
+
 
-    if request.enable_voice:
+@router.post("/npc-dialogue", response_model=NPCDialogueResponse)
+async def npc_dialogue(request: NPCDialogueRequest):
+    return await _run_turn(await _resolve_character(request))
+
+
+async def _run_turn(
+    request: NPCDialogueRequest, memory_scope: Optional[tuple[str, int]] = None
+) -> NPCDialogueResponse:
+    """One full dialogue turn: refusal check → model call → validation → TTS."""
+    response, _ = await _generate(request, memory_scope)
+    if not response.blocked:
+        await _attach_voice(request, response)
+    return response
+
+
+async def _generate(
+    request: NPCDialogueRequest,
+    memory_scope: Optional[tuple[str, int]] = None,
+    speculative: bool = False,
+    on_prompt: Optional[Callable[[int], None]] = None,
+) -> tuple[NPCDialogueResponse, int]:
+    """
+    Text part of a turn. Returns (response, estimated tokens spent).
+    Speculative calls have no player waiting, so they skip the deadline —
+    no hedged duplicate, no fallback model — and don't share an in-flight
+    call, so cancelling one aborts its request. on_prompt gets the prompt's
+    estimated tokens just before the model is called.
+    """
+
+    # If player is missing required items, return immediate refusal.
+    blocked = _blocked_response(request)
+    if blocked:
+        return blocked, 0
+
+    system_prompt, user_message, is_first_contact = await _build_prompt(request, memory_scope)
+
+    settings = get_settings()
+    if on_prompt:
+        on_prompt(estimate_tokens(system_prompt + user_message))
+    try:
+        raw = await chat_complete(
+            model=DIALOGUE_MODEL,
+            system_prompt=system_prompt,
+            user_message=user_message,
+            json_mode=True,
+            temperature=DIALOGUE_TEMPERATURE,
+            cache=True,
+            coalesce=not speculative,
+            deadline=None if speculative else settings.dialogue_deadline,
+            fallback_model=None if speculative else settings.dialogue_fallback_model,
+        )
+        data = json.loads(raw)
+    except LLMDeadlineExceeded as e:
+        logger.warning("NPC dialogue deadline missed, using templated reply: %s", e)
+        return _finalize(request, _templated_reply(request, is_first_contact), is_first_contact), 0
+    except json.JSONDecodeError as e:
+        logger.error("NPC response parse error: %s", e)
+        raise HTTPException(status_code=500, detail=f"NPC response parse error: {e}")
+    except Exception as e:
+        logger.error("NPC dialogue failed: %s", e)
+        raise HTTPException(status_code=500, detail=f"NPC dialogue failed: {e}")
+
+    response = _finalize(request, data, is_first_contact)
+    dialogue_memory.refresh(
+        request.conversation_history, request.character_name, *(memory_scope or ())
+    )
+    return response, estimate_tokens(system_prompt + user_message + raw)
+
+
+async def _attach_voice(request: NPCDialogueRequest, response: NPCDialogueResponse):
+    """Generate TTS audio for the line — inline base64 or a background audio_id."""
+    if request.enable_voice and request.audio_delivery == "url":
+        # Return the handle now; the audio route waits for the clip if needed
+        audio_id = await audio_store.schedule(
+            detect_voice_type(request.description), response.emotion, response.npc_response
+        )
+        response.audio_id = audio_id
+        response.audio_url = f"/api/audio/{audio_id}"
+    elif request.enable_voice:
         try:
             audio_bytes = await generate_npc_audio(
                 description=request.description,
-                text=npc_text,
-                emotion=npc_emotion,
+                text=response.npc_response,
+                emotion=response.emotion,
             )
             if audio_bytes:
-                audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
+                response.audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
                 logger.info("TTS audio generated: %d bytes", len(audio_bytes))
         except Exception as e:
             logger.warning("TTS generation failed (non-fatal): %s", e)
 
-    return NPCDialogueResponse(
-        npc_response=npc_text,
-        trust_delta=final_delta,
-        new_trust_level=new_trust,
-        is_convinced=is_convinced,
-        emotion=npc_emotion,
-        completed_task_id=completed_task_id,
-        player_choices=player_choices,
-        blocked=False,
-        blocked_reason="",
-        audio_base64=audio_b64,
-    )
\ No newline at end of file
+
+# ── Server-side sessions ────────────────────────────
+
+def _session_response(state: dict, history: list[dict]) -> DialogueSessionResponse:
+    return DialogueSessionResponse(
+        session_id=state["session_id"],
+        character_id=state["character_id"],
+        trust_level=state["trust_level"],
+        is_convinced=state["trust_level"] >= state["trust_threshold"],
+        history=history,
+    )
+
+
+def _session_request(
+    state: dict, history: list[dict], turn: DialogueTurnRequest, choice_text: str
+) -> NPCDialogueRequest:
+    # Session state was validated when the session was created — skip re-validation
+    return NPCDialogueRequest.model_construct(
+        character_id=state["character_id"],
+        character_name=state["character_name"],
+        description=state["description"],
+        personality_traits=state["personality_traits"],
+        motivation=state["motivation"],
+        relationship_to_player=state["relationship_to_player"],
+        convincing_triggers=state["convincing_triggers"],
+        trust_level=state["trust_level"],
+        trust_threshold=state["trust_threshold"],
+        dialogue_tree=DialogueTree.model_construct(**state["dialogue_tree"]),
+        active_tasks=state["active_tasks"],
+        blocked_tasks=state["blocked_tasks"],
+        player_choice_index=turn.player_choice_index,
+        player_choice_text=choice_text,
+        conversation_history=history,
+        required_items=state["required_items"],
+        player_inventory=state["player_inventory"],
+        enable_voice=turn.enable_voice,
+        audio_delivery=turn.audio_delivery,
+    )
+
+
+@router.post("/dialogue/sessions", response_model=DialogueSessionResponse)
+async def create_dialogue_session(req: CreateDialogueSessionRequest):
+    """
+    Start a conversation with one NPC. Task context is sent once and the
+    character sheet always comes from the bible; later turns only send the
+    player's choice. Creating a session that already exists
+    for this player/bible/character restarts its history; trust is kept.
+    """
+    state = {**req.model_dump(), **await _character_sheet(req.bible_id, req.character_id)}
+    state["dialogue_tree"] = state["dialogue_tree"].model_dump()
+    state["session_id"] = session_id_for(req.player_id, req.bible_id, req.character_id)
+    state["last_choices"] = []
+    state["history_total"] = 0
+    state = await dialogue_sessions.create(state)
+    return _session_response(state, [])
+
+
+@router.get("/dialogue/sessions/{session_id}", response_model=DialogueSessionResponse)
+async def get_dialogue_session(session_id: str):
+    found = await dialogue_sessions.get(session_id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Dialogue session not found or expired")
+    return _session_response(*found)
+
+
+@router.delete("/dialogue/sessions/{session_id}", status_code=204)
+async def delete_dialogue_session(session_id: str):
+    dialogue_speculation.discard(session_id)
+    await dialogue_sessions.delete(session_id)
+
+
+def _speculate(
+    session_id: str, memory_name: str, state: dict, history: list[dict], turn: DialogueTurnRequest
+):
+    """Prepare the NPC's reply to each choice just offered, in the background."""
+    settings = get_settings()
+    history = history[-settings.dialogue_session_max_history:]
+    marker = state["history_total"]
+    memory_scope = (memory_name, marker - len(history))
+    warm_voice = settings.dialogue_speculation_voice and turn.enable_voice
+
+    def producer(choice: dict) -> Producer:
+        request = _session_request(
+            state, history,
+            DialogueTurnRequest.model_construct(
+                player_choice_index=choice["index"], enable_voice=False, audio_delivery="inline"
+            ),
+            choice["text"],
+        )
+
+        async def run(on_prompt: Callable[[int], None]) -> tuple[NPCDialogueResponse, int]:
+            response, tokens = await _generate(
+                request, memory_scope, speculative=True, on_prompt=on_prompt
+            )
+            if warm_voice and not response.blocked:
+                # Lands in the TTS cache, so the real turn's synthesis is a local hit
+                await generate_npc_audio(
+                    description=request.description,
+                    text=response.npc_response,
+                    emotion=response.emotion,
+                )
+            return response, tokens
+
+        return run
+
+    dialogue_speculation.launch(session_id, marker, {
+        choice["index"]: producer(choice)
+        for choice in state["last_choices"]
+        # "[Leave]"-style exits end the conversation — nothing to prepare
+        if choice["text"] and not choice["text"].startswith("[")
+    })
+
+
+@router.get("/dialogue/speculation/stats", response_model=SpeculationStatsResponse)
+async def speculation_stats():
+    """Hit rate and token spend of speculative session replies (this process)."""
+    return dialogue_speculation.snapshot()
+
+
+@router.post("/dialogue/sessions/{session_id}/turn", response_model=NPCDialogueResponse)
+async def dialogue_session_turn(session_id: str, turn: DialogueTurnRequest):
+    """
+    One turn of a server-side session. History, trust and task context come
+    from the session; the result is appended atomically and the TTL refreshed.
+    Returns 409 while another turn on the same session is still running.
+    """
+    try:
+        async with dialogue_sessions.turn_lock(session_id):
+            found = await dialogue_sessions.get(session_id)
+            if not found:
+                raise HTTPException(status_code=404, detail="Dialogue session not found or expired")
+            state, history = found
+
+            context = {
+                field: getattr(turn, field)
+                for field in ("player_inventory", "active_tasks", "blocked_tasks")
+                if getattr(turn, field) is not None
+            }
+            state.update(context)
+
+            offered = {c.get("index"): c.get("text", "") for c in state.get("last_choices", [])}
+            choice_text = turn.player_choice_text
+            if choice_text is None:
+                choice_text = offered.get(turn.player_choice_index, "")
+
+            # Memory keys use the absolute index of history[0] so they survive trimming,
+            # and created_at so a restarted session doesn't inherit the old summary
+            history_total = state.get("history_total", len(history))
+            memory_name = f"{session_id}:{state.get('created_at', 0)}"
+            request = _session_request(state, history, turn, choice_text)
+
+            # A speculation is only valid if the turn is exactly what was predicted
+            predicted = not context and choice_text == offered.get(turn.player_choice_index)
+            response = await dialogue_speculation.claim(
+                session_id, history_total, turn.player_choice_index if predicted else None
+            )
+            if response is None:
+                response, _ = await _generate(request, (memory_name, history_total - len(history)))
+            if not response.blocked:
+                await _attach_voice(request, response)
+
+            entries: list[dict] = []
+            if not response.blocked:
+                if history and choice_text:
+                    entries.append({"role": "player", "content": choice_text})
+                entries.append({"role": "npc", "content": response.npc_response})
+            updates = {
+                **context,
+                "trust_level": response.new_trust_level,
+                "history_total": history_total + len(entries),
+                "last_choices": [c.model_dump() for c in response.player_choices],
+            }
+            await dialogue_sessions.record_turn(session_id, entries, updates)
+
+            if get_settings().dialogue_speculation and not response.blocked:
+                _speculate(session_id, memory_name, {**state, **updates}, history + entries, turn)
+            return response
+    except SessionBusy:
+        raise HTTPException(status_code=409, detail="A turn is already in progress for this session")
+
+
+# ── Streaming variant ───────────────────────────────
+
+def _sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+async def _drain(events: asyncio.Queue, task: asyncio.Task):
+    """Yield queued events until `task` is done and the queue is empty."""
+    while not task.done():
+        getter = asyncio.ensure_future(events.get())
+        await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+        if getter.done():
+            yield getter.result()
+        else:
+            getter.cancel()
+    while not events.empty():
+        yield events.get_nowait()
+
+
+@router.post("/npc-dialogue/stream")
+async def npc_dialogue_stream(request: NPCDialogueRequest):
+    """
+    Same turn as /npc-dialogue, streamed as Server-Sent Events:
+      event: npc_response_delta   data: {"text": "..."}       (repeated, as tokens arrive)
+      event: emotion              data: {"emotion": "..."}
+      event: player_choices       data: {"player_choices": [...]}  (raw model choices)
+      event: dialogue             data: {...NPCDialogueResponse...}
+      event: audio                data: {"index", "text", "audio_base64"}  (enable_voice only)
+      event: audio_reset          data: {}
+      event: error                data: {"detail": "..."}
+    The dialogue event is authoritative — trust clamping and task validation
+    run on the final object and may replace the streamed text and choices.
+
+    With enable_voice, each sentence is sent to TTS as soon as it is complete
+    and audio events arrive in sentence order, interleaved with the text and
+    possibly after the dialogue event. Sentences started before the emotion
+    field arrives are voiced as "neutral". If validation replaces the text,
+    audio_reset tells the client to drop the audio so far; the replacement
+    line follows as new audio events.
+    """
+    request = await _resolve_character(request)
+    blocked = _blocked_response(request)
+    system_prompt, user_message, is_first_contact = await _build_prompt(request)
+
+    async def event_stream():
+        if blocked:
+            yield _sse("dialogue", blocked.model_dump())
+            return
+
+        events: asyncio.Queue = asyncio.Queue()
+        streamed_text: list[str] = []
+        speech = SpeechPipeline(request.description) if request.enable_voice else None
+
+        async def pump_audio(pipeline: SpeechPipeline):
+            async for index, sentence, audio in pipeline.results():
+                events.put_nowait(_sse("audio", {
+                    "index": index,
+                    "text": sentence,
+                    "audio_base64": base64.b64encode(audio).decode("utf-8") if audio else None,
+                }))
+
+        async def run_dialogue() -> Optional[NPCDialogueResponse]:
+            parser = JsonFieldStream(stream_fields=("npc_response",))
+            try:
+                async for chunk in chat_complete_stream(
+                    model=DIALOGUE_MODEL,
+                    system_prompt=system_prompt,
+                    user_message=user_message,
+                    json_mode=True,
+                    temperature=DIALOGUE_TEMPERATURE,
+                    cache=True,
+                ):
+                    for kind, key, value in parser.feed(chunk):
+                        if kind == "delta":
+                            streamed_text.append(value)
+                            if speech:
+                                speech.feed(value)
+                            events.put_nowait(_sse("npc_response_delta", {"text": value}))
+                        elif key in ("emotion", "player_choices"):
+                            if key == "emotion" and speech and isinstance(value, str):
+                                speech.emotion = value
+                            events.put_nowait(_sse(key, {key: value}))
+                data = parser.result()
+            except json.JSONDecodeError as e:
+                logger.error("NPC response parse error: %s", e)
+                events.put_nowait(_sse("error", {"detail": f"NPC response parse error: {e}"}))
+                return None
+            except Exception as e:
+                logger.error("NPC dialogue stream failed: %s", e)
+                events.put_nowait(_sse("error", {"detail": f"NPC dialogue failed: {e}"}))
+                return None
+            response = _finalize(request, data, is_first_contact)
+            dialogue_memory.refresh(request.conversation_history, request.character_name)
+            return response
+
+        dialogue_task = asyncio.create_task(run_dialogue())
+        audio_task = asyncio.create_task(pump_audio(speech)) if speech else None
+        try:
+            async for event in _drain(events, dialogue_task):
+                yield event
+            response = dialogue_task.result()
+            if response is None:
+                return
+
+            if speech:
+                if response.npc_response != "".join(streamed_text):
+                    # Validation replaced the line — voice the replacement instead
+                    speech.cancel()
+                    await audio_task
+                    async for event in _drain(events, audio_task):
+                        yield event
+                    yield _sse("audio_reset", {})
+                    speech = SpeechPipeline(request.description)
+                    speech.emotion = response.emotion
+                    speech.feed(response.npc_response)
+                    audio_task = asyncio.create_task(pump_audio(speech))
+                speech.emotion = response.emotion
+                speech.finish()
+
+            yield _sse("dialogue", response.model_dump())
+
+            if audio_task:
+                async for event in _drain(events, audio_task):
+                    yield event
+        finally:
+            # Client went away — stop paying for synthesis nobody will hear
+            dialogue_task.cancel()
+            if speech:
+                speech.cancel()
+            if audio_task:
+                audio_task.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
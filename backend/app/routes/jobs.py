@@ -0,0 +1,52 @@
+"""
+POST /api/generate-world/jobs
+GET  /api/jobs/{job_id}
+
+Asynchronous world generation — enqueue, then poll (or long-poll) for the result.
+"""
+
+import logging
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.models.requests import GenerateWorldRequest
+from app.models.responses import WorldJobResponse
+from app.services.job_queue import world_jobs
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["World Generation"])
+
+MAX_WAIT_SECONDS = 60
+
+
+def _to_response(job: dict) -> WorldJobResponse:
+    return WorldJobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        game_bible=job.get("game_bible"),
+        error=job.get("error"),
+    )
+
+
+@router.post("/generate-world/jobs", response_model=WorldJobResponse, status_code=202)
+async def submit_world_job(req: GenerateWorldRequest):
+    """Enqueue a world generation job and return its id immediately."""
+    try:
+        job = await world_jobs.submit(req.story, req.end_goal)
+    except Exception as exc:
+        logger.error("World job submit failed: %s", exc)
+        raise HTTPException(status_code=503, detail="Failed to enqueue world job")
+    return _to_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=WorldJobResponse)
+async def get_world_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS, description="Long-poll up to this many seconds for completion"),
+):
+    """Return job status; with ?wait=N, hold the request until done or N seconds pass."""
+    job = await world_jobs.wait(job_id, wait) if wait else await world_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _to_response(job)
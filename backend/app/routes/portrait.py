@@ -1,15 +1,23 @@
 """
 POST /api/generate-portrait — single portrait generation
 POST /api/generate-tilemap — tile map generation for a location
+GET  /api/bibles/{bible_id}/tilemaps — cached tile maps for every location of a bible
 """
 
+import asyncio
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 
-from app.models.requests import GeneratePortraitRequest, GenerateTileMapRequest
-from app.models.responses import GeneratePortraitResponse, GenerateTileMapResponse
-from app.services import portrait_service, mistral_client
+from app.models.requests import GeneratePortraitRequest, GenerateTileMapRequest, TileMapEncoding
+from app.models.game_bible import Location
+from app.models.responses import (
+    GeneratePortraitResponse,
+    GenerateTileMapResponse,
+    BibleTileMapsResponse,
+)
+from app.services import portrait_service, tilemap_service, tilemap_encoding
+from app.services.bible_store import bible_store
 
 logger = logging.getLogger(__name__)
 
@@ -33,16 +41,77 @@ async def generate_portrait(req: GeneratePortraitRequest):
     return GeneratePortraitResponse(image_url=image_url)
 
 
+def _check_encoding(encoding: str):
+    # Unknown names are rejected by validation (422); this catches zstd without zstandard
+    if encoding not in tilemap_encoding.supported_encodings():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported encoding '{encoding}'. Supported: {tilemap_encoding.supported_encodings()}",
+        )
+
+
+async def _to_response(entry: dict, encoding: str) -> GenerateTileMapResponse:
+    tile_map = await tilemap_encoding.encode_map_cached(entry["tile_map"], encoding)
+    return GenerateTileMapResponse(
+        tile_map=tile_map,
+        seed=entry.get("seed"),
+        layout=entry.get("layout"),
+        repairs=entry.get("repairs", []),
+        encoding=encoding,
+    )
+
+
 @router.post("/generate-tilemap", response_model=GenerateTileMapResponse)
 async def generate_tilemap(req: GenerateTileMapRequest):
-    """Generate a Tiled-compatible JSON map for a location."""
+    """Generate a Tiled-compatible JSON map for a location (cached by prompt + seed)."""
+    _check_encoding(req.encoding)
     try:
-        tile_map = await mistral_client.generate_tile_map(req.tile_map_prompt)
+        _, entry = await tilemap_service.get_or_generate(req.tile_map_prompt, req.seed)
     except Exception as exc:
         logger.error("Tile map generation failed: %s", exc)
         raise HTTPException(
             status_code=502,
             detail="Tile map generation failed",
         )
+    return await _to_response(entry, req.encoding)
+
+
+@router.get("/bibles/{bible_id}/tilemaps", response_model=BibleTileMapsResponse)
+async def get_bible_tilemaps(
+    bible_id: str,
+    encoding: TileMapEncoding = "json",
+    generate_missing: bool = Query(False, description="Generate maps that aren't cached yet"),
+):
+    """
+    Tile maps for every location of a stored bible in one request.
+    By default only cached maps are returned; the rest are listed in `missing`.
+    """
+    _check_encoding(encoding)
+    stored = await bible_store.get(bible_id)
+    if not stored:
+        raise HTTPException(status_code=404, detail="Bible not found")
+    locations = stored.bible.locations
+
+    async def _lookup(location: Location):
+        prompt = location.tile_map_prompt
+        if generate_missing:
+            try:
+                _, entry = await tilemap_service.get_or_generate(prompt)
+                return location.id, entry
+            except Exception as exc:
+                logger.warning("Tile map for %s failed: %s", location.id, exc)
+                return location.id, None
+        key, _seed = tilemap_service.tile_map_key(prompt)
+        return location.id, await tilemap_service.get_cached(key)
+
+    tilemaps: dict[str, GenerateTileMapResponse] = {}
+    missing: list[str] = []
+    for location_id, entry in await asyncio.gather(*[_lookup(loc) for loc in locations]):
+        if entry is None:
+            missing.append(location_id)
+        else:
+            tilemaps[location_id] = await _to_response(entry, encoding)
 
-    return GenerateTileMapResponse(tile_map=tile_map)
+    return BibleTileMapsResponse(
+        bible_id=bible_id, encoding=encoding, tilemaps=tilemaps, missing=missing
+    )
@@ -3,6 +3,10 @@ POST /api/story-branch
 
 Handles unexpected player choices via Magistral Medium (reasoning model).
 Uses build_story_branch_prompt() from story_branch.py.
+
+Choices that are really ordinary actions — working on a pending task,
+talking to an NPC, walking to a known location — are recognised first by
+the local intent classifier and answered without a model call.
 """
 
 import json
@@ -10,8 +14,10 @@ import logging
 
 from fastapi import APIRouter, HTTPException
 
+from app.config import get_settings
 from app.models.requests import StoryBranchRequest
-from app.models.responses import StoryBranchResponse
+from app.models.responses import BranchPlayerChoice, InventoryChanges, StoryBranchResponse
+from app.services import intent_classifier
 from app.services.mistral_client import chat_complete
 from app.prompts.story_branch import build_story_branch_prompt
 
@@ -20,8 +26,68 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api", tags=["Story Branching"])
 
 
+def _local_branch(request: StoryBranchRequest, intent: intent_classifier.Intent) -> StoryBranchResponse:
+    """Deterministic response for a choice the classifier placed — no world changes."""
+    here = request.current_location
+    npcs = {n.id: n.name for n in request.npc_states}
+    tasks = {t.id: t.title for t in request.pending_tasks}
+    places = {loc.id: loc for loc in request.known_locations}
+
+    if intent.kind == "talk_to_npc":
+        narrative = f"You make your way over to {npcs[intent.target_id]}."
+        scene = here.description
+        first = BranchPlayerChoice(index=0, text=f"Talk to {npcs[intent.target_id]}", consequence_hint="Opens the conversation")
+    elif intent.kind == "pursue_task":
+        narrative = f"You turn your attention to the task at hand: {tasks[intent.target_id]}."
+        scene = here.description
+        first = BranchPlayerChoice(index=0, text=f"Work on: {tasks[intent.target_id]}", consequence_hint="Moves the task forward")
+    else:
+        place = places[intent.target_id]
+        narrative = f"You set off for {place.name}."
+        scene = place.description
+        first = BranchPlayerChoice(index=0, text=f"Look around {place.name}", consequence_hint="See who and what is here")
+
+    other_task = next((title for tid, title in tasks.items() if tid != intent.target_id), None)
+    choices = [
+        first,
+        BranchPlayerChoice(
+            index=1,
+            text=f"Work on: {other_task}" if other_task else "Think over what you know",
+            consequence_hint="Another thread of the story",
+        ),
+        BranchPlayerChoice(index=2, text="Do something unexpected", consequence_hint="Anything could happen"),
+    ]
+    return StoryBranchResponse(
+        narrative=narrative,
+        consequence="",
+        new_scene_description=scene,
+        inventory_changes=InventoryChanges(),
+        steers_toward_goal=True,
+        player_choices=choices,
+        intent=intent.kind,
+        target_id=intent.target_id,
+        resolved_locally=True,
+    )
+
+
 @router.post("/story-branch", response_model=StoryBranchResponse)
 async def story_branch(request: StoryBranchRequest):
+    settings = get_settings()
+    if settings.story_intent_classifier:
+        intent = intent_classifier.classify(
+            request.player_choice,
+            pending_tasks=[{"id": t.id, "title": t.title} for t in request.pending_tasks],
+            npcs=[{"id": n.id, "name": n.name} for n in request.npc_states],
+            locations=[
+                {"id": loc.id, "name": loc.name}
+                for loc in request.known_locations
+                if loc.id != request.current_location.id
+            ],
+            threshold=settings.story_intent_threshold,
+        )
+        if intent is not None:
+            logger.info("Story branch resolved locally — %s → %s (%.2f)", intent.kind, intent.target_id, intent.score)
+            return _local_branch(request, intent)
 
     # Build game_state dict for prompt builder
     game_state = {
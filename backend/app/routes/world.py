@@ -1,86 +1,102 @@
 """
 POST /api/generate-world
+POST /api/generate-world/stream
 GET  /api/bibles
 GET  /api/bibles/{bible_id}
 
 Orchestrates world-building + persistence.
 """
 
-import hashlib
+import asyncio
+import json
 import logging
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
-from app.models.game_bible import GameBible
 from app.models.requests import GenerateWorldRequest
 from app.models.responses import (
     GenerateWorldResponse,
     BibleListResponse,
     BibleSummary,
 )
-from app.services import mistral_client, portrait_service
-from app.services.redis_cache import redis_manager
+from app.services import world_pipeline
 from app.services.mongo_client import mongo_manager
-from app.fallback_bible import FALLBACK_GAME_BIBLE
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["World Generation"])
 
 
-def _cache_key(story: str, end_goal: str) -> str:
-    raw = f"{story}::{end_goal}"
-    return hashlib.sha256(raw.encode()).hexdigest()[:16]
-
-
 @router.post("/generate-world", response_model=GenerateWorldResponse)
 async def generate_world(req: GenerateWorldRequest):
-    cache_key = _cache_key(req.story, req.end_goal)
+    cache_key = world_pipeline.cache_key(req.story, req.end_goal)
 
     # 1. Check cache
-    try:
-        cached = await redis_manager.get_game_bible(cache_key)
-        if cached:
-            logger.info("Cache HIT for key=%s", cache_key)
-            bible = GameBible(**cached)
-            return GenerateWorldResponse(game_bible=bible)
-    except Exception as exc:
-        logger.error("Redis cache check failed: %s", exc)
+    cached = await world_pipeline.get_cached_bible(cache_key)
+    if cached:
+        return GenerateWorldResponse(game_bible=cached)
 
-    # 2. Run the 3-step Mistral pipeline
-    try:
-        raw_bible = await mistral_client.generate_game_bible(
-            req.story, req.end_goal
-        )
-    except Exception as exc:
-        logger.error("World generation pipeline failed: %s — using fallback", exc)
-        raw_bible = FALLBACK_GAME_BIBLE
+    # 2. Run (or join) the pipeline — validates, caches and persists
+    bible = await world_pipeline.generate_coalesced(req.story, req.end_goal, cache_key)
 
-    # 3. Validate with Pydantic
-    try:
-        bible = GameBible(**raw_bible)
-    except Exception as exc:
-        logger.error("Game Bible validation failed: %s — using fallback", exc)
-        bible = GameBible(**FALLBACK_GAME_BIBLE)
+    # 3. Return
+    return GenerateWorldResponse(game_bible=bible)
 
-    # 4. Cache in Redis
-    try:
-        await redis_manager.set_game_bible(cache_key, bible.model_dump())
-    except Exception as exc:
-        logger.error("Redis cache set failed: %s", exc)
 
-    # 5. Persist in MongoDB
-    try:
-        await mongo_manager.save_game_bible(
-            story=req.story,
-            end_goal=req.end_goal,
-            bible_dict=bible.model_dump(),
-        )
-    except Exception as exc:
-        logger.error("MongoDB save failed: %s", exc)
+# ── Streaming variant ───────────────────────────────
 
-    # 6. Return
-    return GenerateWorldResponse(game_bible=bible)
+def _ndjson(event: str, data: dict) -> bytes:
+    return (json.dumps({"event": event, "data": data}) + "\n").encode("utf-8")
+
+
+@router.post("/generate-world/stream")
+async def generate_world_stream(req: GenerateWorldRequest):
+    """
+    Same pipeline as /generate-world, streamed as NDJSON — one event per line:
+      {"event": "characters", "data": {"characters": [...]}}
+      {"event": "world",      "data": {"world", "tasks", "locations", "story_graph"}}
+      {"event": "images",     "data": {character_id: {portrait_url, sprite_url}}}  (WORLD_PREFETCH_IMAGES only)
+      {"event": "voice",      "data": {character_id: {line: audio_id}}}  (WORLD_PREFETCH_VOICE only)
+      {"event": "game_bible", "data": {...validated Game Bible...}}
+    A cache hit, a coalesced request or a pipeline failure emits only the
+    final game_bible event.
+    """
+    cache_key = world_pipeline.cache_key(req.story, req.end_goal)
+
+    async def event_stream():
+        cached = await world_pipeline.get_cached_bible(cache_key)
+        if cached:
+            yield _ndjson("game_bible", cached.model_dump())
+            return
+
+        stages: asyncio.Queue = asyncio.Queue()
+        flight = asyncio.ensure_future(
+            world_pipeline.generate_coalesced(
+                req.story, req.end_goal, cache_key,
+                on_stage=lambda stage, payload: stages.put_nowait((stage, payload)),
+            )
+        )
+        try:
+            while not flight.done():
+                getter = asyncio.ensure_future(stages.get())
+                await asyncio.wait({getter, flight}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield _ndjson(*getter.result())
+                else:
+                    getter.cancel()
+            while not stages.empty():
+                yield _ndjson(*stages.get_nowait())
+            yield _ndjson("game_bible", flight.result().model_dump())
+        finally:
+            # Client went away — the shared pipeline keeps running and still caches
+            flight.cancel()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ── List all stored bibles ──────────────────────────
@@ -0,0 +1,154 @@
+"""
+Batched ambient barks for the NPCs present at a location.
+
+One JSON-mode call produces idle lines for every NPC in
+Location.npcs_present, reusing character context from the stored bible.
+Results are cached per (bible, location, world state) — the world state
+being the completed tasks and each present NPC's trust band — so a
+location's chatter costs one request until the story actually moves.
+Replies where most NPCs fell back to their greeting are not cached.
+Lookups go in-process LRU → Redis → generate; concurrent misses share
+one call.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Optional
+
+from app.models.game_bible import Location
+from app.prompts.ambient_barks import AMBIENT_BARKS_PROMPT_VERSION, build_ambient_barks_prompt
+from app.prompts.npc_dialogue import trust_band
+from app.services import mistral_client
+from app.services.bible_store import StoredBible
+from app.services.lru_cache import LRUCache
+from app.services.redis_cache import redis_manager
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+BARKS_MODEL = "mistral-small-latest"
+BARKS_TEMPERATURE = 0.9
+BARKS_TTL = 24 * 3600
+LRU_SIZE = 256
+MAX_LINE_CHARS = 160
+
+_lru = LRUCache(LRU_SIZE)
+_flight = SingleFlight()
+
+
+def barks_key(
+    bible_id: str, location_id: str, completed: list[str], bands: dict[str, int], lines_per_npc: int
+) -> str:
+    raw = json.dumps({
+        "v": AMBIENT_BARKS_PROMPT_VERSION,
+        "bible": bible_id,
+        "location": location_id,
+        "completed": sorted(set(completed)),
+        "bands": bands,
+        "lines": lines_per_npc,
+    }, sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()[:24]
+
+
+async def _get_cached(key: str) -> Optional[dict[str, list[str]]]:
+    barks = _lru.get(key)
+    if barks is not None:
+        return barks
+    raw = await redis_manager.get(f"barks:{key}")
+    if raw:
+        barks = json.loads(raw)
+        _lru.set(key, barks)
+        return barks
+    return None
+
+
+def _clean(data, present: dict, lines_per_npc: int) -> dict[str, list[str]]:
+    """Known ids with a list of short string lines; anything else from the model is dropped."""
+    entries = data.get("barks") if isinstance(data, dict) else None
+    barks: dict[str, list[str]] = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or entry.get("character_id") not in present:
+            continue
+        raw_lines = entry.get("lines")
+        if not isinstance(raw_lines, list):
+            continue
+        lines = [
+            line.strip()[:MAX_LINE_CHARS]
+            for line in raw_lines
+            if isinstance(line, str) and line.strip()
+        ]
+        if lines:
+            barks[entry["character_id"]] = lines[:lines_per_npc]
+    return barks
+
+
+def _fallbacks(present: dict) -> dict[str, list[str]]:
+    """NPCs the model skipped fall back to their greeting."""
+    return {cid: [c.dialogue_tree.greeting] for cid, c in present.items()}
+
+
+async def get_or_generate(
+    stored: StoredBible,
+    location: Location,
+    completed_tasks: list[str],
+    trust_levels: dict[str, int],
+    lines_per_npc: int,
+) -> tuple[dict[str, list[str]], bool]:
+    """Returns (character_id → lines, served_from_cache)."""
+    present = {cid: stored.characters[cid] for cid in location.npcs_present if cid in stored.characters}
+    if not present:
+        return {}, False
+    bands = {
+        cid: trust_band(c.trust_threshold - trust_levels.get(cid, 0)) for cid, c in present.items()
+    }
+    completed = [t for t in completed_tasks if any(task.id == t for task in stored.bible.tasks)]
+    key = barks_key(stored.bible_id, location.id, completed, bands, lines_per_npc)
+
+    barks = await _get_cached(key)
+    if barks is not None:
+        return barks, True
+
+    async def produce() -> dict[str, list[str]]:
+        task_titles = {task.id: task.title for task in stored.bible.tasks}
+        npcs = [
+            {
+                "id":                 cid,
+                "name":               c.name,
+                "description":        c.description,
+                "personality_traits": c.personality_traits,
+                "motivation":         c.motivation,
+                "greeting":           c.dialogue_tree.greeting,
+                "trust_band":         bands[cid],
+            }
+            for cid, c in present.items()
+        ]
+        system_prompt, user_message = build_ambient_barks_prompt(
+            stored.bible.world.model_dump(),
+            location.model_dump(include={"id", "name", "description"}),
+            npcs,
+            [task_titles[t] for t in sorted(set(completed))],
+            lines_per_npc,
+        )
+        raw = await mistral_client.chat_complete(
+            model=BARKS_MODEL,
+            system_prompt=system_prompt,
+            user_message=user_message,
+            json_mode=True,
+            temperature=BARKS_TEMPERATURE,
+        )
+        generated = _clean(json.loads(raw), present, lines_per_npc)
+        barks = {**_fallbacks(present), **generated}
+        # Only cache a reply that covered most NPCs — a mostly broken one is
+        # served with greeting fallbacks but regenerated on the next request
+        if len(generated) * 2 >= len(present):
+            _lru.set(key, barks)
+            await redis_manager.set(f"barks:{key}", json.dumps(barks), ttl=BARKS_TTL)
+        else:
+            logger.warning("Ambient barks mostly unusable — not cached")
+        logger.info(
+            "Ambient barks generated — location=%s npcs=%d/%d", location.id, len(generated), len(present)
+        )
+        return barks
+
+    return await _flight.do(key, produce), False
@@ -0,0 +1,134 @@
+"""
+Handles for synthesised NPC audio, served by GET /api/audio/{id}.
+
+Ids are content hashes of (voice, emotion, text), so a clip never changes
+and can be cached by the browser indefinitely. The bytes themselves live
+only in tts_cache (in-process LRU + size-bounded TTS_CACHE_DIR) — this
+module just maps ids to what they hash. Synthesis can be scheduled in the
+background: the dialogue response returns the id at once and the audio
+route waits for the pending clip if it is requested before it is ready.
+
+Each id's recipe — the (voice, emotion, text) it hashes — is recorded in
+Redis (and an in-process LRU) before the id is handed out. A worker or
+node that doesn't hold the clip (or evicted it) synthesises it from the
+recipe instead of returning 404.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from contextlib import nullcontext
+from typing import Optional
+
+from app.services import tts_cache
+from app.services.lru_cache import LRUCache
+from app.services.redis_cache import redis_manager
+from app.services.voice_service import stream_npc_voice, tts_cache_key
+
+logger = logging.getLogger(__name__)
+
+RECIPE_TTL = 365 * 24 * 3600  # a few hundred bytes per line; ids live in stored bibles
+
+_AUDIO_ID = re.compile(r"^[0-9a-f]{32}$")
+
+_pending: dict[str, asyncio.Task] = {}
+_recipes = LRUCache(4096)
+
+
+def audio_id_for(voice_type: str, emotion: str, text: str) -> str:
+    raw = f"{voice_type}::{emotion.lower()}::{text.strip()}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def is_valid_id(audio_id: str) -> bool:
+    return bool(_AUDIO_ID.match(audio_id))
+
+
+def _is_cached(recipe: dict) -> bool:
+    return tts_cache.contains(tts_cache_key(recipe["voice_type"], recipe["text"], recipe["emotion"]))
+
+
+async def _recipe(audio_id: str) -> Optional[dict]:
+    recipe = _recipes.get(audio_id)
+    if recipe is not None:
+        return recipe
+    raw = await redis_manager.get(f"audio:{audio_id}")
+    if raw:
+        recipe = json.loads(raw)
+        _recipes.set(audio_id, recipe)
+    return recipe
+
+
+async def _synthesise(recipe: dict) -> bytes:
+    """The clip's bytes — a local read when tts_cache has it."""
+    chunks: list[bytes] = []
+    async for chunk in stream_npc_voice(
+        npc_id=recipe["voice_type"], text=recipe["text"], emotion=recipe["emotion"]
+    ):
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _start(audio_id: str, recipe: dict, limit: Optional[asyncio.Semaphore] = None):
+    """Synthesise into tts_cache in the background unless cached or in flight."""
+    if audio_id in _pending or _is_cached(recipe):
+        return
+
+    async def _run():
+        try:
+            async with limit or nullcontext():
+                data = await _synthesise(recipe)
+            logger.info("Audio synthesised — id=%s (%d bytes)", audio_id, len(data))
+        except Exception as exc:
+            logger.warning("Background TTS failed for %s: %s", audio_id, exc)
+        finally:
+            _pending.pop(audio_id, None)
+
+    _pending[audio_id] = asyncio.create_task(_run())
+
+
+async def _record(voice_type: str, emotion: str, text: str) -> tuple[str, dict]:
+    audio_id = audio_id_for(voice_type, emotion, text)
+    recipe = {"voice_type": voice_type, "emotion": emotion, "text": text}
+    if _recipes.get(audio_id) is None:
+        _recipes.set(audio_id, recipe)
+        await redis_manager.set(f"audio:{audio_id}", json.dumps(recipe), ttl=RECIPE_TTL)
+    return audio_id, recipe
+
+
+async def schedule(
+    voice_type: str, emotion: str, text: str, limit: Optional[asyncio.Semaphore] = None
+) -> str:
+    """
+    Record the recipe, start synthesis unless the clip is cached or in
+    flight, and return the audio id. `limit` bounds concurrent synthesis.
+    """
+    audio_id, recipe = await _record(voice_type, emotion, text)
+    _start(audio_id, recipe, limit)
+    return audio_id
+
+
+async def exists(audio_id: str) -> bool:
+    """Whether the id has a recorded recipe — cheap, never synthesises."""
+    return await _recipe(audio_id) is not None
+
+
+async def load(audio_id: str, timeout: float = 30.0) -> Optional[bytes]:
+    """
+    The clip's bytes, or None for an unknown id or a synthesis that fails or
+    outlasts `timeout`. Waits for an in-flight synthesis; otherwise reads
+    tts_cache, synthesising from the recorded recipe on a miss.
+    """
+    recipe = await _recipe(audio_id)
+    if recipe is None:
+        return None
+    try:
+        task = _pending.get(audio_id)
+        if task is not None:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+        return await asyncio.wait_for(_synthesise(recipe), timeout) or None
+    except Exception as exc:
+        logger.warning("Audio %s unavailable: %r", audio_id, exc)
+        return None
@@ -0,0 +1,106 @@
+"""
+Local Game Bible assembly — Step 3 of world generation without a model call.
+
+Merges the Step 1 character payload and the Step 2 world payload into one
+Game Bible dict, then normalises the cross-references between sections
+(character ids, task ids, location ids) so the result validates cleanly
+against the GameBible model.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def assemble_game_bible_local(characters_data: dict, world_data: dict) -> dict:
+    """
+    Deterministic replacement for the LLM merge call.
+    Returns { "world", "characters", "tasks", "story_graph", "locations" }.
+    """
+    bible = {
+        "world": world_data.get("world", {}),
+        "characters": _dedupe_by_id(characters_data.get("characters", [])),
+        "tasks": _dedupe_by_id(world_data.get("tasks", [])),
+        "story_graph": world_data.get("story_graph", {}),
+        "locations": _dedupe_by_id(world_data.get("locations", [])),
+    }
+    normalize_cross_references(bible)
+    return bible
+
+
+def normalize_cross_references(bible: dict) -> list[str]:
+    """
+    Drop or repair references that point at ids which don't exist.
+    Mutates the bible in place and returns a list of the fixes applied.
+    """
+    fixes: list[str] = []
+
+    character_ids = {c.get("id") for c in bible.get("characters", [])}
+    task_ids = {t.get("id") for t in bible.get("tasks", [])}
+    location_ids = [loc.get("id") for loc in bible.get("locations", [])]
+    known_locations = set(location_ids)
+
+    # ── Tasks → characters / other tasks ───────────
+    for task in bible.get("tasks", []):
+        npc = task.get("assigned_npc")
+        if npc and npc not in character_ids:
+            fixes.append(f"task {task.get('id')}: unknown assigned_npc '{npc}'")
+            task["assigned_npc"] = None
+        for field in ("requires", "unlocks"):
+            refs = task.get(field) or []
+            kept = [r for r in refs if r in task_ids and r != task.get("id")]
+            if len(kept) != len(refs):
+                fixes.append(f"task {task.get('id')}: dropped {field} {sorted(set(refs) - set(kept))}")
+            task[field] = kept
+
+    # ── Locations → characters / other locations ───
+    for loc in bible.get("locations", []):
+        present = loc.get("npcs_present") or []
+        kept = [c for c in present if c in character_ids]
+        if len(kept) != len(present):
+            fixes.append(f"location {loc.get('id')}: dropped npcs_present {sorted(set(present) - set(kept))}")
+        loc["npcs_present"] = kept
+
+        slots = loc.get("npc_spawn_slots") or {}
+        loc["npc_spawn_slots"] = {c: s for c, s in slots.items() if c in character_ids}
+
+        connected = loc.get("connected_to") or []
+        loc["connected_to"] = [
+            other for other in connected
+            if other in known_locations and other != loc.get("id")
+        ]
+
+    # ── Acts → tasks / locations ───────────────────
+    for act in bible.get("story_graph", {}).get("acts", []):
+        in_act = act.get("tasks_in_act") or []
+        kept = [t for t in in_act if t in task_ids]
+        if len(kept) != len(in_act):
+            fixes.append(f"act {act.get('act_number')}: dropped tasks_in_act {sorted(set(in_act) - set(kept))}")
+        act["tasks_in_act"] = kept
+
+        if act.get("location_id") not in known_locations and location_ids:
+            fixes.append(
+                f"act {act.get('act_number')}: unknown location_id "
+                f"'{act.get('location_id')}' → '{location_ids[0]}'"
+            )
+            act["location_id"] = location_ids[0]
+
+    for fix in fixes:
+        logger.warning("Bible cross-reference fix — %s", fix)
+    return fixes
+
+
+def _dedupe_by_id(items: list) -> list:
+    """Keep the first entry for each id; the model occasionally repeats one."""
+    seen: set = set()
+    result = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        item_id = item.get("id")
+        if item_id in seen:
+            logger.warning("Duplicate id '%s' dropped during assembly", item_id)
+            continue
+        seen.add(item_id)
+        result.append(item)
+    return result
@@ -0,0 +1,79 @@
+"""
+Read-through store of parsed Game Bibles by MongoDB id.
+
+Lookups go in-process LRU → Redis → MongoDB. Each bible is validated
+once and indexed by character id, so per-turn routes can resolve a
+Character from (bible_id, character_id) without the client resending it.
+Bibles are immutable once stored, so entries never need invalidating.
+"""
+
+import json
+import logging
+from typing import Optional
+
+from app.models.game_bible import Character, GameBible
+from app.services.lru_cache import LRUCache
+from app.services.mongo_client import mongo_manager
+from app.services.redis_cache import redis_manager
+from app.services.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+BIBLE_TTL = 24 * 3600
+LRU_SIZE = 64
+
+
+class StoredBible:
+    """A validated bible plus its id → Character index."""
+
+    def __init__(self, bible_id: str, bible: GameBible):
+        self.bible_id = bible_id
+        self.bible = bible
+        self.characters: dict[str, Character] = {c.id: c for c in bible.characters}
+
+
+class BibleStore:
+    def __init__(self):
+        self._lru = LRUCache(LRU_SIZE)
+        self._flight = SingleFlight()
+
+    async def get(self, bible_id: str) -> Optional[StoredBible]:
+        stored = self._lru.get(bible_id)
+        if stored is not None:
+            return stored
+        return await self._flight.do(bible_id, lambda: self._load(bible_id))
+
+    async def get_character(self, bible_id: str, character_id: str) -> Optional[Character]:
+        stored = await self.get(bible_id)
+        if stored is None:
+            return None
+        return stored.characters.get(character_id)
+
+    async def put(self, bible_id: str, bible: GameBible):
+        """Warm the store right after a bible is persisted."""
+        self._lru.set(bible_id, StoredBible(bible_id, bible))
+        await redis_manager.set(
+            f"bible_id:{bible_id}", json.dumps(bible.model_dump()), ttl=BIBLE_TTL
+        )
+
+    async def _load(self, bible_id: str) -> Optional[StoredBible]:
+        raw = await redis_manager.get(f"bible_id:{bible_id}")
+        if raw:
+            bible_dict = json.loads(raw)
+        else:
+            doc = await mongo_manager.get_bible_by_id(bible_id)
+            if not doc:
+                return None
+            bible_dict = doc.get("game_bible", {})
+            await redis_manager.set(f"bible_id:{bible_id}", json.dumps(bible_dict), ttl=BIBLE_TTL)
+        try:
+            stored = StoredBible(bible_id, GameBible(**bible_dict))
+        except Exception as exc:
+            logger.error("Stored bible %s failed validation: %s", bible_id, exc)
+            return None
+        self._lru.set(bible_id, stored)
+        return stored
+
+
+# Module-level singleton used by routes
+bible_store = BibleStore()
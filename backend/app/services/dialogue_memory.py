@@ -0,0 +1,197 @@
+"""
+Rolling memory for long NPC conversations.
+
+The dialogue prompt gets a token-budgeted window of the most recent
+messages plus a running summary of everything before it, so its size
+stays flat however long a conversation runs. A summary is keyed by the
+stretch of conversation it covers and is folded forward in the
+background — a turn never waits on summarisation. Messages that left the
+window ride along as a short clipped gap; only once that gap reaches
+DIALOGUE_MEMORY_FOLD_TOKENS is it folded in, one summary call per chunk.
+
+Token counts are estimates (~4 characters per token); they only need to
+be stable, not exact.
+"""
+
+import asyncio
+import hashlib
+import logging
+from typing import Optional
+
+from app.config import get_settings
+from app.prompts.npc_dialogue import build_memory_summary_prompt
+from app.services.lru_cache import LRUCache
+from app.services.mistral_client import chat_complete
+from app.services.redis_cache import redis_manager
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+SUMMARY_MODEL = "mistral-small-latest"
+SUMMARY_TEMPERATURE = 0.3
+LRU_SIZE = 1024
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clip(text: str, max_tokens: int) -> str:
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    return text[: limit - 1].rstrip() + "…"
+
+
+def _clip_message(msg: dict, max_tokens: int) -> dict:
+    return {**msg, "content": clip(str(msg.get("content", "")), max_tokens)}
+
+
+def _tail_within(messages: list[dict], budget: int, per_message: int) -> int:
+    """Index where the newest messages fitting in `budget` tokens begin (always keeps one)."""
+    used = 0
+    start = len(messages)
+    for i in range(len(messages) - 1, -1, -1):
+        cost = min(estimate_tokens(str(messages[i].get("content", ""))), per_message)
+        if used + cost > budget and start < len(messages):
+            break
+        used += cost
+        start = i
+    return start
+
+
+def _boundary_keys(history: list[dict], scope: Optional[str], offset: int) -> list[str]:
+    """
+    keys[k] identifies "the first k messages". Sessions use their id plus
+    the absolute message index (stable when old history is trimmed);
+    stateless requests use a hash chain over the message contents.
+    """
+    if scope:
+        return [f"{scope}:{offset + k}" for k in range(len(history) + 1)]
+    keys = [""]
+    digest = hashlib.sha256()
+    for msg in history:
+        digest.update(f"{msg.get('role')}\x1f{msg.get('content')}\x1e".encode())
+        keys.append(digest.copy().hexdigest()[:32])
+    return keys
+
+
+class ConversationMemory:
+    def __init__(self):
+        self._lru = LRUCache(LRU_SIZE)
+        self._pending: dict[str, asyncio.Task] = {}
+
+    async def _lookup(self, keys: list[str], upto: int) -> tuple[int, str]:
+        """
+        Newest summary covering at most `upto` messages → (covered, summary).
+        Boundaries newer than the best local hit are checked in Redis with one
+        MGET, so a summary folded on another worker is found too.
+        """
+        covered, summary = 0, ""
+        for k in range(upto, 0, -1):
+            cached = self._lru.get(keys[k])
+            if cached is not None:
+                covered, summary = k, cached
+                break
+        if covered == upto:
+            return covered, summary
+        newer = range(covered + 1, upto + 1)
+        found = await redis_manager.mget([f"dialogue_memory:{keys[k]}" for k in newer])
+        for k, cached in reversed(list(zip(newer, found))):
+            if cached is not None:
+                self._lru.set(keys[k], cached)
+                return k, cached
+        return covered, summary
+
+    def _covered_locally(self, keys: list[str], upto: int) -> int:
+        """Newest boundary ≤ `upto` that is cached here or being folded."""
+        for k in range(upto, 0, -1):
+            if keys[k] in self._lru or keys[k] in self._pending:
+                return k
+        return 0
+
+    async def prepare(
+        self, history: list[dict], scope: Optional[str] = None, offset: int = 0
+    ) -> tuple[str, list[dict]]:
+        """
+        Returns (summary, recent_messages) for the prompt. recent_messages is
+        the budgeted window, preceded by any not-yet-summarised gap, with
+        every message clipped to DIALOGUE_MEMORY_MESSAGE_TOKENS.
+        """
+        settings = get_settings()
+        per_message = settings.dialogue_memory_message_tokens
+        start = _tail_within(history, settings.dialogue_memory_window_tokens, per_message)
+        window = [_clip_message(m, per_message) for m in history[start:]]
+        if start == 0:
+            return "", window
+
+        covered, summary = await self._lookup(_boundary_keys(history, scope, offset), start)
+        gap = history[covered:start]
+        gap = gap[_tail_within(gap, settings.dialogue_memory_summary_tokens, per_message // 2):]
+        return summary, [_clip_message(m, per_message // 2) for m in gap] + window
+
+    def refresh(
+        self, history: list[dict], npc_name: str, scope: Optional[str] = None, offset: int = 0
+    ):
+        """
+        Fold messages that have left the window into the summary, in the
+        background, once the unsummarised gap reaches DIALOGUE_MEMORY_FOLD_TOKENS.
+        """
+        settings = get_settings()
+        per_message = settings.dialogue_memory_message_tokens
+        start = _tail_within(history, settings.dialogue_memory_window_tokens, per_message)
+        if start == 0:
+            return
+        keys = _boundary_keys(history, scope, offset)
+        key = keys[start]
+
+        def _due(covered: int) -> bool:
+            # Measured as prepare() carries the gap: each message clipped to half
+            gap = sum(
+                min(estimate_tokens(str(m.get("content", ""))), per_message // 2)
+                for m in history[covered:start]
+            )
+            return gap >= settings.dialogue_memory_fold_tokens
+
+        if not _due(self._covered_locally(keys, start)):
+            return
+
+        async def _run():
+            try:
+                covered, previous = await self._lookup(keys, start)
+                if not _due(covered):
+                    return  # another worker already folded most of it
+                older = history[covered:start]
+                # Bound the fold input too — a long backlog is folded from its newest part
+                older = older[_tail_within(older, 4 * settings.dialogue_memory_summary_tokens, per_message):]
+                transcript = "\n".join(
+                    f"{'Player' if m.get('role') == 'player' else npc_name}: "
+                    f"{clip(str(m.get('content', '')), per_message)}"
+                    for m in older
+                )
+                system_prompt, user_message = build_memory_summary_prompt(
+                    npc_name, previous, transcript,
+                    max_words=settings.dialogue_memory_summary_tokens * 3 // 4,
+                )
+                raw = await chat_complete(
+                    model=SUMMARY_MODEL,
+                    system_prompt=system_prompt,
+                    user_message=user_message,
+                    temperature=SUMMARY_TEMPERATURE,
+                )
+                summary = clip(raw.strip(), settings.dialogue_memory_summary_tokens)
+                self._lru.set(key, summary)
+                await redis_manager.set(
+                    f"dialogue_memory:{key}", summary, ttl=settings.dialogue_session_ttl
+                )
+                logger.info("Dialogue memory folded %d messages (covers %d)", len(older), start)
+            except Exception as exc:
+                logger.warning("Dialogue memory refresh failed: %s", exc)
+            finally:
+                self._pending.pop(key, None)
+
+        self._pending[key] = asyncio.create_task(_run())
+
+
+# Module-level singleton used by routes
+dialogue_memory = ConversationMemory()
@@ -0,0 +1,143 @@
+"""
+Server-side NPC dialogue sessions.
+
+A session pins one player's conversation with one NPC of one bible: the
+character sheet, trust level, task context and history live on the
+server, so each turn only carries the session id and the player's choice
+— and trust can't be rewritten by the client. Sessions expire after
+DIALOGUE_SESSION_TTL of inactivity. Trust is owned by the server: it starts
+at 0, only turns change it, and it outlives the session (TRUST_TTL), so
+restarting or re-creating a conversation never resets it.
+
+Redis-backed when available (see RedisManager.*_session), in-memory
+otherwise. Turns on one session are serialised with a lease lock.
+"""
+
+import hashlib
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from app.config import get_settings
+from app.services.lru_cache import LRUCache
+from app.services.redis_cache import redis_manager
+
+TURN_LOCK_TTL = 60  # seconds — longer than any single dialogue turn
+TRUST_TTL = 30 * 24 * 3600
+
+
+class SessionBusy(Exception):
+    """Another turn on this session is still running."""
+
+
+def session_id_for(player_id: str, bible_id: str, character_id: str) -> str:
+    raw = f"{player_id}::{bible_id}::{character_id}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:24]
+
+
+class DialogueSessionStore:
+    def __init__(self):
+        # In-memory fallback when Redis is unavailable: id → (expires_at, state, history)
+        self._local: dict[str, tuple[float, dict, list[dict]]] = {}
+        self._local_trust = LRUCache(4096)
+        self._local_busy: set[str] = set()
+
+    async def trust_level(self, session_id: str) -> int:
+        """Current trust for this player/bible/character — 0 if they never talked."""
+        found = await self.get(session_id)
+        if found is not None:
+            return found[0]["trust_level"]
+        if redis_manager.available:
+            trust = await redis_manager.get_session_trust(session_id)
+        else:
+            trust = self._local_trust.get(session_id)
+        return trust or 0
+
+    async def create(self, state: dict) -> dict:
+        """
+        Start (or restart) a session; `state` must include session_id. The
+        history starts over but trust carries over from trust_level().
+        """
+        settings = get_settings()
+        trust = await self.trust_level(state["session_id"])
+        state = {**state, "trust_level": trust, "created_at": time.time()}
+        if redis_manager.available:
+            await redis_manager.create_session(
+                state["session_id"], state, settings.dialogue_session_ttl
+            )
+        else:
+            now = time.monotonic()
+            for expired in [sid for sid, entry in self._local.items() if entry[0] < now]:
+                del self._local[expired]
+            self._local[state["session_id"]] = (now + settings.dialogue_session_ttl, state, [])
+        return state
+
+    async def get(self, session_id: str) -> Optional[tuple[dict, list[dict]]]:
+        """Returns (state, history) or None if missing / expired."""
+        if redis_manager.available:
+            return await redis_manager.get_session(session_id)
+        entry = self._local.get(session_id)
+        if entry is None:
+            return None
+        expires_at, state, history = entry
+        if expires_at < time.monotonic():
+            self._local.pop(session_id, None)
+            return None
+        return dict(state), list(history)
+
+    async def record_turn(self, session_id: str, entries: list[dict], updates: dict):
+        """
+        Append history entries and apply state updates atomically; refreshes
+        the TTL. A no-op if the session was deleted or expired meanwhile.
+        """
+        settings = get_settings()
+        if redis_manager.available:
+            await redis_manager.append_session_turn(
+                session_id, entries, updates,
+                ttl=settings.dialogue_session_ttl,
+                max_history=settings.dialogue_session_max_history,
+                trust_ttl=TRUST_TTL,
+            )
+            return
+        entry = self._local.get(session_id)
+        if entry is None:
+            return
+        _, state, history = entry
+        state.update(updates)
+        if "trust_level" in updates:
+            self._local_trust.set(session_id, updates["trust_level"])
+        history = (history + entries)[-settings.dialogue_session_max_history:]
+        self._local[session_id] = (
+            time.monotonic() + settings.dialogue_session_ttl, state, history
+        )
+
+    async def delete(self, session_id: str):
+        if redis_manager.available:
+            await redis_manager.delete_session(session_id)
+        self._local.pop(session_id, None)
+
+    @asynccontextmanager
+    async def turn_lock(self, session_id: str):
+        """Serialise turns on a session; raises SessionBusy if one is running."""
+        if redis_manager.available:
+            token = uuid.uuid4().hex
+            if not await redis_manager.acquire_lock(f"dialogue:{session_id}", token, TURN_LOCK_TTL):
+                raise SessionBusy(session_id)
+            try:
+                yield
+            finally:
+                await redis_manager.release_lock(f"dialogue:{session_id}", token)
+            return
+        # Single process, single event loop: a set entry is the lock
+        if session_id in self._local_busy:
+            raise SessionBusy(session_id)
+        self._local_busy.add(session_id)
+        try:
+            yield
+        finally:
+            self._local_busy.discard(session_id)
+
+
+# Module-level singleton used by routes
+dialogue_sessions = DialogueSessionStore()
@@ -0,0 +1,157 @@
+"""
+Speculative NPC replies for server-side dialogue sessions.
+
+Right after a session turn returns, the reply to each offered player
+choice is generated in the background while the player is still reading.
+If the next turn picks a prepared choice it is served without a model
+call; the other speculations are cancelled (or dropped if finished).
+A batch is tied to the session's position in the conversation and
+expires after DIALOGUE_SPECULATION_TTL.
+
+Each session may waste at most DIALOGUE_SPECULATION_BUDGET_TOKENS on
+speculations that were never used; past that it stops speculating. A
+speculation cancelled mid-call is charged its prompt tokens, which a
+producer reports as soon as the request goes out.
+Speculations live in this process only — with several workers a turn
+landing on another worker is simply a miss.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from app.config import get_settings
+from app.services.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# A producer gets a callback for the prompt tokens it has sent upstream and
+# returns (result, estimated tokens spent)
+Producer = Callable[[Callable[[int], None]], Awaitable[tuple[Any, int]]]
+
+
+class _Batch:
+    def __init__(self, marker: int):
+        self.marker = marker
+        self.tasks: dict[int, asyncio.Task] = {}
+        self.committed: dict[int, int] = {}  # index → prompt tokens already sent
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+    def charges(self, indexes: Iterable[int]) -> list[tuple[asyncio.Task, int]]:
+        return [(self.tasks[i], self.committed.get(i, 0)) for i in indexes]
+
+
+class DialogueSpeculator:
+    def __init__(self):
+        self._batches: dict[str, _Batch] = {}
+        self._wasted = LRUCache(4096)  # session_id → unused speculative tokens
+        self.stats = {
+            "launched": 0,
+            "hits": 0,
+            "hits_ready": 0,       # hit and already finished — served with zero wait
+            "misses": 0,
+            "cancelled": 0,
+            "expired": 0,
+            "skipped_budget": 0,
+            "tokens_used": 0,
+            "tokens_wasted": 0,
+        }
+
+    def launch(self, session_id: str, marker: int, producers: dict[int, Producer]):
+        """Start one speculation per choice index; replaces any earlier batch."""
+        self.discard(session_id)
+        if not producers:
+            return
+        settings = get_settings()
+        if (self._wasted.get(session_id) or 0) >= settings.dialogue_speculation_budget_tokens:
+            self.stats["skipped_budget"] += 1
+            return
+        batch = _Batch(marker)
+        for index, produce in producers.items():
+            batch.tasks[index] = asyncio.create_task(
+                produce(lambda tokens, index=index: batch.committed.__setitem__(index, tokens))
+            )
+        batch.expiry = asyncio.get_running_loop().call_later(
+            settings.dialogue_speculation_ttl, self._expire, session_id, marker
+        )
+        self._batches[session_id] = batch
+        self.stats["launched"] += len(batch.tasks)
+
+    async def claim(
+        self, session_id: str, marker: int, choice_index: Optional[int]
+    ) -> Optional[Any]:
+        """
+        The prepared result for this choice, waiting up to DIALOGUE_DEADLINE
+        for it if still running, or None. choice_index None means the turn
+        wasn't one of the predicted choices (free text, changed context).
+        Every other speculation for the session is dropped. Speculations run
+        without a deadline, so one still running past it is dropped as a
+        miss and the turn is generated normally.
+        """
+        batch = self._batches.pop(session_id, None)
+        if batch is None:
+            return None
+        batch.expiry.cancel()
+        hit = choice_index if batch.marker == marker and choice_index in batch.tasks else None
+        self._drop(session_id, batch.charges(i for i in batch.tasks if i != hit), "cancelled")
+        if hit is None:
+            self.stats["misses"] += 1
+            return None
+        task = batch.tasks[hit]
+        was_ready = task.done()
+        try:
+            result, tokens = await asyncio.wait_for(
+                asyncio.shield(task), get_settings().dialogue_deadline
+            )
+        except asyncio.TimeoutError:
+            logger.info("Speculative reply for %s missed the deadline — generating", session_id)
+            self._drop(session_id, batch.charges([hit]), "cancelled")
+            self.stats["misses"] += 1
+            return None
+        except Exception as exc:
+            logger.warning("Speculative reply failed for %s: %s", session_id, exc)
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self.stats["hits_ready"] += was_ready
+        self.stats["tokens_used"] += tokens
+        return result
+
+    def discard(self, session_id: str):
+        batch = self._batches.pop(session_id, None)
+        if batch is not None:
+            batch.expiry.cancel()
+            self._drop(session_id, batch.charges(batch.tasks), "cancelled")
+
+    def snapshot(self) -> dict:
+        resolved = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "in_flight_sessions": len(self._batches),
+            "hit_rate": round(self.stats["hits"] / resolved, 3) if resolved else 0.0,
+        }
+
+    def _expire(self, session_id: str, marker: int):
+        batch = self._batches.get(session_id)
+        if batch is not None and batch.marker == marker:
+            del self._batches[session_id]
+            self._drop(session_id, batch.charges(batch.tasks), "expired")
+
+    def _drop(self, session_id: str, charges: Iterable[tuple[asyncio.Task, int]], reason: str):
+        """Cancel or discard speculations; `committed` is what an unfinished one already sent."""
+        for task, committed in charges:
+            self.stats[reason] += 1
+            if not task.done():
+                task.cancel()  # aborts the upstream call; its output tokens are never known
+                tokens = committed
+            elif not task.cancelled() and task.exception() is None:
+                tokens = task.result()[1]
+            else:
+                tokens = committed
+            if tokens:
+                self.stats["tokens_wasted"] += tokens
+                self._wasted.set(session_id, (self._wasted.get(session_id) or 0) + tokens)
+
+
+# Module-level singleton used by routes
+dialogue_speculation = DialogueSpeculator()
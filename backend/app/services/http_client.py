@@ -0,0 +1,69 @@
+"""
+Shared outbound HTTP client.
+
+One httpx.AsyncClient for the whole process, opened and closed in
+main.lifespan, so upstream calls (ElevenLabs) reuse pooled keep-alive
+connections instead of paying a TCP + TLS handshake per request.
+HTTP/2 is used when the optional `h2` package is installed.
+"""
+
+import logging
+from typing import Optional
+
+import httpx
+
+from app.config import get_settings
+
+try:
+    import h2  # noqa: F401 — only needed for httpx's HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:  # optional dependency
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClientManager:
+    """Owns the process-wide httpx.AsyncClient."""
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _build(self) -> httpx.AsyncClient:
+        settings = get_settings()
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                connect=settings.http_connect_timeout,
+                read=settings.http_read_timeout,
+                write=settings.http_write_timeout,
+                pool=settings.http_pool_timeout,
+            ),
+        )
+
+    async def connect(self):
+        if self._client is None:
+            self._client = self._build()
+            logger.info("HTTP client pool ready (http2=%s)", HTTP2_AVAILABLE)
+
+    async def disconnect(self):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+            logger.info("HTTP client pool closed")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Lazily created for scripts that run outside the FastAPI lifespan
+        if self._client is None:
+            self._client = self._build()
+        return self._client
+
+
+# Module-level singleton used by main.py lifespan + services
+http_manager = HTTPClientManager()
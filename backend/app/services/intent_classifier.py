@@ -0,0 +1,217 @@
+"""
+Local pre-classifier for /api/story-branch.
+
+Most choices the frontend flags are ordinary actions: working on a pending
+task, talking to an NPC who is around, walking to a reachable location.
+Those are recognised on the CPU in microseconds and answered
+deterministically (or handed to the dialogue path) instead of costing a
+reasoning-model call. Only choices it can't place with confidence reach
+build_story_branch_prompt.
+
+Each candidate target is scored by three matchers:
+  • keyword — share of the target's content words that appear in the choice
+  • fuzzy   — best difflib ratio between the target name and a window of the
+              choice of the same length (typos, partial names)
+  • vector  — cosine of hashed character-trigram vectors, a dependency-free
+              stand-in for an embedding (inflections, word order)
+A choice is resolved only when the best target clears the threshold, beats
+the runner-up by a margin, comes with the right kind of verb, and contains
+nothing that marks it as off-script (violence, deceit, skipping ahead). It
+must also be positive and single-minded: any negation ("don't talk to…"),
+or a content word the matched target doesn't account for ("…and melt it
+down"), sends it to the model.
+"""
+
+import math
+import re
+import zlib
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Optional
+
+VECTOR_DIMS = 512
+MIN_MARGIN = 0.08
+FUZZY_MIN_COSINE = 0.15  # below this the choice shares almost no trigrams — skip difflib
+COVER_MIN_RATIO = 0.8    # a misspelt word still counts as naming the target
+MAX_CHOICE_WORDS = 25
+
+KEYWORD_WEIGHT = 0.5
+FUZZY_WEIGHT = 0.3
+VECTOR_WEIGHT = 0.2
+
+STOPWORDS = {
+    "a", "an", "the", "to", "of", "and", "or", "in", "on", "at", "for", "with", "from",
+    "into", "about", "my", "your", "his", "her", "their", "our", "i", "me", "we", "you",
+    "it", "is", "be", "this", "that", "some", "up", "out", "over", "back", "now", "then",
+    "let", "lets", "let's", "just", "try", "will", "want", "need", "go", "dr", "mr", "mrs",
+    "ms", "sir", "lady", "lord", "task", "loc", "char", "npc",
+}
+TALK_VERBS = {
+    "talk", "speak", "ask", "chat", "approach", "greet", "tell", "question",
+    "convince", "persuade", "meet", "find", "visit", "say",
+}
+TRAVEL_VERBS = {
+    "go", "goes", "went", "head", "travel", "walk", "return", "enter", "visit",
+    "run", "move", "explore", "climb", "descend", "cross", "sail", "ride",
+}
+PURSUE_VERBS = {
+    "work", "do", "start", "continue", "finish", "complete", "pursue", "handle", "search",
+    "look", "get", "retrieve", "fetch", "collect", "gather", "help", "deal", "tackle",
+}
+# Words that add no action of their own ("head down to", "get on with")
+FILLER = {"down", "off", "toward", "towards", "around", "through", "inside", "outside", "on", "ahead", "straight", "decide", "like", "would", "should"}
+NEGATIONS = {"not", "no", "never", "don't", "dont", "won't", "wont", "refuse", "without", "nor"}
+OFF_SCRIPT_VERBS = {
+    "attack", "kill", "murder", "stab", "punch", "hit", "steal", "rob", "threaten",
+    "burn", "destroy", "lie", "betray", "skip", "ignore", "bribe", "blackmail",
+    "grab", "kidnap", "poison", "sabotage", "shoot", "fight", "smash", "break",
+    "refuse", "abandon", "expose", "sneak", "forge", "seduce", "flee", "instead",
+}
+
+
+class Intent:
+    """A resolved choice: kind is pursue_task | talk_to_npc | travel."""
+
+    def __init__(self, kind: str, target_id: str, score: float):
+        self.kind = kind
+        self.target_id = target_id
+        self.score = score
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"[a-z0-9']+", text.lower().replace("_", " "))
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+    return word
+
+
+def _content(words: list[str]) -> set[str]:
+    return {_stem(w) for w in words if w not in STOPWORDS}
+
+
+@lru_cache(maxsize=2048)
+def _vector(text: str) -> tuple[dict[int, float], float]:
+    """Hashed character-trigram counts + their norm."""
+    padded = f" {' '.join(_words(text))} "
+    counts: dict[int, float] = {}
+    for i in range(len(padded) - 2):
+        slot = zlib.crc32(padded[i:i + 3].encode()) % VECTOR_DIMS
+        counts[slot] = counts.get(slot, 0.0) + 1.0
+    return counts, math.sqrt(sum(v * v for v in counts.values()))
+
+
+def _cosine(a: str, b: str) -> float:
+    va, na = _vector(a)
+    vb, nb = _vector(b)
+    if not na or not nb:
+        return 0.0
+    return sum(v * vb.get(k, 0.0) for k, v in va.items()) / (na * nb)
+
+
+@lru_cache(maxsize=2048)
+def _target(text: str) -> tuple[tuple[str, ...], frozenset[str], str]:
+    """Target words (stopwords dropped), their stems, and the joined form."""
+    words = tuple(w for w in _words(text) if w not in STOPWORDS)
+    return words, frozenset(_stem(w) for w in words), " ".join(words)
+
+
+def _best_window_ratio(choice_words: list[str], target_words: tuple[str, ...], joined: str) -> float:
+    if not choice_words:
+        return 0.0
+    matcher = SequenceMatcher(None, b=joined)  # b is indexed once, windows vary a
+    size = min(len(target_words), len(choice_words))
+    best = 0.0
+    for i in range(len(choice_words) - size + 1):
+        matcher.set_seq1(" ".join(choice_words[i:i + size]))
+        if matcher.real_quick_ratio() > best and matcher.quick_ratio() > best:
+            best = max(best, matcher.ratio())
+    return best
+
+
+def _score(choice: str, choice_words: list[str], choice_content: set[str], target: str) -> float:
+    target_words, target_content, joined = _target(target)
+    if not target_content:
+        return 0.0
+    keyword = len(target_content & choice_content) / len(target_content)
+    cosine = _cosine(choice, joined)
+    if keyword == 1.0:
+        fuzzy = 1.0
+    elif cosine < FUZZY_MIN_COSINE:
+        fuzzy = 0.0
+    else:
+        fuzzy = _best_window_ratio(choice_words, target_words, joined)
+    return KEYWORD_WEIGHT * keyword + FUZZY_WEIGHT * fuzzy + VECTOR_WEIGHT * cosine
+
+
+def _is_negated(words: list[str]) -> bool:
+    return any(w in NEGATIONS or w.endswith("n't") for w in words)
+
+
+def _uncovered(words: list[str], kind: str, target_stems: frozenset[str]) -> set[str]:
+    """Content words of the choice that neither name the target nor are a plain verb for the intent."""
+    if kind == "talk_to_npc" and "about" in words:
+        words = words[:words.index("about")]  # the topic is the dialogue's business
+    leftover = _content(words) - target_stems - TALK_VERBS - TRAVEL_VERBS - PURSUE_VERBS - FILLER
+    return {
+        w for w in leftover
+        if not any(SequenceMatcher(None, w, t).ratio() >= COVER_MIN_RATIO for t in target_stems)
+    }
+
+
+def classify(
+    player_choice: str,
+    pending_tasks: list[dict],
+    npcs: list[dict],
+    locations: list[dict],
+    threshold: float,
+) -> Optional[Intent]:
+    """
+    pending_tasks: [{id, title}], npcs: [{id, name}], locations: [{id, name}]
+    (reachable ones). Returns None when the choice should go to the model.
+    """
+    words = _words(player_choice)
+    if not words or len(words) > MAX_CHOICE_WORDS:
+        return None
+    stems = {_stem(w) for w in words} | set(words)
+    if stems & OFF_SCRIPT_VERBS or _is_negated(words):
+        return None
+    content = _content(words)
+    significant = [w for w in words if w not in STOPWORDS]
+
+    candidates: list[tuple[float, str, str, str]] = []
+
+    def add(kind: str, target_id: str, name: str):
+        score = max(_score(player_choice, significant, content, name),
+                    _score(player_choice, significant, content, target_id))
+        candidates.append((score, kind, target_id, name))
+
+    for task in pending_tasks:
+        add("pursue_task", task["id"], task["title"])
+    # A bare name ("Marsh?") counts as wanting to talk
+    if stems & TALK_VERBS or len(words) <= 3:
+        for npc in npcs:
+            add("talk_to_npc", npc["id"], npc["name"])
+    if stems & TRAVEL_VERBS:
+        for location in locations:
+            add("travel", location["id"], location["name"])
+
+    # Only targets that account for every content word compete: "Captain Marsh"
+    # is not "Dr. Marsh", and "…and melt it down" leaves no target standing
+    candidates = sorted(
+        (c for c in candidates
+         if c[0] >= threshold - MIN_MARGIN
+         and not _uncovered(words, c[1], _target(c[3])[1] | _target(c[2])[1])),
+        key=lambda c: c[0],
+        reverse=True,
+    )
+    if not candidates:
+        return None
+    best_score, kind, target_id, _ = candidates[0]
+    runner_up = candidates[1][0] if len(candidates) > 1 else 0.0
+    if best_score < threshold or best_score - runner_up < MIN_MARGIN:
+        return None
+    return Intent(kind, target_id, round(best_score, 3))
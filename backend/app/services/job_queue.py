@@ -0,0 +1,177 @@
+"""
+Background world-generation jobs.
+
+POST enqueues and returns a job id straight away; a bounded pool of
+asyncio workers runs the world pipeline and writes the result back.
+With Redis, job state and the queue itself live in Redis, so any worker
+process can pick up a job and jobs interrupted by a restart are re-queued
+once their lease expires. Without Redis the queue falls back to memory.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Optional
+
+from app.config import get_settings
+from app.services import world_pipeline
+from app.services.redis_cache import redis_manager
+
+logger = logging.getLogger(__name__)
+
+QUEUE_NAME = "world"
+JOB_TTL = 24 * 3600   # seconds a finished job stays readable
+LEASE_TTL = 30        # seconds — a worker that stops renewing is presumed dead
+CLAIM_TIMEOUT = 5     # seconds a worker blocks waiting for work
+
+TERMINAL_STATUSES = {"done", "failed"}
+
+
+class WorldJobQueue:
+    """Queue + worker pool for /api/generate-world/jobs."""
+
+    def __init__(self):
+        self._workers: list[asyncio.Task] = []
+        self._reaper: Optional[asyncio.Task] = None
+        # In-memory fallback when Redis is unavailable
+        self._local_queue: asyncio.Queue = asyncio.Queue()
+        self._local_jobs: dict[str, dict] = {}
+
+    # ── Lifecycle (called from main.lifespan) ───────
+
+    async def start(self):
+        workers = max(1, get_settings().world_job_workers)
+        if redis_manager.available:
+            requeued = await redis_manager.requeue_orphaned_jobs(QUEUE_NAME)
+            if requeued:
+                logger.info("Re-queued %d interrupted world jobs", len(requeued))
+            self._reaper = asyncio.create_task(self._reap_loop())
+        self._workers = [
+            asyncio.create_task(self._worker_loop(i)) for i in range(workers)
+        ]
+        logger.info("World job queue started (%d workers)", workers)
+
+    async def stop(self):
+        tasks = [*self._workers, *([self._reaper] if self._reaper else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._reaper = None
+
+    # ── Public API ──────────────────────────────────
+
+    async def submit(self, story: str, end_goal: str) -> dict:
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "queued",
+            "story": story,
+            "end_goal": end_goal,
+            "created_at": time.time(),
+            "updated_at": time.time(),
+            "game_bible": None,
+            "error": None,
+        }
+        await self._save(job)
+        if redis_manager.available:
+            await redis_manager.enqueue_job(QUEUE_NAME, job_id)
+        else:
+            self._local_queue.put_nowait(job_id)
+        logger.info("World job queued — id=%s", job_id)
+        return job
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        if redis_manager.available:
+            return await redis_manager.get_job(job_id)
+        return self._local_jobs.get(job_id)
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[dict]:
+        """Long-poll: return once the job is finished or the timeout elapses."""
+        deadline = time.monotonic() + timeout
+        job = await self.get(job_id)
+        while job and job["status"] not in TERMINAL_STATUSES and time.monotonic() < deadline:
+            await asyncio.sleep(0.5)
+            job = await self.get(job_id)
+        return job
+
+    # ── Internals ───────────────────────────────────
+
+    async def _save(self, job: dict):
+        job["updated_at"] = time.time()
+        if redis_manager.available:
+            await redis_manager.set_job(job["job_id"], job, ttl=JOB_TTL)
+        else:
+            self._local_jobs[job["job_id"]] = job
+
+    async def _claim(self) -> Optional[str]:
+        if redis_manager.available:
+            # The lease is set atomically with the claim — see claim_job
+            return await redis_manager.claim_job(QUEUE_NAME, CLAIM_TIMEOUT, LEASE_TTL)
+        try:
+            return await asyncio.wait_for(self._local_queue.get(), CLAIM_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+
+    async def _worker_loop(self, index: int):
+        while True:
+            try:
+                job_id = await self._claim()
+                if job_id:
+                    await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error("World job worker %d error: %s", index, exc)
+                await asyncio.sleep(1)
+
+    async def _run(self, job_id: str):
+        job = await self.get(job_id)
+        if not job:
+            logger.warning("World job %s vanished before it ran", job_id)
+            await redis_manager.ack_job(QUEUE_NAME, job_id)
+            return
+
+        async def _keep_lease():
+            while True:
+                await asyncio.sleep(LEASE_TTL / 3)
+                await redis_manager.renew_job_lease(QUEUE_NAME, job_id, LEASE_TTL)
+
+        job["status"] = "running"
+        await self._save(job)
+        renewer = asyncio.create_task(_keep_lease())
+        try:
+            key = world_pipeline.cache_key(job["story"], job["end_goal"])
+            bible = await world_pipeline.get_cached_bible(key)
+            if bible is None:
+                # Strict: a failed run is reported as "failed", not as a "done" demo bible
+                bible = await world_pipeline.generate_coalesced(
+                    job["story"], job["end_goal"], key, strict=True
+                )
+            job["status"] = "done"
+            job["game_bible"] = bible.model_dump()
+        except asyncio.CancelledError:
+            # Shutdown — leave the job in processing so it is re-queued on restart
+            renewer.cancel()
+            raise
+        except Exception as exc:
+            logger.error("World job %s failed: %s", job_id, exc)
+            job["status"] = "failed"
+            job["error"] = str(exc)
+        renewer.cancel()
+        await self._save(job)
+        await redis_manager.ack_job(QUEUE_NAME, job_id)
+        logger.info("World job %s — %s", job_id, job["status"])
+
+    async def _reap_loop(self):
+        # Catches jobs whose worker process died while this one keeps running
+        while True:
+            await asyncio.sleep(LEASE_TTL)
+            requeued = await redis_manager.requeue_orphaned_jobs(QUEUE_NAME)
+            if requeued:
+                logger.info("Re-queued orphaned world jobs: %s", requeued)
+
+
+# Module-level singleton used by main.py lifespan + routes
+world_jobs = WorldJobQueue()
@@ -0,0 +1,129 @@
+"""
+Incremental extraction of top-level fields from a streamed JSON object.
+
+The model's JSON arrives a few characters at a time. JsonFieldStream
+follows the object's structure as chunks are fed in and reports:
+  ("delta", key, text)  — new decoded text of a top-level string field
+                           listed in `stream_fields`, as it is generated
+  ("field", key, value) — a top-level field whose value is complete
+
+Only the outermost object is tracked; nested values are reported once
+they close. The full text is still available for a final json.loads().
+"""
+
+import json
+import re
+from typing import Any, Iterable
+
+# A trailing backslash escape that isn't complete yet (\ or \uXX…)
+_PARTIAL_ESCAPE = re.compile(r'\\(u[0-9a-fA-F]{0,3})?$')
+
+
+class JsonFieldStream:
+    def __init__(self, stream_fields: Iterable[str] = ()):
+        self.stream_fields = set(stream_fields)
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # Top-level parse state: key → colon → value → comma
+        self._expect = "key"
+        self._key_start = -1
+        self._key = ""
+        self._value_start = -1
+        self._emitted = 0  # decoded chars already sent for the streaming field
+
+    def feed(self, chunk: str) -> list[tuple[str, str, Any]]:
+        self.text += chunk
+        events: list[tuple[str, str, Any]] = []
+        text = self.text
+        while self._pos < len(text):
+            ch = text[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_string(events)
+            elif ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._key_start = self._pos
+                elif self._depth == 1 and self._expect == "value":
+                    self._value_start = self._pos
+                    self._emitted = 0
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 2 and self._expect == "value":
+                    self._value_start = self._pos
+            elif ch in "}]":
+                if self._depth == 2 and self._expect == "value":
+                    self._depth -= 1
+                    self._pos += 1
+                    self._finish_value(events, self._pos)
+                    continue
+                if self._depth == 1 and self._expect == "value":
+                    self._finish_value(events, self._pos)
+                self._depth -= 1
+            elif self._depth == 1:
+                if ch == ":" and self._expect == "colon":
+                    self._expect = "value"
+                    self._value_start = -1
+                elif ch == ",":
+                    if self._expect == "value":
+                        self._finish_value(events, self._pos)
+                    self._expect = "key"
+                elif self._expect == "value" and self._value_start < 0 and not ch.isspace():
+                    self._value_start = self._pos  # number / true / false / null
+            self._pos += 1
+
+        if self._in_string and self._depth == 1 and self._expect == "value":
+            self._stream_partial(events)
+        return events
+
+    def result(self) -> dict:
+        """The complete object. Raises json.JSONDecodeError if it isn't valid."""
+        return json.loads(self.text)
+
+    # ── Internals ───────────────────────────────────
+
+    def _close_string(self, events: list):
+        if self._depth != 1:
+            return
+        if self._expect == "key":
+            self._key = json.loads(self.text[self._key_start:self._pos + 1])
+            self._expect = "colon"
+        elif self._expect == "value":
+            self._stream_partial(events, closed=True)
+            self._finish_value(events, self._pos + 1)
+
+    def _stream_partial(self, events: list, closed: bool = False):
+        if self._key not in self.stream_fields:
+            return
+        end = self._pos if closed else len(self.text)
+        raw = self.text[self._value_start + 1:end]
+        if not closed:
+            raw = _PARTIAL_ESCAPE.sub("", raw)
+        try:
+            decoded = json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            return
+        if not closed and decoded and "\ud800" <= decoded[-1] <= "\udbff":
+            decoded = decoded[:-1]  # first half of a surrogate pair — wait for the rest
+        if len(decoded) > self._emitted:
+            events.append(("delta", self._key, decoded[self._emitted:]))
+            self._emitted = len(decoded)
+
+    def _finish_value(self, events: list, end: int):
+        if self._value_start < 0:
+            return
+        try:
+            value = json.loads(self.text[self._value_start:end])
+        except json.JSONDecodeError:
+            value = None
+        events.append(("field", self._key, value))
+        self._value_start = -1
+        self._expect = "comma"
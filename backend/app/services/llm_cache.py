@@ -0,0 +1,51 @@
+"""
+Response cache for chat completions with reproducible prompts.
+
+Keyed by a hash of the exact (model, messages, temperature, json_mode)
+tuple, so it only ever returns what the model produced for a byte-identical
+request. Lookups go in-process LRU → Redis (LLM_CACHE_TTL); identical
+concurrent calls are coalesced onto one upstream request by the caller.
+Only callers that opt in (chat_complete(cache=True)) use it.
+"""
+
+import hashlib
+import json
+from typing import Optional
+
+from app.config import get_settings
+from app.services.lru_cache import LRUCache
+from app.services.redis_cache import redis_manager
+from app.services.single_flight import SingleFlight
+
+LRU_SIZE = 512
+
+_lru = LRUCache(LRU_SIZE)
+flight = SingleFlight()
+
+
+def enabled() -> bool:
+    return get_settings().llm_cache_ttl > 0
+
+
+def cache_key(model: str, messages: list[dict], temperature: float, json_mode: bool) -> str:
+    raw = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature, "json": json_mode},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+async def get(key: str) -> Optional[str]:
+    content = _lru.get(key)
+    if content is not None:
+        return content
+    content = await redis_manager.get(f"llm:{key}")
+    if content is not None:
+        _lru.set(key, content)
+    return content
+
+
+async def put(key: str, content: str):
+    _lru.set(key, content)
+    await redis_manager.set(f"llm:{key}", content, ttl=get_settings().llm_cache_ttl)
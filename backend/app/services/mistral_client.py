@@ -8,18 +8,30 @@ Mistral AI service — wraps all three model tiers + tile map generation.
 • magistral-medium-2506  → unexpected story branching (via chat_complete)
 """
 
+import asyncio
 import json
 import logging
-from typing import Optional
+import time
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 from mistralai import Mistral
 
 from app.config import get_settings
+from app.services import llm_cache
+from app.services.bible_assembler import (
+    assemble_game_bible_local,
+    normalize_cross_references,
+)
 from app.prompts.world_builder import (
     WORLD_STEP1_SYSTEM,
     WORLD_STEP2_SYSTEM,
+    WORLD_STEP2_SKELETON_SYSTEM,
+    WORLD_STEP2_LOCATION_SYSTEM,
+    WORLD_STEP2_TASK_SYSTEM,
     WORLD_STEP3_SYSTEM,
     TILE_MAP_SYSTEM,
+    TILE_LAYOUT_SYSTEM,
 )
 
 logger = logging.getLogger(__name__)
@@ -53,6 +65,138 @@ async def _call_large(system_prompt: str, user_content: str) -> dict:
     return json.loads(response.choices[0].message.content)
 
 
+# ── Latency tracking + deadline-aware execution ─────
+
+class LLMDeadlineExceeded(Exception):
+    """No valid completion before the hard deadline (fallback model included)."""
+
+
+class LatencyTracker:
+    """Rolling per-model completion latencies; sets when a hedge goes out."""
+
+    WINDOW = 200
+
+    def __init__(self):
+        self._samples: dict[str, deque] = {}
+
+    def record(self, model: str, seconds: float):
+        self._samples.setdefault(model, deque(maxlen=self.WINDOW)).append(seconds)
+
+    def p95(self, model: str) -> Optional[float]:
+        samples = self._samples.get(model)
+        if not samples or len(samples) < get_settings().llm_hedge_min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+
+latency = LatencyTracker()
+
+
+async def _timed_call(kwargs: dict) -> Optional[str]:
+    start = time.monotonic()
+    try:
+        response = await _get_client().chat.complete_async(**kwargs)
+    except asyncio.CancelledError:
+        # A cancelled call was at least this slow — keep it in the sample
+        # so the p95 isn't biased towards the requests that won
+        latency.record(kwargs["model"], time.monotonic() - start)
+        raise
+    latency.record(kwargs["model"], time.monotonic() - start)
+    return response.choices[0].message.content
+
+
+async def _hedged_call(kwargs: dict, json_mode: bool, budget: float) -> str:
+    """
+    Primary request, plus one hedged duplicate once the model's observed p95
+    (or half the budget, until there is enough data) has passed without a
+    valid reply. The first valid reply wins and the other is cancelled;
+    LLMDeadlineExceeded if none arrives within `budget` seconds.
+    """
+    model = kwargs["model"]
+    start = time.monotonic()
+    stop = start + budget
+    p95 = latency.p95(model)
+    hedge_at = start + (p95 if p95 is not None else budget / 2)
+
+    tasks: set[asyncio.Task] = {asyncio.create_task(_timed_call(kwargs))}
+    hedged = False
+    try:
+        while tasks:
+            now = time.monotonic()
+            if now >= stop:
+                break
+            wake = stop if hedged else min(hedge_at, stop)
+            done, _ = await asyncio.wait(
+                tasks, timeout=max(0.0, wake - now), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                tasks.discard(task)
+                if task.exception() is None and _is_valid_reply(task.result(), json_mode):
+                    if hedged:
+                        logger.info("Hedged call settled — model=%s after %.2fs", model, time.monotonic() - start)
+                    return task.result()
+                logger.warning("Discarding failed/invalid reply from %s: %s", model, task.exception())
+            # Hedge once: when p95 passes, or straight away if the primary failed
+            if not hedged and (not tasks or time.monotonic() >= hedge_at):
+                hedged = True
+                logger.info("Hedging %s after %.2fs (p95=%s)", model, time.monotonic() - start, p95)
+                tasks.add(asyncio.create_task(_timed_call(kwargs)))
+    finally:
+        for task in tasks:
+            task.cancel()
+    raise LLMDeadlineExceeded(f"{model}: no valid reply within {budget:.1f}s")
+
+
+async def _complete_with_deadline(
+    kwargs: dict,
+    json_mode: bool,
+    deadline: float,
+    fallback_model: Optional[str],
+    primary: Optional[Callable[[float], Awaitable[Optional[str]]]] = None,
+) -> tuple[str, str]:
+    """
+    Returns (content, model that answered). With a fallback_model, the last
+    LLM_FALLBACK_TIMEOUT of the deadline (at most half of it) is reserved for
+    one attempt on that model; it gets whatever budget is left, so nothing
+    runs past the deadline. If that fails too, LLMDeadlineExceeded is raised.
+
+    primary(budget) replaces the hedged call on the primary model — the
+    cached path passes the shared single-flight call. Either way the wait
+    for it is cut off at the budget.
+    """
+    model = kwargs["model"]
+    hard_stop = time.monotonic() + deadline
+    if fallback_model and fallback_model != model:
+        budget = deadline - min(get_settings().llm_fallback_timeout, deadline / 2)
+    else:
+        budget, fallback_model = deadline, None
+
+    try:
+        content = await asyncio.wait_for(
+            (primary or (lambda b: _hedged_call(kwargs, json_mode, b)))(budget), budget
+        )
+        if _is_valid_reply(content, json_mode):
+            return content, model
+    except (asyncio.TimeoutError, LLMDeadlineExceeded):
+        pass
+    except Exception as exc:
+        logger.warning("%s failed: %r", model, exc)
+
+    remaining = hard_stop - time.monotonic()
+    if fallback_model and remaining > 0:
+        logger.warning("%s gave no valid reply — falling back to %s for %.1fs", model, fallback_model, remaining)
+        try:
+            content = await asyncio.wait_for(
+                _timed_call({**kwargs, "model": fallback_model}), remaining
+            )
+            if _is_valid_reply(content, json_mode):
+                return content, fallback_model
+        except Exception as exc:
+            logger.warning("Fallback model %s failed: %r", fallback_model, exc)
+    raise LLMDeadlineExceeded(f"{model}: no valid reply within {deadline:.1f}s")
+
+
 # ── Generic chat complete (used by dialogue + story routes) ───
 
 async def chat_complete(
@@ -61,11 +205,90 @@ async def chat_complete(
     user_message: str,
     json_mode: bool = False,
     temperature: float = 0.7,
+    cache: bool = False,
+    deadline: Optional[float] = None,
+    fallback_model: Optional[str] = None,
+    coalesce: bool = True,
 ) -> str:
     """
     Generic async chat completion helper.
     Returns the raw string content from the model response.
     Used by dialogue and story branch routes with configurable model/temp/json_mode.
+    cache=True serves byte-identical requests from llm_cache (see LLM_CACHE_TTL)
+    and, unless coalesce=False, shares one upstream call between identical
+    concurrent requests — a shared call survives its callers being cancelled.
+    deadline (seconds) enables hedging + fallback_model and may raise
+    LLMDeadlineExceeded; without it this is a single plain call.
+    """
+
+    kwargs = {
+        "model": model,
+        "temperature": temperature,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message},
+        ],
+    }
+    if json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+
+    if not (cache and llm_cache.enabled()):
+        if deadline is None:
+            return await _timed_call(kwargs)
+        content, _ = await _complete_with_deadline(kwargs, json_mode, deadline, fallback_model)
+        return content
+
+    key = llm_cache.cache_key(model, kwargs["messages"], temperature, json_mode)
+    content = await llm_cache.get(key)
+    if content is not None:
+        logger.info("LLM cache hit — model=%s key=%s", model, key[:12])
+        return content
+
+    # Only the primary model's reply is shared and cached under its key; a
+    # caller with a deadline bounds its own wait on the shared call (which may
+    # belong to a caller without one) and runs its own fallback.
+    def _shared(call: Callable[[], Awaitable[Optional[str]]]) -> Awaitable[Optional[str]]:
+        async def _complete_and_store() -> Optional[str]:
+            content = await call()
+            if _is_valid_reply(content, json_mode):
+                await llm_cache.put(key, content)
+            return content
+
+        return llm_cache.flight.do(key, _complete_and_store) if coalesce else _complete_and_store()
+
+    if deadline is None:
+        return await _shared(lambda: _timed_call(kwargs))
+    content, _ = await _complete_with_deadline(
+        kwargs, json_mode, deadline, fallback_model,
+        primary=lambda budget: _shared(lambda: _hedged_call(kwargs, json_mode, budget)),
+    )
+    return content
+
+
+def _is_valid_reply(content: Optional[str], json_mode: bool) -> bool:
+    """Non-empty, and parseable in JSON mode — only such replies win or get cached."""
+    if not content:
+        return False
+    if json_mode:
+        try:
+            json.loads(content)
+        except json.JSONDecodeError:
+            return False
+    return True
+
+
+async def chat_complete_stream(
+    model: str,
+    system_prompt: str,
+    user_message: str,
+    json_mode: bool = False,
+    temperature: float = 0.7,
+    cache: bool = False,
+) -> AsyncIterator[str]:
+    """
+    Streaming variant of chat_complete.
+    Yields content deltas as the model generates them. With cache=True a
+    cached reply is yielded as one chunk, and a completed stream is stored.
     """
     client = _get_client()
 
@@ -80,8 +303,25 @@ async def chat_complete(
     if json_mode:
         kwargs["response_format"] = {"type": "json_object"}
 
-    response = await client.chat.complete_async(**kwargs)
-    return response.choices[0].message.content
+    key = None
+    if cache and llm_cache.enabled():
+        key = llm_cache.cache_key(model, kwargs["messages"], temperature, json_mode)
+        content = await llm_cache.get(key)
+        if content is not None:
+            logger.info("LLM cache hit (stream) — model=%s key=%s", model, key[:12])
+            yield content
+            return
+
+    parts: list[str] = []
+    stream = await client.chat.stream_async(**kwargs)
+    async for event in stream:
+        choices = event.data.choices
+        if choices and choices[0].delta.content:
+            parts.append(choices[0].delta.content)
+            yield choices[0].delta.content
+
+    if key and _is_valid_reply("".join(parts), json_mode):
+        await llm_cache.put(key, "".join(parts))
 
 
 # ── STEP 1: Character extraction (Mistral Large) ────
@@ -124,41 +364,214 @@ async def generate_world_structure(
     return result
 
 
-# ── STEP 3: Final assembly (Mistral Large) ───────────
+# ── STEP 2 (fan-out mode): skeleton + parallel detail ─
+
+# Used when a single detail call fails, so one bad location or task
+# doesn't throw away the whole world.
+_LOCATION_DETAIL_DEFAULTS = {
+    "description": "",
+    "terrain_type": "open ground",
+    "background_prompt": "pixel art RPG background, open landscape, no characters, no text, 16-bit style, 1280x720",
+    "tile_map_prompt": "64x64 tile map, open walkable area with scattered obstacles, spawn points: player_start at bottom centre",
+    "movement_profile": {
+        "speed": 110,
+        "friction": 0.8,
+        "camera_shake": False,
+        "ambient_sound": "quiet ambience",
+        "step_sound": "stone",
+    },
+    "player_spawn": "player_start",
+}
+
+_TASK_DETAIL_DEFAULTS = {
+    "description": "",
+    "type": "story objective",
+    "completion_condition": "",
+    "reward": "",
+}
+
+
+async def generate_world_skeleton(
+    story: str, end_goal: str, characters_json: str
+) -> dict:
+    """
+    Fan-out Step 2a — world, story graph and id-only task/location stubs.
+    Every cross-reference in the final world is fixed here.
+    """
+    user_content = (
+        f"Story: {story}\n"
+        f"End Goal: {end_goal}\n\n"
+        f"Characters (from Step 1):\n{characters_json}"
+    )
+    result = await _call_large(WORLD_STEP2_SKELETON_SYSTEM, user_content)
+    logger.info(
+        "Step 2a — skeleton '%s', %d tasks, %d locations",
+        result.get("world", {}).get("title", "?"),
+        len(result.get("tasks", [])),
+        len(result.get("locations", [])),
+    )
+    return result
+
+
+async def generate_location_detail(
+    story: str, world: dict, location: dict, characters: list[dict]
+) -> dict:
+    """Fan-out Step 2b — full detail for a single skeleton location."""
+    present = [
+        {"id": c.get("id"), "name": c.get("name"), "description": c.get("description")}
+        for c in characters
+        if c.get("id") in location.get("npcs_present", [])
+    ]
+    user_content = (
+        f"Story: {story}\n\n"
+        f"World:\n{json.dumps(world)}\n\n"
+        f"Location:\n{json.dumps(location)}\n\n"
+        f"NPCs present:\n{json.dumps(present)}"
+    )
+    return await _call_large(WORLD_STEP2_LOCATION_SYSTEM, user_content)
+
+
+async def generate_task_detail(
+    story: str, end_goal: str, task: dict, tasks: list[dict], characters: list[dict]
+) -> dict:
+    """Fan-out Step 2b — full detail for a single skeleton task."""
+    titles = {t.get("id"): t.get("title") for t in tasks}
+    npc = next((c for c in characters if c.get("id") == task.get("assigned_npc")), None)
+    neighbours = {
+        "requires": [titles.get(t, t) for t in task.get("requires", [])],
+        "unlocks": [titles.get(t, t) for t in task.get("unlocks", [])],
+    }
+    user_content = (
+        f"Story: {story}\n"
+        f"End Goal: {end_goal}\n\n"
+        f"Task:\n{json.dumps(task)}\n\n"
+        f"Neighbouring tasks:\n{json.dumps(neighbours)}\n\n"
+        f"Assigned NPC:\n{json.dumps(npc and {'id': npc.get('id'), 'name': npc.get('name'), 'description': npc.get('description')})}"
+    )
+    return await _call_large(WORLD_STEP2_TASK_SYSTEM, user_content)
+
+
+async def generate_world_structure_fanout(
+    story: str, end_goal: str, characters_data: dict
+) -> dict:
+    """
+    Step 2 in fan-out mode — same output shape as generate_world_structure.
+    Wall-clock ≈ skeleton + slowest single detail call (under the concurrency cap).
+    """
+    characters = characters_data.get("characters", [])
+    skeleton = await generate_world_skeleton(
+        story, end_goal, json.dumps(characters_data, indent=2)
+    )
+    world = skeleton.get("world", {})
+    tasks = skeleton.get("tasks", [])
+    locations = skeleton.get("locations", [])
+
+    semaphore = asyncio.Semaphore(max(1, get_settings().world_fanout_concurrency))
+
+    async def _detail(kind: str, stub: dict, call, defaults: dict) -> dict:
+        async with semaphore:
+            try:
+                detail = await call
+            except Exception as exc:
+                logger.warning("Step 2b — %s %s detail failed: %s", kind, stub.get("id"), exc)
+                detail = {}
+        # Skeleton fields win — they carry the consistent ids and references
+        return {**defaults, **detail, **stub}
+
+    location_jobs = [
+        _detail(
+            "location", loc,
+            generate_location_detail(story, world, loc, characters),
+            {**_LOCATION_DETAIL_DEFAULTS, "description": loc.get("name", "")},
+        )
+        for loc in locations
+    ]
+    task_jobs = [
+        _detail(
+            "task", task,
+            generate_task_detail(story, end_goal, task, tasks, characters),
+            {**_TASK_DETAIL_DEFAULTS, "description": task.get("title", ""),
+             "completion_condition": task.get("title", ""), "reward": "progress"},
+        )
+        for task in tasks
+    ]
+    results = await asyncio.gather(*location_jobs, *task_jobs)
+
+    result = {
+        "world": world,
+        "tasks": results[len(location_jobs):],
+        "story_graph": skeleton.get("story_graph", {}),
+        "locations": results[:len(location_jobs)],
+    }
+    logger.info(
+        "Step 2b — %d location + %d task details merged",
+        len(location_jobs), len(task_jobs),
+    )
+    return result
+
+
+# ── STEP 3: Final assembly (Mistral Large, opt-in) ───
 
 async def assemble_game_bible(characters_data: dict, world_data: dict) -> dict:
     """
     Step 3 — merge Step 1 characters + Step 2 world into one Game Bible.
     This is a simple merge call — the model just concatenates the two JSONs.
+    Only used when WORLD_ASSEMBLY_MODE=llm; the default is the local merge.
     """
     user_content = (
         f"CHARACTERS_DATA:\n{json.dumps(characters_data, indent=2)}\n\n"
         f"WORLD_DATA:\n{json.dumps(world_data, indent=2)}"
     )
     result = await _call_large(WORLD_STEP3_SYSTEM, user_content)
+    normalize_cross_references(result)
     logger.info("Step 3 — Game Bible assembled (%d chars)", len(json.dumps(result)))
     return result
 
 
 # ── Full 3-step pipeline ─────────────────────────────
 
-async def generate_game_bible(story: str, end_goal: str) -> dict:
+async def generate_game_bible_stages(
+    story: str, end_goal: str
+) -> AsyncIterator[tuple[str, dict]]:
     """
-    Run the complete 3-step world generation pipeline:
-      Step 1 → characters
-      Step 2 → world + tasks + locations (using Step 1 characters as context)
-      Step 3 → merge into final Game Bible
+    Run the 3-step pipeline, yielding each stage's payload as soon as it exists:
+      ("characters", Step 1 result)
+      ("world",      Step 2 result)
+      ("game_bible", assembled Game Bible)
+    Used by the streaming world route so the client can start work early.
     """
     # Step 1: Extract characters
     characters_data = await generate_characters(story, end_goal)
+    yield "characters", characters_data
 
     # Step 2: Build world structure (needs characters as input)
-    characters_json = json.dumps(characters_data, indent=2)
-    world_data = await generate_world_structure(story, end_goal, characters_json)
+    if get_settings().world_step2_mode == "fanout":
+        world_data = await generate_world_structure_fanout(story, end_goal, characters_data)
+    else:
+        characters_json = json.dumps(characters_data, indent=2)
+        world_data = await generate_world_structure(story, end_goal, characters_json)
+    yield "world", world_data
 
     # Step 3: Assemble final Game Bible
-    game_bible = await assemble_game_bible(characters_data, world_data)
+    if get_settings().world_assembly_mode == "llm":
+        game_bible = await assemble_game_bible(characters_data, world_data)
+    else:
+        game_bible = assemble_game_bible_local(characters_data, world_data)
+        logger.info("Step 3 — Game Bible assembled locally")
+    yield "game_bible", game_bible
+
 
+async def generate_game_bible(story: str, end_goal: str) -> dict:
+    """
+    Run the complete 3-step world generation pipeline:
+      Step 1 → characters
+      Step 2 → world + tasks + locations (using Step 1 characters as context)
+      Step 3 → merge into final Game Bible (locally unless WORLD_ASSEMBLY_MODE=llm)
+    """
+    game_bible: dict = {}
+    async for stage, payload in generate_game_bible_stages(story, end_goal):
+        if stage == "game_bible":
+            game_bible = payload
     return game_bible
 
 
@@ -172,3 +585,23 @@ async def generate_tile_map(tile_map_prompt: str) -> dict:
     result = await _call_large(TILE_MAP_SYSTEM, tile_map_prompt)
     logger.info("Tile map generated (%d layers)", len(result.get("layers", [])))
     return result
+
+
+async def generate_tile_layout(tile_map_prompt: str) -> dict:
+    """
+    Engine mode — ask a small model for a compact layout spec only
+    (rooms, corridors, obstacles, anchors). tilemap_engine rasterises it.
+    """
+    raw = await chat_complete(
+        model="mistral-small-latest",
+        system_prompt=TILE_LAYOUT_SYSTEM,
+        user_message=tile_map_prompt,
+        json_mode=True,
+        temperature=0.3,
+    )
+    result = json.loads(raw)
+    logger.info(
+        "Tile layout generated (%d rooms, %d corridors)",
+        len(result.get("rooms", [])), len(result.get("corridors", [])),
+    )
+    return result
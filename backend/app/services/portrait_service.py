@@ -72,3 +72,22 @@ async def _batch_generate(
 
     results = await asyncio.gather(*[_gen(c) for c in characters])
     return dict(results)
+
+
+async def generate_character_images(characters: list[dict]) -> dict[str, dict]:
+    """
+    Portraits and sprites for every character, all in parallel.
+    Returns { character_id: {"portrait_url": ..., "sprite_url": ...} }.
+    Failed images come back as "" rather than raising.
+    """
+    portraits, sprites = await asyncio.gather(
+        _batch_generate(characters, "portrait_prompt"),
+        _batch_generate(characters, "sprite_prompt"),
+    )
+    return {
+        char_id: {
+            "portrait_url": portraits.get(char_id, ""),
+            "sprite_url": sprites.get(char_id, ""),
+        }
+        for char_id in portraits.keys() | sprites.keys()
+    }
@@ -5,6 +5,7 @@ Gracefully degrades if Redis is unavailable — the app runs fine
 without caching, just slower on repeat calls.
 """
 
+import asyncio
 import json
 import logging
 from typing import Optional
@@ -16,6 +17,7 @@ from app.config import get_settings
 logger = logging.getLogger(__name__)
 
 DEFAULT_TTL = 3600  # 1 hour
+CLAIM_POLL_INTERVAL = 0.5  # seconds between job-queue polls while it is empty
 
 
 class RedisManager:
@@ -77,6 +79,14 @@ class RedisManager:
         except Exception:
             return None
 
+    async def mget(self, keys: list[str]) -> list[Optional[str]]:
+        if not self._redis or not keys:
+            return [None] * len(keys)
+        try:
+            return await self._redis.mget(keys)
+        except Exception:
+            return [None] * len(keys)
+
     async def set(self, key: str, value: str, ttl: int = DEFAULT_TTL):
         if not self._redis:
             return
@@ -85,6 +95,239 @@ class RedisManager:
         except Exception:
             pass
 
+    @property
+    def available(self) -> bool:
+        return self._redis is not None
+
+    # ── Job queue ───────────────────────────────────
+    # Reliable-queue pattern: jobs move pending → processing on claim and
+    # only leave processing on ack. A per-job lease key marks liveness.
+
+    async def set_job(self, job_id: str, data: dict, ttl: int = DEFAULT_TTL):
+        await self.set(f"job:{job_id}", json.dumps(data), ttl=ttl)
+
+    async def get_job(self, job_id: str) -> Optional[dict]:
+        raw = await self.get(f"job:{job_id}")
+        return json.loads(raw) if raw else None
+
+    async def enqueue_job(self, queue: str, job_id: str):
+        if not self._redis:
+            return
+        await self._redis.lpush(f"queue:{queue}:pending", job_id)
+
+    async def claim_job(self, queue: str, timeout: float, lease_ttl: int) -> Optional[str]:
+        """
+        Move the oldest pending job into the processing list and take its
+        lease in one script, so the reaper never sees a claimed job without
+        a lease. Scripts can't block, so an empty queue is polled until
+        `timeout`.
+        """
+        if not self._redis:
+            return None
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            job_id = await self._redis.eval(_CLAIM_JOB_LUA, 0, queue, lease_ttl)
+            if job_id or asyncio.get_running_loop().time() >= deadline:
+                return job_id
+            await asyncio.sleep(CLAIM_POLL_INTERVAL)
+
+    async def renew_job_lease(self, queue: str, job_id: str, ttl: int):
+        if not self._redis:
+            return
+        try:
+            await self._redis.set(f"queue:{queue}:lease:{job_id}", "1", ex=ttl)
+        except Exception as exc:
+            logger.warning("Redis job lease renew failed: %s", exc)
+
+    async def ack_job(self, queue: str, job_id: str):
+        if not self._redis:
+            return
+        try:
+            await self._redis.lrem(f"queue:{queue}:processing", 0, job_id)
+            await self._redis.delete(f"queue:{queue}:lease:{job_id}")
+        except Exception as exc:
+            logger.warning("Redis job ack failed: %s", exc)
+
+    async def requeue_orphaned_jobs(self, queue: str) -> list[str]:
+        """Move processing jobs whose lease expired (worker died) back to pending."""
+        if not self._redis:
+            return []
+        try:
+            return await self._redis.eval(_REQUEUE_ORPHANS_LUA, 0, queue)
+        except Exception as exc:
+            logger.warning("Redis job requeue failed: %s", exc)
+            return []
+
+    # ── Dialogue sessions ───────────────────────────
+    # State is a hash of JSON-encoded fields; history is a list. A turn
+    # updates both in one script so readers never see half a turn, and a
+    # turn on a deleted or expired session is dropped rather than leaving a
+    # partial hash behind. Trust is also kept under {key}:trust, which
+    # outlives the session.
+
+    async def create_session(self, session_id: str, state: dict, ttl: int):
+        if not self._redis:
+            return
+        key = f"dialogue:{session_id}"
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.delete(key, f"{key}:history")
+                pipe.hset(key, mapping={k: json.dumps(v) for k, v in state.items()})
+                pipe.expire(key, ttl)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("Redis session create failed: %s", exc)
+
+    async def get_session(self, session_id: str) -> Optional[tuple[dict, list[dict]]]:
+        if not self._redis:
+            return None
+        key = f"dialogue:{session_id}"
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hgetall(key)
+                pipe.lrange(f"{key}:history", 0, -1)
+                raw_state, raw_history = await pipe.execute()
+        except Exception as exc:
+            logger.warning("Redis session GET failed: %s", exc)
+            return None
+        if not raw_state:
+            return None
+        state = {k: json.loads(v) for k, v in raw_state.items()}
+        return state, [json.loads(entry) for entry in raw_history]
+
+    async def append_session_turn(
+        self,
+        session_id: str,
+        entries: list[dict],
+        updates: dict,
+        ttl: int,
+        max_history: int,
+        trust_ttl: int,
+    ) -> bool:
+        """False if the session no longer exists (nothing is written) or Redis failed."""
+        if not self._redis:
+            return False
+        key = f"dialogue:{session_id}"
+        fields = [part for k, v in updates.items() for part in (k, json.dumps(v))]
+        try:
+            return bool(await self._redis.eval(
+                _APPEND_SESSION_TURN_LUA, 3, key, f"{key}:history", f"{key}:trust",
+                ttl, max_history, trust_ttl, updates.get("trust_level", ""),
+                len(entries), *[json.dumps(e) for e in entries], *fields,
+            ))
+        except Exception as exc:
+            logger.warning("Redis session turn append failed: %s", exc)
+            return False
+
+    async def get_session_trust(self, session_id: str) -> Optional[int]:
+        raw = await self.get(f"dialogue:{session_id}:trust")
+        return int(raw) if raw is not None else None
+
+    async def delete_session(self, session_id: str):
+        if not self._redis:
+            return
+        try:
+            await self._redis.delete(f"dialogue:{session_id}", f"dialogue:{session_id}:history")
+        except Exception as exc:
+            logger.warning("Redis session delete failed: %s", exc)
+
+    # ── Lease locks (single-flight across processes) ─
+    # Without Redis every caller "acquires" — each process runs on its own.
+
+    async def acquire_lock(self, name: str, token: str, ttl: int) -> bool:
+        if not self._redis:
+            return True
+        try:
+            return bool(await self._redis.set(f"lock:{name}", token, nx=True, ex=ttl))
+        except Exception as exc:
+            logger.warning("Redis lock acquire failed: %s", exc)
+            return True
+
+    async def extend_lock(self, name: str, token: str, ttl: int) -> bool:
+        if not self._redis:
+            return False
+        try:
+            return bool(await self._redis.eval(_EXTEND_LOCK_LUA, 1, f"lock:{name}", token, ttl))
+        except Exception as exc:
+            logger.warning("Redis lock extend failed: %s", exc)
+            return False
+
+    async def release_lock(self, name: str, token: str):
+        if not self._redis:
+            return
+        try:
+            await self._redis.eval(_RELEASE_LOCK_LUA, 1, f"lock:{name}", token)
+        except Exception as exc:
+            logger.warning("Redis lock release failed: %s", exc)
+
+    async def lock_exists(self, name: str) -> bool:
+        if not self._redis:
+            return False
+        try:
+            return bool(await self._redis.exists(f"lock:{name}"))
+        except Exception:
+            return False
+
+
+# Compare-and-act scripts so a process only touches a lease it still owns
+_EXTEND_LOCK_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_CLAIM_JOB_LUA = """
+local id = redis.call('lmove', 'queue:' .. ARGV[1] .. ':pending', 'queue:' .. ARGV[1] .. ':processing', 'RIGHT', 'LEFT')
+if id then
+    redis.call('set', 'queue:' .. ARGV[1] .. ':lease:' .. id, '1', 'EX', ARGV[2])
+end
+return id
+"""
+
+_REQUEUE_ORPHANS_LUA = """
+local processing = 'queue:' .. ARGV[1] .. ':processing'
+local pending = 'queue:' .. ARGV[1] .. ':pending'
+local moved = {}
+for _, id in ipairs(redis.call('lrange', processing, 0, -1)) do
+    if redis.call('exists', 'queue:' .. ARGV[1] .. ':lease:' .. id) == 0 then
+        redis.call('lrem', processing, 1, id)
+        redis.call('rpush', pending, id)
+        table.insert(moved, id)
+    end
+end
+return moved
+"""
+
+# KEYS: state hash, history list, trust key. ARGV: ttl, max_history,
+# trust_ttl, trust ('' = unchanged), n entries, the entries, then field/value pairs
+_APPEND_SESSION_TURN_LUA = """
+if redis.call('exists', KEYS[1]) == 0 then
+    return 0
+end
+if ARGV[4] ~= '' then
+    redis.call('set', KEYS[3], ARGV[4], 'EX', ARGV[3])
+end
+local n = tonumber(ARGV[5])
+if n > 0 then
+    redis.call('rpush', KEYS[2], unpack(ARGV, 6, 5 + n))
+    redis.call('ltrim', KEYS[2], -tonumber(ARGV[2]), -1)
+end
+if #ARGV > 5 + n then
+    redis.call('hset', KEYS[1], unpack(ARGV, 6 + n, #ARGV))
+end
+redis.call('expire', KEYS[1], ARGV[1])
+redis.call('expire', KEYS[2], ARGV[1])
+return 1
+"""
+
+_RELEASE_LOCK_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
 
 # Module-level singleton used by main.py lifespan + routes
 redis_manager = RedisManager()
@@ -0,0 +1,112 @@
+"""
+Request coalescing for expensive, idempotent work.
+
+Two layers:
+  • SingleFlight      — in-process; concurrent callers with the same key
+                        await one shared task.
+  • run_with_lease()  — cross-process; a Redis lease elects one leader per
+                        key, followers poll for the leader's cached result.
+
+Both degrade gracefully: without Redis every process simply becomes its
+own leader, which is the old behaviour.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from app.services.redis_cache import redis_manager
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_LEASE_TTL = 120      # seconds — renewed while the leader is alive
+DEFAULT_POLL_INTERVAL = 0.5  # seconds between follower cache checks
+DEFAULT_MAX_WAIT = 300       # seconds a follower waits before going it alone
+
+
+class SingleFlight:
+    """Deduplicates concurrent async calls that share a key."""
+
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def is_running(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() once per key at a time. Callers that arrive while it is
+        running share its result (or its exception).
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        else:
+            logger.info("Coalesced onto in-flight call key=%s", key)
+        # shield: one caller disconnecting must not cancel the shared work
+        return await asyncio.shield(task)
+
+
+async def run_with_lease(
+    lock_name: str,
+    produce: Callable[[], Awaitable[T]],
+    fetch: Callable[[], Awaitable[Optional[T]]],
+    lease_ttl: int = DEFAULT_LEASE_TTL,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_wait: float = DEFAULT_MAX_WAIT,
+) -> T:
+    """
+    Cross-process leader election on a Redis lease.
+
+    The leader runs produce() (which must publish its result where fetch()
+    can see it) while renewing the lease. Followers poll fetch() until the
+    result appears; if the lease vanishes with no result (leader crashed)
+    they compete for it again.
+    """
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + max_wait
+
+    while True:
+        acquired = await redis_manager.acquire_lock(lock_name, token, lease_ttl)
+        if acquired:
+            return await _run_as_leader(lock_name, token, produce, lease_ttl)
+
+        logger.info("Waiting on leader for lock=%s", lock_name)
+        while await redis_manager.lock_exists(lock_name):
+            result = await fetch()
+            if result is not None:
+                return result
+            if time.monotonic() > deadline:
+                logger.warning("Leader for lock=%s too slow — running locally", lock_name)
+                return await produce()
+            await asyncio.sleep(poll_interval)
+
+        # Lease released — the leader either published or died
+        result = await fetch()
+        if result is not None:
+            return result
+
+
+async def _run_as_leader(
+    lock_name: str,
+    token: str,
+    produce: Callable[[], Awaitable[T]],
+    lease_ttl: int,
+) -> T:
+    async def _renew():
+        while True:
+            await asyncio.sleep(lease_ttl / 3)
+            await redis_manager.extend_lock(lock_name, token, lease_ttl)
+
+    renewer = asyncio.create_task(_renew())
+    try:
+        return await produce()
+    finally:
+        renewer.cancel()
+        await redis_manager.release_lock(lock_name, token)
@@ -0,0 +1,119 @@
+"""
+Sentence-level TTS pipeline for streamed NPC dialogue.
+
+As npc_response text streams in, each completed sentence is handed to
+ElevenLabs straight away (a few in parallel), and the audio is yielded
+back in sentence order — so the first sentence can play while the model
+is still writing the rest of the line.
+"""
+
+import asyncio
+import logging
+import re
+from typing import AsyncIterator, Optional
+
+from app.config import get_settings
+from app.services.voice_service import detect_voice_type, stream_npc_voice
+
+logger = logging.getLogger(__name__)
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) then whitespace
+_SENTENCE_END = re.compile(r'[.!?…]+["\'”’)\]]*\s+')
+# Fragments shorter than this are merged into the next sentence ("...Yeah.")
+MIN_SENTENCE_CHARS = 12
+
+
+class SentenceSplitter:
+    """Buffers streamed text and returns sentences once they are complete."""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, text: str) -> list[str]:
+        self._buffer += text
+        sentences: list[str] = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            sentence = self._buffer[start:match.end()].strip()
+            if len(sentence) >= MIN_SENTENCE_CHARS:
+                sentences.append(sentence)
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        tail, self._buffer = self._buffer.strip(), ""
+        return tail or None
+
+
+class SpeechPipeline:
+    """
+    feed() streamed text, finish() when the text is complete, and iterate
+    results() for (index, sentence, mp3_bytes | None) in sentence order.
+    Sentences started before the emotion is known are voiced as "neutral".
+    """
+
+    def __init__(self, description: str):
+        self.voice_type = detect_voice_type(description)
+        self.emotion = "neutral"
+        self._splitter = SentenceSplitter()
+        self._sem = asyncio.Semaphore(max(1, get_settings().tts_sentence_concurrency))
+        self._jobs: list[tuple[str, asyncio.Task]] = []
+        self._finished = False
+        self._changed = asyncio.Event()
+
+    def feed(self, text: str):
+        for sentence in self._splitter.feed(text):
+            self._start(sentence)
+
+    def finish(self):
+        tail = self._splitter.flush()
+        if tail:
+            self._start(tail)
+        self._finished = True
+        self._changed.set()
+
+    def cancel(self):
+        for _, task in self._jobs:
+            task.cancel()
+        self._finished = True
+        self._changed.set()
+
+    async def results(self) -> AsyncIterator[tuple[int, str, Optional[bytes]]]:
+        index = 0
+        while True:
+            if index < len(self._jobs):
+                sentence, task = self._jobs[index]
+                try:
+                    audio = await task
+                except asyncio.CancelledError:
+                    if not task.cancelled():
+                        raise
+                    return
+                yield index, sentence, audio
+                index += 1
+            elif self._finished:
+                return
+            else:
+                self._changed.clear()
+                await self._changed.wait()
+
+    # ── Internals ───────────────────────────────────
+
+    def _start(self, sentence: str):
+        task = asyncio.create_task(self._synthesize(sentence, self.emotion))
+        self._jobs.append((sentence, task))
+        self._changed.set()
+
+    async def _synthesize(self, sentence: str, emotion: str) -> Optional[bytes]:
+        async with self._sem:
+            try:
+                chunks = [
+                    chunk async for chunk in stream_npc_voice(
+                        npc_id=self.voice_type, text=sentence, emotion=emotion
+                    )
+                ]
+            except Exception as exc:
+                logger.warning("Sentence TTS failed (non-fatal): %s", exc)
+                return None
+        return b"".join(chunks)
@@ -0,0 +1,116 @@
+"""
+Compact tile layer encodings for tile map responses.
+
+  json    — plain integer arrays (default, what TILE_MAP_SYSTEM describes)
+  base64  — Tiled base64 of little-endian uint32 GIDs, uncompressed
+  zlib    — Tiled base64 + zlib
+  gzip    — Tiled base64 + gzip
+  zstd    — Tiled base64 + zstd (`zstandard`; unavailable if it isn't installed)
+  rle     — JSON run-length pairs [gid, count, gid, count, ...]
+
+Encoded maps are cached in Redis by content digest, so each map is
+encoded once per encoding.
+"""
+
+import base64
+import copy
+import gzip
+import hashlib
+import json
+import logging
+import struct
+import zlib
+
+from app.services.redis_cache import redis_manager
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ENCODINGS = ("json", "base64", "zlib", "gzip", "zstd", "rle")
+ENCODED_TTL = 24 * 3600
+
+
+def supported_encodings() -> list[str]:
+    return [e for e in ENCODINGS if e != "zstd" or zstandard is not None]
+
+
+def _pack(data: list[int]) -> bytes:
+    return struct.pack(f"<{len(data)}I", *data)
+
+
+def _run_length(data: list[int]) -> list[int]:
+    pairs: list[int] = []
+    for gid in data:
+        if pairs and pairs[-2] == gid:
+            pairs[-1] += 1
+        else:
+            pairs.extend((gid, 1))
+    return pairs
+
+
+def encode_layer(layer: dict, encoding: str) -> dict:
+    """Return a copy of a tile layer with its data in the requested encoding."""
+    if encoding == "json" or layer.get("type") != "tilelayer":
+        return layer
+    data = [int(v) for v in layer.get("data", [])]
+    out = {k: v for k, v in layer.items() if k != "data"}
+
+    if encoding == "rle":
+        out["encoding"] = "rle"
+        out["data"] = _run_length(data)
+        return out
+
+    raw = _pack(data)
+    if encoding == "zlib":
+        raw = zlib.compress(raw, 9)
+    elif encoding == "gzip":
+        raw = gzip.compress(raw, 9, mtime=0)
+    elif encoding == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd encoding needs the 'zstandard' package")
+        raw = zstandard.ZstdCompressor(level=10).compress(raw)
+    elif encoding != "base64":
+        raise ValueError(f"Unknown tile layer encoding '{encoding}'")
+
+    out["encoding"] = "base64"
+    if encoding != "base64":
+        out["compression"] = encoding
+    out["data"] = base64.b64encode(raw).decode("ascii")
+    return out
+
+
+def encode_map(tile_map: dict, encoding: str) -> dict:
+    """Encode every tile layer of a map. Object layers are left as-is."""
+    if encoding not in supported_encodings():
+        raise ValueError(f"Unsupported tile layer encoding '{encoding}'")
+    if encoding == "json":
+        return tile_map
+    encoded = copy.copy(tile_map)
+    encoded["layers"] = [encode_layer(layer, encoding) for layer in tile_map.get("layers", [])]
+    return encoded
+
+
+def map_digest(tile_map: dict) -> str:
+    raw = json.dumps(tile_map, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()[:24]
+
+
+async def encode_map_cached(tile_map: dict, encoding: str) -> dict:
+    """
+    encode_map(), memoised in Redis under the map's content digest — never the
+    generation key, so a regenerated map (e.g. after a short-lived fallback)
+    can't be served from a stale encoding.
+    """
+    if encoding == "json":
+        return tile_map
+    key = f"tilemap_enc:{map_digest(tile_map)}:{encoding}"
+    cached = await redis_manager.get(key)
+    if cached:
+        return json.loads(cached)
+    encoded = encode_map(tile_map, encoding)
+    await redis_manager.set(key, json.dumps(encoded, separators=(",", ":")), ttl=ENCODED_TTL)
+    return encoded
@@ -0,0 +1,302 @@
+"""
+Procedural tile map engine.
+
+Turns a compact layout spec (rooms, corridors, obstacles, spawn anchors —
+see TILE_LAYOUT_SYSTEM) into Tiled-compatible ground, collision and
+objects layers. Pure CPU, no model call, and deterministic: the same
+layout + seed always rasterises to the same map.
+"""
+
+import hashlib
+import logging
+import random
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MAP_SIZE = 64
+TILE_SIZE = 32
+
+EMPTY = 0
+FLOOR = 1
+BLOCKED = 2
+
+ANCHOR_NAMES = ("player_start", "npc_spawn_1", "npc_spawn_2", "npc_spawn_3", "objective_point")
+
+# Guards against runaway specs from the model
+MAX_ROOMS = 12
+MAX_CORRIDORS = 16
+MAX_OBSTACLES = 32
+MAX_SCATTER = 80
+
+
+def seed_from_prompt(tile_map_prompt: str) -> int:
+    """Stable 32-bit seed for a prompt, so an unseeded request is still reproducible."""
+    return int(hashlib.sha256(tile_map_prompt.encode()).hexdigest()[:8], 16)
+
+
+# ── Layout → grids ───────────────────────────────────
+
+class _Grid:
+    """Row-major ground + collision grids with bounds-checked painting."""
+
+    def __init__(self, width: int, height: int, fill: int):
+        self.width = width
+        self.height = height
+        self.ground = [fill] * (width * height)
+        self.collision = [EMPTY] * (width * height)
+
+    def inside(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def idx(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def paint_floor(self, x0: int, y0: int, w: int, h: int):
+        for y in range(max(0, y0), min(self.height, y0 + h)):
+            for x in range(max(0, x0), min(self.width, x0 + w)):
+                i = self.idx(x, y)
+                self.ground[i] = FLOOR
+                self.collision[i] = EMPTY
+
+    def block(self, x0: int, y0: int, w: int, h: int):
+        for y in range(max(0, y0), min(self.height, y0 + h)):
+            for x in range(max(0, x0), min(self.width, x0 + w)):
+                i = self.idx(x, y)
+                if self.ground[i] == FLOOR:
+                    self.collision[i] = BLOCKED
+
+    def walkable(self, x: int, y: int) -> bool:
+        i = self.idx(x, y)
+        return self.ground[i] == FLOOR and self.collision[i] == EMPTY
+
+
+def _int(value, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _list(value) -> list:
+    """The model sometimes returns a dict or string where a list belongs — treat it as empty."""
+    return value if isinstance(value, list) else []
+
+
+def _point(value) -> Optional[tuple[int, int]]:
+    if isinstance(value, (list, tuple)) and len(value) >= 2:
+        return _int(value[0]), _int(value[1])
+    if isinstance(value, dict) and "x" in value and "y" in value:
+        return _int(value["x"]), _int(value["y"])
+    return None
+
+
+def _carve_corridor(grid: _Grid, start: tuple[int, int], end: tuple[int, int], width: int, rng: random.Random):
+    """L-shaped corridor; which leg goes first is chosen by the seeded rng."""
+    (x0, y0), (x1, y1) = start, end
+    half = width // 2
+    if rng.random() < 0.5:
+        corner = (x1, y0)
+    else:
+        corner = (x0, y1)
+    for (ax, ay), (bx, by) in ((start, corner), (corner, end)):
+        grid.paint_floor(min(ax, bx) - half, min(ay, by) - half, abs(bx - ax) + width, abs(by - ay) + width)
+
+
+def _wall_in(grid: _Grid):
+    """Solid tiles touching walkable space become walls; map edges are always walls."""
+    for y in range(grid.height):
+        for x in range(grid.width):
+            i = grid.idx(x, y)
+            edge = x in (0, grid.width - 1) or y in (0, grid.height - 1)
+            if grid.ground[i] == FLOOR and edge:
+                grid.collision[i] = BLOCKED
+            elif grid.ground[i] != FLOOR and any(
+                grid.inside(nx, ny) and grid.ground[grid.idx(nx, ny)] == FLOOR
+                for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1))
+            ):
+                grid.collision[i] = BLOCKED
+
+
+def _nearest_walkable(grid: _Grid, x: int, y: int, taken: set) -> Optional[tuple[int, int]]:
+    """BFS outward from (x, y) to the closest free walkable tile."""
+    x = min(max(x, 0), grid.width - 1)
+    y = min(max(y, 0), grid.height - 1)
+    seen = {(x, y)}
+    queue = deque([(x, y)])
+    while queue:
+        cx, cy = queue.popleft()
+        if grid.walkable(cx, cy) and (cx, cy) not in taken:
+            return cx, cy
+        for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+            if grid.inside(nx, ny) and (nx, ny) not in seen:
+                seen.add((nx, ny))
+                queue.append((nx, ny))
+    return None
+
+
+def render_layout(layout: dict, seed: int) -> dict:
+    """
+    Rasterise a layout spec into a Tiled JSON map.
+    Unknown or malformed entries are skipped rather than failing the map.
+    """
+    rng = random.Random(seed)
+    width = min(max(_int(layout.get("width"), MAP_SIZE), 8), 256)
+    height = min(max(_int(layout.get("height"), MAP_SIZE), 8), 256)
+    base_floor = layout.get("base", "floor") == "floor"
+    grid = _Grid(width, height, FLOOR if base_floor else EMPTY)
+
+    for room in _list(layout.get("rooms"))[:MAX_ROOMS]:
+        if isinstance(room, dict):
+            grid.paint_floor(_int(room.get("x")), _int(room.get("y")), _int(room.get("w"), 1), _int(room.get("h"), 1))
+
+    for corridor in _list(layout.get("corridors"))[:MAX_CORRIDORS]:
+        if not isinstance(corridor, dict):
+            continue
+        start, end = _point(corridor.get("from")), _point(corridor.get("to"))
+        if start and end:
+            _carve_corridor(grid, start, end, min(max(_int(corridor.get("width"), 2), 1), 6), rng)
+
+    _wall_in(grid)
+
+    # Anchors are resolved before obstacles so scatter can keep clear of them
+    anchors_in = layout.get("anchors") if isinstance(layout.get("anchors"), dict) else {}
+    anchors: dict[str, tuple[int, int]] = {}
+    for name in ANCHOR_NAMES:
+        point = _point(anchors_in.get(name))
+        if point is None and name != "player_start":
+            continue
+        if point is None:
+            point = (width // 2, height // 2)
+        resolved = _nearest_walkable(grid, *point, taken=set(anchors.values()))
+        if resolved:
+            anchors[name] = resolved
+
+    keep_clear = {
+        (ax + dx, ay + dy)
+        for ax, ay in anchors.values()
+        for dx in (-1, 0, 1)
+        for dy in (-1, 0, 1)
+    }
+
+    for obstacle in _list(layout.get("obstacles"))[:MAX_OBSTACLES]:
+        if not isinstance(obstacle, dict):
+            continue
+        if "scatter" in obstacle:
+            size = min(max(_int(obstacle.get("size"), 1), 1), 4)
+            candidates = [
+                (x, y)
+                for y in range(height)
+                for x in range(width)
+                if grid.walkable(x, y) and (x, y) not in keep_clear
+            ]
+            count = max(0, min(_int(obstacle.get("scatter")), MAX_SCATTER, len(candidates)))
+            for x, y in rng.sample(candidates, count):
+                footprint = {(x + dx, y + dy) for dx in range(size) for dy in range(size)}
+                if not footprint & keep_clear:
+                    grid.block(x, y, size, size)
+        else:
+            x, y = _int(obstacle.get("x")), _int(obstacle.get("y"))
+            w = min(_int(obstacle.get("w"), 1), width)
+            h = min(_int(obstacle.get("h"), 1), height)
+            footprint = {(x + dx, y + dy) for dx in range(w) for dy in range(h)}
+            if not footprint & keep_clear:
+                grid.block(x, y, w, h)
+
+    return _to_tiled(grid, anchors, seed)
+
+
+def _to_tiled(grid: _Grid, anchors: dict[str, tuple[int, int]], seed: int) -> dict:
+    objects = [
+        {
+            "id": i + 1,
+            "name": name,
+            "type": "spawn" if name != "objective_point" else "objective",
+            "x": x * TILE_SIZE,
+            "y": y * TILE_SIZE,
+            "width": TILE_SIZE,
+            "height": TILE_SIZE,
+            "rotation": 0,
+            "visible": True,
+        }
+        for i, (name, (x, y)) in enumerate(anchors.items())
+    ]
+
+    def tile_layer(layer_id: int, name: str, data: list[int]) -> dict:
+        return {
+            "id": layer_id,
+            "name": name,
+            "type": "tilelayer",
+            "width": grid.width,
+            "height": grid.height,
+            "x": 0,
+            "y": 0,
+            "opacity": 1,
+            "visible": True,
+            "data": data,
+        }
+
+    return {
+        "type": "map",
+        "version": "1.10",
+        "orientation": "orthogonal",
+        "renderorder": "right-down",
+        "infinite": False,
+        "width": grid.width,
+        "height": grid.height,
+        "tilewidth": TILE_SIZE,
+        "tileheight": TILE_SIZE,
+        "nextlayerid": 4,
+        "nextobjectid": len(objects) + 1,
+        "properties": [{"name": "seed", "type": "int", "value": seed}],
+        "tilesets": [],
+        "layers": [
+            tile_layer(1, "ground", grid.ground),
+            tile_layer(2, "collision", grid.collision),
+            {
+                "id": 3,
+                "name": "objects",
+                "type": "objectgroup",
+                "x": 0,
+                "y": 0,
+                "opacity": 1,
+                "visible": True,
+                "objects": objects,
+            },
+        ],
+    }
+
+
+# ── Fallback layout (no model call at all) ───────────
+
+def procedural_layout(seed: int, npc_count: int = 1, with_objective: bool = True) -> dict:
+    """
+    Rooms-and-corridors layout from the seed alone.
+    Used when the layout call fails, so a map is always produced.
+    """
+    rng = random.Random(seed)
+    rooms = []
+    for _ in range(rng.randint(4, 7)):
+        w, h = rng.randint(8, 16), rng.randint(6, 12)
+        rooms.append({"x": rng.randint(2, MAP_SIZE - w - 2), "y": rng.randint(2, MAP_SIZE - h - 2), "w": w, "h": h})
+
+    centres = [[r["x"] + r["w"] // 2, r["y"] + r["h"] // 2] for r in rooms]
+    corridors = [
+        {"from": centres[i], "to": centres[i + 1], "width": rng.choice([2, 3])}
+        for i in range(len(centres) - 1)
+    ]
+
+    anchors = {"player_start": centres[0]}
+    for n in range(min(max(npc_count, 0), 3)):
+        anchors[f"npc_spawn_{n + 1}"] = centres[(n + 1) % len(centres)]
+    if with_objective:
+        anchors["objective_point"] = centres[-1]
+
+    return {
+        "base": "void",
+        "rooms": rooms,
+        "corridors": corridors,
+        "obstacles": [{"scatter": rng.randint(6, 14), "size": 1}],
+        "anchors": anchors,
+    }
@@ -0,0 +1,113 @@
+"""
+Tile map generation with a content-addressed cache.
+
+Maps are keyed by a hash of (mode, prompt version, seed, tile_map_prompt),
+so two locations with the same prompt — or a replayed bible — reuse one
+generation. Lookups go in-process LRU → Redis → generate, and concurrent
+misses for the same key share a single generation. A procedural fallback
+map (layout call failed) is only kept in Redis for FALLBACK_TTL, so a
+transient upstream error doesn't pin a generic map to the prompt.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Optional
+
+from app.config import get_settings
+from app.prompts.world_builder import TILE_LAYOUT_PROMPT_VERSION, TILE_MAP_PROMPT_VERSION
+from app.services import mistral_client, tilemap_engine
+from app.services.lru_cache import LRUCache
+from app.services.redis_cache import redis_manager
+from app.services.single_flight import SingleFlight
+from app.services.tilemap_validation import validate_and_repair
+
+logger = logging.getLogger(__name__)
+
+TILE_MAP_TTL = 7 * 24 * 3600
+FALLBACK_TTL = 5 * 60
+LRU_SIZE = 128
+
+_lru = LRUCache(LRU_SIZE)
+_flight = SingleFlight()
+
+
+def tile_map_key(tile_map_prompt: str, seed: Optional[int] = None) -> tuple[str, Optional[int]]:
+    """
+    Returns (cache_key, seed). The seed is None in llm mode, where the
+    model output isn't seedable and the key covers the prompt only.
+    """
+    if get_settings().tile_map_mode == "llm":
+        version, seed = f"llm-v{TILE_MAP_PROMPT_VERSION}", None
+    else:
+        version = f"engine-v{TILE_LAYOUT_PROMPT_VERSION}"
+        if seed is None:
+            seed = tilemap_engine.seed_from_prompt(tile_map_prompt)
+    raw = f"{version}::{seed}::{tile_map_prompt}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:24], seed
+
+
+async def get_cached(key: str) -> Optional[dict]:
+    entry = _lru.get(key)
+    if entry is not None:
+        return entry
+    raw = await redis_manager.get(f"tilemap:{key}")
+    if raw:
+        entry = json.loads(raw)
+        _lru.set(key, entry)
+        return entry
+    return None
+
+
+async def _store(key: str, entry: dict, fallback: bool = False):
+    if not fallback:
+        _lru.set(key, entry)  # the LRU has no expiry — fallbacks only go to Redis
+    await redis_manager.set(
+        f"tilemap:{key}", json.dumps(entry, separators=(",", ":")),
+        ttl=FALLBACK_TTL if fallback else TILE_MAP_TTL,
+    )
+
+
+async def _generate(tile_map_prompt: str, seed: Optional[int]) -> tuple[dict, bool]:
+    """
+    Produce a validated map entry: { tile_map, seed, layout, repairs }.
+    Returns (entry, fallback) — fallback is True when the layout call failed.
+    """
+    fallback = False
+    if seed is None:
+        tile_map = await mistral_client.generate_tile_map(tile_map_prompt)
+        layout = None
+    else:
+        # Engine mode: one short layout call, rasterised locally
+        try:
+            layout = await mistral_client.generate_tile_layout(tile_map_prompt)
+        except Exception as exc:
+            logger.warning("Tile layout generation failed: %s — using procedural layout", exc)
+            layout = tilemap_engine.procedural_layout(seed)
+            fallback = True
+        tile_map = None
+
+    def build() -> tuple[dict, list[str]]:
+        rendered = tile_map if layout is None else tilemap_engine.render_layout(layout, seed)
+        return validate_and_repair(rendered)
+
+    # Rasterising + validating up to 256×256 tiles is CPU work — keep it off the event loop
+    tile_map, repairs = await asyncio.to_thread(build)
+    return {"tile_map": tile_map, "seed": seed, "layout": layout, "repairs": repairs}, fallback
+
+
+async def get_or_generate(tile_map_prompt: str, seed: Optional[int] = None) -> tuple[str, dict]:
+    """Returns (cache_key, entry), generating and caching on a miss."""
+    key, seed = tile_map_key(tile_map_prompt, seed)
+    entry = await get_cached(key)
+    if entry is not None:
+        logger.info("Tile map cache HIT key=%s", key)
+        return key, entry
+
+    async def produce() -> dict:
+        generated, fallback = await _generate(tile_map_prompt, seed)
+        await _store(key, generated, fallback)
+        return generated
+
+    return key, await _flight.do(key, produce)
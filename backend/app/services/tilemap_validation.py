@@ -0,0 +1,233 @@
+"""
+Tile map validation and repair (NumPy).
+
+Enforces the TILE_MAP_SYSTEM rules the model (or a hand-written layout)
+can break, instead of regenerating the map:
+  • ground / collision layers have exactly width × height tiles
+  • tile values are limited to 0/1 (ground) and 0/2 (collision)
+  • player_start exists and stands on a walkable tile
+  • every npc_spawn_* and objective_point is reachable from player_start —
+    unreachable ones get the cheapest corridor carved to them
+"""
+
+import logging
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 32
+DEFAULT_SIZE = 64
+MAX_SIZE = 256
+
+EMPTY = 0
+FLOOR = 1
+BLOCKED = 2
+
+_STEPS = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
+
+def _find_layer(
+    layers: list, name: str, layer_type: str, exclude: Optional[dict] = None
+) -> Optional[dict]:
+    """Match by name first, then fall back to the first unclaimed layer of the type."""
+    for layer in layers:
+        if isinstance(layer, dict) and layer.get("name") == name:
+            return layer
+    for layer in layers:
+        if isinstance(layer, dict) and layer.get("type") == layer_type and layer is not exclude:
+            return layer
+    return None
+
+
+def _as_int(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _fit(data, size: int, fill: int) -> tuple[np.ndarray, bool]:
+    """Coerce a layer's data to exactly `size` ints, padding or truncating."""
+    try:
+        arr = np.asarray(data if isinstance(data, list) else [], dtype=np.float64).ravel()
+    except (TypeError, ValueError):
+        arr = np.array([], dtype=np.float64)
+    arr = np.nan_to_num(arr).astype(np.int32)
+    if arr.size == size:
+        return arr, False
+    if arr.size > size:
+        return arr[:size], True
+    return np.concatenate([arr, np.full(size - arr.size, fill, dtype=np.int32)]), True
+
+
+def _flood(walkable: np.ndarray, start: tuple[int, int]) -> np.ndarray:
+    """4-connected flood fill — one BFS pass, O(tiles) however winding the map."""
+    height, width = walkable.shape
+    open_ = walkable.ravel().tolist()
+    seen = [False] * (height * width)
+    first = start[0] * width + start[1]
+    seen[first] = True
+    queue = deque([first])
+    while queue:
+        i = queue.popleft()
+        x = i % width
+        for j in (i - width, i + width, i - 1 if x else -1, i + 1 if x < width - 1 else -1):
+            if 0 <= j < len(seen) and not seen[j] and open_[j]:
+                seen[j] = True
+                queue.append(j)
+    return np.array(seen, dtype=bool).reshape(height, width)
+
+
+def _cheapest_corridor(
+    walkable: np.ndarray, reach: np.ndarray, target: tuple[int, int]
+) -> list[tuple[int, int]]:
+    """
+    0-1 BFS from the reachable region to target: stepping onto a walkable
+    tile costs 0, onto a blocked tile costs 1. Returns the blocked tiles to
+    carve — the fewest possible. Map border tiles are avoided.
+    """
+    height, width = walkable.shape
+    dist = np.full(walkable.shape, np.iinfo(np.int32).max, dtype=np.int32)
+    prev: dict[tuple[int, int], tuple[int, int]] = {}
+    queue: deque = deque()
+    for cell in zip(*np.nonzero(reach)):
+        cell = (int(cell[0]), int(cell[1]))
+        dist[cell] = 0
+        queue.append(cell)
+
+    while queue:
+        y, x = queue.popleft()
+        if (y, x) == target:
+            break
+        for dy, dx in _STEPS:
+            ny, nx = y + dy, x + dx
+            if not (0 < ny < height - 1 and 0 < nx < width - 1) and (ny, nx) != target:
+                continue
+            if not (0 <= ny < height and 0 <= nx < width):
+                continue
+            cost = 0 if walkable[ny, nx] else 1
+            if dist[y, x] + cost < dist[ny, nx]:
+                dist[ny, nx] = dist[y, x] + cost
+                prev[(ny, nx)] = (y, x)
+                if cost:
+                    queue.append((ny, nx))
+                else:
+                    queue.appendleft((ny, nx))
+
+    carve = []
+    cell = target
+    while cell in prev:
+        if not walkable[cell]:
+            carve.append(cell)
+        cell = prev[cell]
+    if not walkable[target] and target not in carve:
+        carve.append(target)
+    return carve
+
+
+def validate_and_repair(tile_map: dict) -> tuple[dict, list[str]]:
+    """
+    Validate a Tiled map dict and repair it in place.
+    Returns (tile_map, repairs) — repairs is empty for a map that was already valid.
+    """
+    repairs: list[str] = []
+    width = min(max(_as_int(tile_map.get("width"), DEFAULT_SIZE), 1), MAX_SIZE)
+    height = min(max(_as_int(tile_map.get("height"), DEFAULT_SIZE), 1), MAX_SIZE)
+    tile_map["width"], tile_map["height"] = width, height
+    size = width * height
+
+    layers = tile_map.setdefault("layers", [])
+    ground_layer = _find_layer(layers, "ground", "tilelayer")
+    if ground_layer is None:
+        ground_layer = {"name": "ground", "type": "tilelayer", "data": [FLOOR] * size}
+        layers.insert(0, ground_layer)
+        repairs.append("added missing ground layer")
+    collision_layer = _find_layer(layers, "collision", "tilelayer", exclude=ground_layer)
+    if collision_layer is None:
+        collision_layer = {"name": "collision", "type": "tilelayer", "data": [EMPTY] * size}
+        layers.insert(1, collision_layer)
+        repairs.append("added missing collision layer")
+    objects_layer = _find_layer(layers, "objects", "objectgroup")
+    if objects_layer is None:
+        objects_layer = {"name": "objects", "type": "objectgroup", "objects": []}
+        layers.append(objects_layer)
+        repairs.append("added missing objects layer")
+
+    # ── Lengths + value ranges ─────────────────────
+    ground, resized = _fit(ground_layer.get("data"), size, EMPTY)
+    if resized:
+        repairs.append(f"ground layer resized from {len(ground_layer.get('data') or [])} to {size}")
+    collision, resized = _fit(collision_layer.get("data"), size, EMPTY)
+    if resized:
+        repairs.append(f"collision layer resized from {len(collision_layer.get('data') or [])} to {size}")
+
+    bad_ground = int(np.count_nonzero((ground != EMPTY) & (ground != FLOOR)))
+    bad_collision = int(np.count_nonzero((collision != EMPTY) & (collision != BLOCKED)))
+    if bad_ground or bad_collision:
+        repairs.append(f"normalised {bad_ground} ground / {bad_collision} collision tile values")
+    ground = np.where(ground > 0, FLOOR, EMPTY).astype(np.int32).reshape(height, width)
+    collision = np.where(collision > 0, BLOCKED, EMPTY).astype(np.int32).reshape(height, width)
+
+    # ── Anchors ────────────────────────────────────
+    raw_objects = objects_layer.get("objects")
+    objects = [o for o in raw_objects if isinstance(o, dict)] if isinstance(raw_objects, list) else []
+    objects_layer["objects"] = objects
+
+    def tile_of(obj: dict) -> tuple[int, int]:
+        ty = _as_int(obj.get("y"), 0) // TILE_SIZE
+        tx = _as_int(obj.get("x"), 0) // TILE_SIZE
+        return min(max(ty, 0), height - 1), min(max(tx, 0), width - 1)
+
+    def open_tile(cell: tuple[int, int]):
+        ground[cell] = FLOOR
+        collision[cell] = EMPTY
+
+    start_obj = next((o for o in objects if o.get("name") == "player_start"), None)
+    if start_obj is None:
+        walkable = (ground == FLOOR) & (collision == EMPTY)
+        ys, xs = np.nonzero(walkable)
+        if ys.size:
+            # Walkable tile closest to the map centre
+            i = int(np.argmin((ys - height // 2) ** 2 + (xs - width // 2) ** 2))
+            cell = (int(ys[i]), int(xs[i]))
+        else:
+            cell = (height // 2, width // 2)
+        start_obj = {"name": "player_start", "x": cell[1] * TILE_SIZE, "y": cell[0] * TILE_SIZE,
+                     "width": TILE_SIZE, "height": TILE_SIZE}
+        objects.insert(0, start_obj)
+        repairs.append(f"added missing player_start at tile {cell[1]},{cell[0]}")
+
+    start = tile_of(start_obj)
+    if not (ground[start] == FLOOR and collision[start] == EMPTY):
+        open_tile(start)
+        repairs.append("cleared blocked tile under player_start")
+
+    # ── Connectivity ───────────────────────────────
+    targets = [
+        o for o in objects
+        if str(o.get("name", "")).startswith("npc_spawn") or o.get("name") == "objective_point"
+    ]
+    walkable = (ground == FLOOR) & (collision == EMPTY)
+    reach = _flood(walkable, start)
+    for obj in targets:
+        cell = tile_of(obj)
+        if reach[cell]:
+            continue
+        carve = _cheapest_corridor(walkable, reach, cell)
+        for tile in carve:
+            open_tile(tile)
+        walkable = (ground == FLOOR) & (collision == EMPTY)
+        reach = _flood(walkable, start)
+        repairs.append(f"carved {len(carve)} tiles to connect {obj.get('name')}")
+
+    ground_layer["data"] = ground.ravel().tolist()
+    collision_layer["data"] = collision.ravel().tolist()
+    for layer in (ground_layer, collision_layer):
+        layer["width"], layer["height"] = width, height
+
+    for repair in repairs:
+        logger.info("Tile map repair — %s", repair)
+    return tile_map, repairs
@@ -0,0 +1,157 @@
+"""
+Content-addressed cache for synthesised speech.
+
+Keyed by (voice_id, model, voice_settings, normalised text), so a line is
+synthesised once no matter how many sessions or NPCs speak it. Two tiers:
+an in-process LRU of recent clips and a size-bounded disk directory that
+evicts least recently used files. Concurrent misses for the same key are
+coalesced — one caller streams from upstream, the rest wait for its bytes.
+This is the only place clip bytes are kept; audio_store ids resolve here.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+from app.config import get_settings
+from app.services.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+LRU_SIZE = 64
+
+_lru = LRUCache(LRU_SIZE)
+_inflight: dict[str, asyncio.Future] = {}
+_disk_bytes: Optional[int] = None  # running total, scanned lazily; guarded by _disk_lock
+_disk_lock = threading.Lock()       # disk writes run in to_thread workers
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(voice_id: str, model_id: str, voice_settings: dict, text: str) -> str:
+    raw = json.dumps(
+        [voice_id, model_id, voice_settings, normalize_text(text)],
+        sort_keys=True, separators=(",", ":"),
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _dir() -> Path:
+    return Path(get_settings().tts_cache_dir)
+
+
+def _path(key: str) -> Path:
+    return _dir() / key[:2] / f"{key}.mp3"
+
+
+# ── Disk tier (blocking; run via asyncio.to_thread) ──
+
+def _read_disk(key: str) -> Optional[bytes]:
+    path = _path(key)
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    os.utime(path)  # mtime doubles as last-access time for eviction
+    return data
+
+
+def _write_disk(key: str, data: bytes):
+    global _disk_bytes
+    path = _path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    existed = path.exists()
+    tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    with _disk_lock:
+        if _disk_bytes is None:
+            _disk_bytes = sum(f.stat().st_size for f in _dir().glob("*/*.mp3"))
+        elif not existed:
+            _disk_bytes += len(data)
+        _evict()
+
+
+def _evict():
+    """
+    Delete least recently used files until the directory fits TTS_CACHE_MAX_MB.
+    Caller holds _disk_lock.
+    """
+    global _disk_bytes
+    limit = get_settings().tts_cache_max_mb * 1024 * 1024
+    if _disk_bytes is None or _disk_bytes <= limit:
+        return
+    files = []
+    for f in _dir().glob("*/*.mp3"):
+        try:
+            stat = f.stat()
+        except FileNotFoundError:
+            continue  # evicted by another process meanwhile
+        files.append((stat.st_mtime, stat.st_size, f))
+    files.sort(key=lambda entry: entry[0])
+    _disk_bytes = sum(size for _, size, _ in files)
+    for _, size, f in files:
+        if _disk_bytes <= limit * 0.9:  # evict a little extra to avoid thrashing
+            break
+        f.unlink(missing_ok=True)
+        _disk_bytes -= size
+    logger.info("TTS cache evicted to %.1f MB", _disk_bytes / 1024 / 1024)
+
+
+# ── Public API ──────────────────────────────────────
+
+def contains(key: str) -> bool:
+    return key in _lru or _path(key).is_file()
+
+
+async def get(key: str) -> Optional[bytes]:
+    data = _lru.get(key)
+    if data is not None:
+        return data
+    data = await asyncio.to_thread(_read_disk, key)
+    if data is not None:
+        _lru.set(key, data)
+    return data
+
+
+async def put(key: str, data: bytes):
+    _lru.set(key, data)
+    try:
+        await asyncio.to_thread(_write_disk, key, data)
+    except OSError as exc:
+        logger.warning("TTS cache write failed: %s", exc)
+
+
+def claim(key: str) -> tuple[asyncio.Future, bool]:
+    """
+    Returns (future, is_leader). The leader fetches the clip and must call
+    resolve() or fail(); followers await the future for the bytes.
+    """
+    future = _inflight.get(key)
+    if future is not None:
+        return future, False
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    return future, True
+
+
+def resolve(key: str, data: bytes):
+    future = _inflight.pop(key, None)
+    if future is not None and not future.done():
+        future.set_result(data)
+
+
+def fail(key: str, exc: BaseException):
+    future = _inflight.pop(key, None)
+    if future is not None and not future.done():
+        future.set_exception(exc)
+        future.exception()  # mark retrieved — followers may not exist
@@ -0,0 +1,59 @@
+"""
+Pre-synthesis of every NPC's dialogue_tree lines.
+
+The four dialogue_tree lines are fixed once the bible is validated, so
+their audio ids (and recipes) are recorded right after world generation
+and attached to the Character, and the clips are synthesised in the
+background with bounded concurrency — world generation never waits on
+TTS. GET /api/audio/{id} waits for a clip still being synthesised, and
+re-synthesises from the recorded recipe if it failed, was evicted or
+lives on another node.
+"""
+
+import asyncio
+import logging
+
+from app.config import get_settings
+from app.models.game_bible import Character, GameBible
+from app.services import audio_store
+from app.services.voice_service import detect_voice_type
+
+logger = logging.getLogger(__name__)
+
+# Emotion each dialogue_tree line is delivered with
+DIALOGUE_TREE_EMOTIONS = {
+    "greeting": "neutral",
+    "cooperative": "happy",
+    "resistant": "suspicious",
+    "convinced": "grateful",
+}
+
+
+async def attach_voice_lines(bible: GameBible) -> int:
+    """
+    Set character.voice_lines to the audio id of every dialogue_tree line
+    and start their synthesis in the background (bounded concurrency).
+    Returns the number of lines scheduled.
+    """
+    sem = asyncio.Semaphore(max(1, get_settings().voice_prefetch_concurrency))
+
+    async def voice(character: Character) -> dict[str, str]:
+        voice_type = detect_voice_type(character.description)
+        lines = character.dialogue_tree.model_dump()
+        wanted = {
+            line: (emotion, (lines.get(line) or "").strip())
+            for line, emotion in DIALOGUE_TREE_EMOTIONS.items()
+            if (lines.get(line) or "").strip()
+        }
+        return {
+            line: await audio_store.schedule(voice_type, emotion, text, limit=sem)
+            for line, (emotion, text) in wanted.items()
+        }
+
+    results = await asyncio.gather(*[voice(c) for c in bible.characters])
+    for character, voice_lines in zip(bible.characters, results):
+        character.voice_lines = voice_lines
+
+    scheduled = sum(len(v) for v in results)
+    logger.info("Voice prefetch — %d dialogue lines scheduled", scheduled)
+    return scheduled
@@ -4,12 +4,13 @@
 # Called by /api/npc-voice endpoint in routes/voice.py
 # =============================================================================
 
+import asyncio
 import logging
 from typing import AsyncGenerator
 
-import httpx
-
 from app.config import get_settings
+from app.services import tts_cache
+from app.services.http_client import http_manager
 
 logger = logging.getLogger(__name__)
 
@@ -82,6 +83,8 @@ EMOTION_VOICE_SETTINGS: dict[str, dict] = {
 
 DEFAULT_VOICE_SETTINGS = EMOTION_VOICE_SETTINGS["neutral"]
 
+CHUNK_SIZE = 4096
+
 # ---------------------------------------------------------------------------
 # NPC VOICE REGISTRY
 # voice_id  → copy from ElevenLabs "My Voices" page
@@ -108,6 +111,53 @@ def get_voice_settings(emotion: str) -> dict:
     return EMOTION_VOICE_SETTINGS.get(emotion.lower(), DEFAULT_VOICE_SETTINGS)
 
 
+async def _stream_elevenlabs(
+    voice_id: str,
+    model_id: str,
+    voice_settings: dict,
+    text: str,
+) -> AsyncGenerator[bytes, None]:
+    """Raw ElevenLabs streaming call — no caching."""
+    settings = get_settings()
+    api_key  = settings.elevenlabs_api_key
+    if not api_key:
+        raise EnvironmentError("ELEVENLABS_API_KEY environment variable not set")
+
+    url = f"{settings.elevenlabs_base_url.rstrip('/')}/v1/text-to-speech/{voice_id}/stream"
+
+    headers = {
+        "xi-api-key":   api_key,
+        "Content-Type": "application/json",
+        "Accept":       "audio/mpeg",
+    }
+
+    payload = {
+        "text":           text,
+        "model_id":       model_id,
+        "voice_settings": voice_settings,
+    }
+
+    # Shared pooled client — keep-alive connections are reused across lines
+    async with http_manager.client.stream("POST", url, headers=headers, json=payload) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes(chunk_size=CHUNK_SIZE):
+            if chunk:
+                yield chunk
+
+
+def _chunked(data: bytes):
+    for i in range(0, len(data), CHUNK_SIZE):
+        yield data[i:i + CHUNK_SIZE]
+
+
+def tts_cache_key(npc_id: str, text: str, emotion: str) -> str:
+    """tts_cache key of the clip stream_npc_voice would produce for this line."""
+    npc_config = NPC_VOICE_REGISTRY[npc_id]
+    return tts_cache.cache_key(
+        npc_config["voice_id"], npc_config.get("model", "eleven_turbo_v2"), get_voice_settings(emotion), text
+    )
+
+
 async def stream_npc_voice(
     npc_id: str,
     text: str,
@@ -117,7 +167,9 @@ async def stream_npc_voice(
     Streams TTS audio from ElevenLabs for a given NPC, text, and emotion.
 
     Yields raw mp3 bytes as they arrive — the FastAPI endpoint forwards
-    these directly so playback can start immediately.
+    these directly so playback can start immediately. Lines already in
+    tts_cache are served locally with no upstream call, and concurrent
+    requests for the same line share one upstream call.
 
     Raises:
         ValueError:  if npc_id is not in NPC_VOICE_REGISTRY
@@ -132,33 +184,42 @@ async def stream_npc_voice(
     model_id       = npc_config.get("model", "eleven_turbo_v2")
     voice_settings = get_voice_settings(emotion)
 
-    settings = get_settings()
-    api_key  = settings.elevenlabs_api_key
-    if not api_key:
-        raise EnvironmentError("ELEVENLABS_API_KEY environment variable not set")
-
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}/stream"
-
-    headers = {
-        "xi-api-key":   api_key,
-        "Content-Type": "application/json",
-        "Accept":       "audio/mpeg",
-    }
-
-    payload = {
-        "text":           text,
-        "model_id":       model_id,
-        "voice_settings": voice_settings,
-    }
+    key = tts_cache_key(npc_id, text, emotion)
+    cached = await tts_cache.get(key)
+    if cached is not None:
+        logger.info("TTS cache HIT npc=%s emotion=%s len=%d", npc_id, emotion, len(text))
+        for chunk in _chunked(cached):
+            yield chunk
+        return
+
+    future, is_leader = tts_cache.claim(key)
+    if not is_leader:
+        try:
+            data = await asyncio.shield(future)
+        except Exception:
+            data = None  # leader failed or was abandoned — fetch it ourselves
+        if data:
+            logger.info("TTS coalesced npc=%s emotion=%s len=%d", npc_id, emotion, len(text))
+            for chunk in _chunked(data):
+                yield chunk
+            return
+        async for chunk in _stream_elevenlabs(voice_id, model_id, voice_settings, text):
+            yield chunk
+        return
 
     logger.info("Streaming TTS for npc=%s emotion=%s len=%d", npc_id, emotion, len(text))
-
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        async with client.stream("POST", url, headers=headers, json=payload) as response:
-            response.raise_for_status()
-            async for chunk in response.aiter_bytes(chunk_size=4096):
-                if chunk:
-                    yield chunk
+    chunks: list[bytes] = []
+    try:
+        async for chunk in _stream_elevenlabs(voice_id, model_id, voice_settings, text):
+            chunks.append(chunk)
+            yield chunk
+    except BaseException as exc:
+        # Includes the client disconnecting mid-stream (GeneratorExit)
+        tts_cache.fail(key, exc if isinstance(exc, Exception) else RuntimeError("TTS stream abandoned"))
+        raise
+    data = b"".join(chunks)
+    tts_cache.resolve(key, data)
+    await tts_cache.put(key, data)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,179 @@
+"""
+World generation orchestration shared by the HTTP routes and the job queue.
+
+Cache lookup → coalesced 3-step pipeline → Pydantic validation →
+Redis cache + MongoDB persistence.
+"""
+
+import asyncio
+import hashlib
+import logging
+from typing import Callable, Optional
+
+from app.config import get_settings
+from app.models.game_bible import GameBible
+from app.services import mistral_client, portrait_service, voice_prefetch
+from app.services.redis_cache import redis_manager
+from app.services.mongo_client import mongo_manager
+from app.services.bible_store import bible_store
+from app.services.single_flight import SingleFlight, run_with_lease
+from app.fallback_bible import FALLBACK_GAME_BIBLE
+
+logger = logging.getLogger(__name__)
+
+
+class WorldGenerationFailed(Exception):
+    """The pipeline produced no valid bible."""
+
+
+def cache_key(story: str, end_goal: str) -> str:
+    raw = f"{story}::{end_goal}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def validate_bible(raw_bible: dict) -> GameBible:
+    """Validate a raw pipeline result; WorldGenerationFailed if it doesn't fit the schema."""
+    try:
+        return GameBible(**raw_bible)
+    except Exception as exc:
+        raise WorldGenerationFailed(f"Game Bible validation failed: {exc}") from exc
+
+
+async def store_bible(story: str, end_goal: str, key: str, bible: GameBible):
+    """Cache in Redis and persist in MongoDB. Both are best-effort."""
+    bible_dict = bible.model_dump()
+
+    try:
+        await redis_manager.set_game_bible(key, bible_dict)
+    except Exception as exc:
+        logger.error("Redis cache set failed: %s", exc)
+
+    try:
+        bible_id = await mongo_manager.save_game_bible(
+            story=story,
+            end_goal=end_goal,
+            bible_dict=bible_dict,
+        )
+        if bible_id:
+            await bible_store.put(bible_id, bible)
+    except Exception as exc:
+        logger.error("MongoDB save failed: %s", exc)
+
+
+async def get_cached_bible(key: str) -> Optional[GameBible]:
+    try:
+        cached = await redis_manager.get_game_bible(key)
+        if cached:
+            logger.info("Cache HIT for key=%s", key)
+            return GameBible(**cached)
+    except Exception as exc:
+        logger.error("Redis cache check failed: %s", exc)
+    return None
+
+
+async def run_pipeline(
+    story: str,
+    end_goal: str,
+    on_stage: Optional[Callable[[str, dict], None]] = None,
+) -> GameBible:
+    """
+    Run the 3-step Mistral pipeline and validate the result; raises
+    WorldGenerationFailed if no valid bible comes out.
+    With WORLD_PREFETCH_IMAGES on, character portraits and sprites are
+    generated as soon as Step 1 returns, overlapping Steps 2 and 3.
+    With WORLD_PREFETCH_VOICE on, dialogue_tree lines are queued for TTS
+    and their audio ids attached before the bible is stored.
+    """
+    raw_bible: Optional[dict] = None
+    images_task: Optional[asyncio.Task] = None
+    try:
+        async for stage, payload in mistral_client.generate_game_bible_stages(
+            story, end_goal
+        ):
+            if stage == "characters" and get_settings().world_prefetch_images:
+                images_task = asyncio.create_task(
+                    portrait_service.generate_character_images(
+                        payload.get("characters", [])
+                    )
+                )
+            if stage == "game_bible":
+                raw_bible = payload
+            elif on_stage:
+                on_stage(stage, payload)
+        if raw_bible is None:
+            raise WorldGenerationFailed("World generation pipeline returned no game_bible stage")
+        bible = validate_bible(raw_bible)
+    except Exception as exc:
+        if images_task:
+            images_task.cancel()
+        if isinstance(exc, WorldGenerationFailed):
+            raise
+        raise WorldGenerationFailed(f"World generation pipeline failed: {exc}") from exc
+
+    if images_task:
+        try:
+            images = await images_task
+        except Exception as exc:
+            logger.warning("Character image prefetch failed: %s", exc)
+            images = {}
+        _attach_character_images(bible, images)
+        if on_stage:
+            on_stage("images", images)
+
+    settings = get_settings()
+    if settings.world_prefetch_voice and settings.elevenlabs_api_key:
+        await voice_prefetch.attach_voice_lines(bible)
+        if on_stage:
+            on_stage("voice", {c.id: c.voice_lines for c in bible.characters})
+
+    return bible
+
+
+def _attach_character_images(bible: GameBible, images: dict[str, dict]):
+    for character in bible.characters:
+        urls = images.get(character.id, {})
+        character.portrait_url = urls.get("portrait_url") or character.portrait_url
+        character.sprite_url = urls.get("sprite_url") or character.sprite_url
+
+
+# In-process coalescing; the Redis lease below covers other workers/nodes
+_world_flight = SingleFlight()
+
+
+async def generate_coalesced(
+    story: str,
+    end_goal: str,
+    key: str,
+    on_stage: Optional[Callable[[str, dict], None]] = None,
+    strict: bool = False,
+) -> GameBible:
+    """
+    N concurrent identical requests → one pipeline run.
+    on_stage only fires for the caller that ends up running the pipeline.
+    If the run fails, the demo bible is returned — uncached and unpersisted,
+    so the next request retries — or, when strict, WorldGenerationFailed
+    is raised so the caller can report the failure.
+    """
+    async def produce() -> GameBible:
+        # A leader elsewhere may have finished between our cache miss and the lease
+        cached = await get_cached_bible(key)
+        if cached:
+            return cached
+        bible = await run_pipeline(story, end_goal, on_stage)
+        await store_bible(story, end_goal, key, bible)
+        return bible
+
+    async def lead_or_follow() -> GameBible:
+        return await run_with_lease(
+            f"bible:{key}",
+            produce,
+            lambda: get_cached_bible(key),
+        )
+
+    try:
+        return await _world_flight.do(key, lead_or_follow)
+    except WorldGenerationFailed as exc:
+        if strict:
+            raise
+        logger.error("%s — using fallback", exc)
+        return GameBible(**FALLBACK_GAME_BIBLE)
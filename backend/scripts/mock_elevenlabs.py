@@ -0,0 +1,59 @@
+"""
+Local stand-in for the ElevenLabs streaming TTS endpoint.
+
+Serves POST /v1/text-to-speech/{voice_id}/stream with fake mp3 bytes after
+a configurable first-byte delay, so voice code paths and the shared HTTP
+pool can be exercised without an API key or network.
+
+Run:
+    python scripts/mock_elevenlabs.py --port 8090 --latency-ms 150
+    ELEVENLABS_BASE_URL=http://localhost:8090 ELEVENLABS_API_KEY=test uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+
+import uvicorn
+from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+FIRST_BYTE_DELAY = 0.15  # seconds, overridden by --latency-ms
+CHUNK_DELAY = 0.01
+CHUNKS = 8
+CHUNK = b"\xff\xfb\x90\x00" + b"\x00" * 4092  # one MPEG frame header + padding
+
+app = FastAPI(title="Mock ElevenLabs")
+stats = {"requests": 0}
+
+
+@app.post("/v1/text-to-speech/{voice_id}/stream")
+async def tts_stream(voice_id: str, request: Request, xi_api_key: str = Header(default="")):
+    if not xi_api_key:
+        raise HTTPException(status_code=401, detail="missing xi-api-key")
+    body = await request.json()
+    if not body.get("text"):
+        raise HTTPException(status_code=400, detail="text is required")
+    stats["requests"] += 1
+
+    async def audio():
+        await asyncio.sleep(FIRST_BYTE_DELAY)
+        for _ in range(CHUNKS):
+            yield CHUNK
+            await asyncio.sleep(CHUNK_DELAY)
+
+    return StreamingResponse(audio(), media_type="audio/mpeg")
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=int, default=150)
+    args = parser.parse_args()
+    FIRST_BYTE_DELAY = args.latency_ms / 1000
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")